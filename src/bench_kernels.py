@@ -0,0 +1,112 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/bench_kernels.py'
+#   Benchmark for the per-particle update kernels in swarm_kernels.py.
+#       Compares the original per-dimension Python loops with the
+#       NUMPY and JIT (numba) backends, for the kernels alone and for
+#       full optimizer runs on a cheap objective function, where the
+#       optimizer overhead dominates.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import time
+import numpy as np
+from numpy.random import Generator, MT19937
+from particle_swarm import swarm, SwarmConfig
+from swarm_kernels import select_kernels, JIT_AVAILABLE
+
+DIMENSIONS = [2, 10, 50, 200]
+NO_OF_PARTICLES = 20
+CALLS = 20000
+RUN_MAXIT = 20000
+
+
+# original per-dimension loops, kept here as the reference
+def loop_velocity_update(V, M, Pb, Gb, weights, r, particle, decimals):
+    for i in range(0, np.shape(V)[1]):
+        V[particle, i] = np.round(weights[0]*r[3*i]*V[particle, i]
+                                  + weights[1]*r[3*i+1]*(Pb[particle, i]-M[particle, i])
+                                  + weights[2]*r[3*i+2]*(Gb[i]-M[particle, i]), decimals)
+
+def loop_point_update(M, V, delta_t, particle, decimals):
+    M[particle] = np.round(M[particle] + delta_t*V[particle], decimals)
+
+def loop_out_of_bounds(M, lbound, ubound, particle):
+    update = 0
+    for i in range(0, np.shape(M)[1]):
+        if (lbound[i] > M[particle, i]) or (ubound[i] < M[particle, i]):
+            update = i+1
+    return update
+
+
+def time_kernels(velocity_update, point_update, out_of_bounds, dims):
+    rng = Generator(MT19937(1))
+    M = rng.random((NO_OF_PARTICLES, dims))
+    V = rng.random((NO_OF_PARTICLES, dims))
+    Pb = rng.random((NO_OF_PARTICLES, dims))
+    Gb = rng.random(dims)
+    lbound = np.zeros(dims)
+    ubound = np.ones(dims)
+    weights = np.array([0.5, 0.7, 0.78])
+    r = rng.random(3*dims)
+    # warm up (and compile, for the JIT backend)
+    velocity_update(V, M, Pb, Gb, weights, r, 0, 4)
+    point_update(M, V, 0.5, 0, 4)
+    out_of_bounds(M, lbound, ubound, 0)
+
+    t0 = time.perf_counter()
+    for c in range(0, CALLS):
+        particle = c % NO_OF_PARTICLES
+        velocity_update(V, M, Pb, Gb, weights, r, particle, 4)
+        point_update(M, V, 0.5, particle, 4)
+        out_of_bounds(M, lbound, ubound, particle)
+    return (time.perf_counter() - t0)/CALLS
+
+
+def sphere(X, NO_OF_OUTS=1):
+    return [np.sum(X**2)], True
+
+
+def time_run(backend, dims):
+    class Quiet():
+        def debug_message_printout(self, txt):
+            pass
+        def record_params(self):
+            pass
+    opt_df = SwarmConfig(NO_OF_PARTICLES=NO_OF_PARTICLES, KERNEL_BACKEND=backend)
+    myOptimizer = swarm([[-5]*dims], [[5]*dims], [0], 10 ** -18, RUN_MAXIT,
+                        sphere, lambda X: True, opt_df, parent=Quiet())
+    t0 = time.perf_counter()
+    while not myOptimizer.complete():
+        myOptimizer.step(True)
+        myOptimizer.call_objective(True)
+    return (time.perf_counter() - t0)/myOptimizer.iter
+
+
+if __name__ == "__main__":
+    backends = [('loop', (loop_velocity_update, loop_point_update, loop_out_of_bounds))]
+    k, msg = select_kernels('NUMPY')
+    backends.append(('NUMPY', (k.velocity_update, k.point_update, k.out_of_bounds)))
+    if JIT_AVAILABLE:
+        k, msg = select_kernels('JIT')
+        backends.append(('JIT', (k.velocity_update, k.point_update, k.out_of_bounds)))
+    else:
+        print("numba is not installed. JIT backend not benchmarked.")
+
+    print("Per-particle update kernels (us per particle update)")
+    print("dims  " + "".join(["%12s" % name for name, fns in backends]))
+    for dims in DIMENSIONS:
+        times = [time_kernels(*fns, dims) for name, fns in backends]
+        print("%4d  " % dims + "".join(["%12.2f" % (1e6*t) for t in times]))
+
+    print("")
+    print("Full optimizer run, cheap objective (us per evaluation)")
+    run_backends = ['NUMPY'] + (['JIT'] if JIT_AVAILABLE else [])
+    print("dims  " + "".join(["%12s" % name for name in run_backends]))
+    for dims in DIMENSIONS:
+        times = [time_run(backend, dims) for backend in run_backends]
+        print("%4d  " % dims + "".join(["%12.2f" % (1e6*t) for t in times]))
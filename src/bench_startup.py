@@ -0,0 +1,95 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/bench_startup.py'
+#   Start-up benchmark for the 'swarm' class in particle_swarm.py.
+#       Measures the import-plus-construct time of a fresh interpreter
+#       for the pandas-free SwarmConfig path and the original
+#       pandas DataFrame (opt_df) path. Each case runs in its own
+#       subprocess so module import caches do not carry over.
+#
+#   Author(s): Lauren Linkous, Jonathan Lundquist
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+
+REPEATS = 7
+
+# shared problem setup. Kept inline so the benchmark does not pay for
+# importing one of the objective function packages
+PROBLEM = """
+def func_F(X, NO_OF_OUTS=1):
+    return [X[0]**2 + X[1]**2], True
+def constr_F(X):
+    return True
+LB = [[-5, -5]]
+UB = [[5, 5]]
+TARGETS = [0]
+"""
+
+CONFIG_CASE = PROBLEM + """
+from particle_swarm import swarm, SwarmConfig
+opt_df = SwarmConfig(NO_OF_PARTICLES=11, T_MOD=0.65, BOUNDARY=1,
+                     WEIGHTS=[[0.5, 0.7, 0.78]], VLIM=1)
+"""
+
+DATAFRAME_CASE = PROBLEM + """
+import pandas as pd
+from particle_swarm import swarm
+opt_df = pd.DataFrame({'NO_OF_PARTICLES': [11], 'T_MOD': [0.65], 'BOUNDARY': [1],
+                       'WEIGHTS': [[[0.5, 0.7, 0.78]]], 'VLIM': [1]})
+"""
+
+CONSTRUCT = """
+class Quiet():
+    def debug_message_printout(self, txt):
+        pass
+    def record_params(self):
+        pass
+myOptimizer = swarm(LB, UB, TARGETS, 10 ** -18, 10000, func_F, constr_F,
+                    opt_df, parent=Quiet())
+"""
+
+
+def time_case(setup):
+    # the timer starts before any imports in the child process.
+    # Total wall time (including interpreter start-up) is measured here.
+    code = "import time\nt0 = time.perf_counter()\n" + setup + CONSTRUCT + \
+           "print(time.perf_counter() - t0)\n"
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.path.dirname(os.path.abspath(__file__)) + \
+                        os.pathsep + env.get('PYTHONPATH', '')
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], env=env,
+                         capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    return float(out.stdout.strip().splitlines()[-1]), wall
+
+
+def run_benchmark(name, setup):
+    in_proc = []
+    wall = []
+    for i in range(0, REPEATS):
+        t_in, t_wall = time_case(setup)
+        in_proc.append(t_in)
+        wall.append(t_wall)
+    print(name)
+    print("    import + construct (median): %.1f ms" % (1000*np.median(in_proc)))
+    print("    process wall time  (median): %.1f ms" % (1000*np.median(wall)))
+    return np.median(in_proc)
+
+
+if __name__ == "__main__":
+    t_config = run_benchmark("SwarmConfig (numpy only)", CONFIG_CASE)
+    try:
+        import pandas
+        t_df = run_benchmark("pandas DataFrame opt_df", DATAFRAME_CASE)
+        print("speed-up: %.1fx" % (t_df/t_config))
+    except ImportError:
+        print("pandas not installed. Skipping the DataFrame comparison.")
@@ -0,0 +1,240 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/coevolution.py'
+#   Cooperative coevolution for high-dimensional problems. The input
+#       vector is split into groups of dimensions, and each group is
+#       optimized by its own 'swarm'. Sub-swarm particles are evaluated
+#       as full vectors: the group's values are written into a shared
+#       context vector, which holds the best known values of every other
+#       group. The sub-swarms take turns, and each improvement is copied
+#       into the context.
+#
+#       Groups are either fixed ('STATIC', contiguous dimensions) or
+#       redrawn at random after every cycle ('RANDOM'), which lets
+#       interacting variables end up in the same group over time.
+#
+#       CooperativeSwarm has the same state machine interface as 'swarm'
+#       (step, call_objective, complete, get_convergence_data, ...), and
+#       shares its driver loop, result, time budgets and logging through
+#       SwarmDriver.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import sys
+import time
+import numpy as np
+from particle_swarm import swarm, SwarmConfig, SwarmDriver, _opt_param
+
+GROUPINGS = ['RANDOM', 'STATIC']
+
+
+def _opt_dict(opt_df):
+    # opt_df (DataFrame, dict, or SwarmConfig) as a dict in column format
+    if isinstance(opt_df, SwarmConfig):
+        return opt_df.as_opt_params()
+    return {key: [opt_df[key][0]] for key in opt_df}
+
+
+class _Subproblem:
+    # objective and constraint functions of one group. X holds only the
+    # group's dimensions, the rest are taken from the context vector
+    def __init__(self, owner, idx):
+        self.owner = owner
+        self.idx = idx
+
+    def full(self, X):
+        x = np.array(self.owner.context)
+        x[self.idx] = np.ravel(X)
+        return x
+
+    def objective(self, level):
+        def func_F(X, NO_OF_OUTS=1):
+            return self.owner.obj_funcs[level](self.full(X), NO_OF_OUTS)
+        return func_F
+
+    def constraint(self, X):
+        return self.owner.constr_func(self.full(X))
+
+
+class CooperativeSwarm(SwarmDriver):
+    # same arguments as 'swarm'. Additional opt_df parameters:
+    # CC_GROUP_SIZE: int. dimensions per group. Default 10
+    # CC_GROUPING: str. 'RANDOM' (default) or 'STATIC'
+    # CC_TURN: int. evaluations per sub-swarm turn. Default 5 sweeps
+    #               (5*NO_OF_PARTICLES)
+    # MAX_WALLTIME and MAX_OBJ_TIME apply to the whole run. All other
+    # parameters are passed on to the sub-swarms. SEED seeds the grouping
+    # and the context, and each sub-swarm gets its own seed
+    def __init__(self, lbound, ubound, targets, E_TOL, maxit,
+                 obj_func, constr_func,
+                 opt_df,
+                 parent=None,
+                 evaluate_threshold=False, obj_threshold=None,
+                 decimal_limit=4):
+
+        self.parent = parent
+        self.setup_log(opt_df, parent)
+        self.lbound = np.array(lbound[0], dtype=float)
+        self.ubound = np.array(ubound[0], dtype=float)
+        self.targets = targets
+        self.E_TOL = E_TOL
+        self.maxit = maxit
+        self.obj_funcs = list(obj_func) if isinstance(obj_func, (list, tuple)) else [obj_func]
+        self.fidelity_levels = len(self.obj_funcs)
+        self.constr_func = constr_func
+        self.evaluate_threshold = evaluate_threshold
+        self.obj_threshold = obj_threshold
+        self.number_decimals = int(decimal_limit)
+
+        self.group_size = max(1, int(_opt_param(opt_df, 'CC_GROUP_SIZE', 10)))
+        self.grouping = str(_opt_param(opt_df, 'CC_GROUPING', 'RANDOM')).upper()
+        if self.grouping not in GROUPINGS:
+            self.debug_message_printout("WARNING: unrecognized grouping. Defaulting to RANDOM.")
+            self.grouping = 'RANDOM'
+        NO_OF_PARTICLES = int(_opt_param(opt_df, 'NO_OF_PARTICLES'))
+        self.turn_length = int(_opt_param(opt_df, 'CC_TURN', 5*NO_OF_PARTICLES))
+
+        self.max_walltime = _opt_param(opt_df, 'MAX_WALLTIME', None)
+        self.max_objective_time = _opt_param(opt_df, 'MAX_OBJ_TIME', None)
+        self.start_time = None
+        self.elapsed_before = 0.0
+        self.objective_time = 0.0
+
+        # options for the sub-swarms. Only warnings are passed up by default,
+        # since every regrouping creates new sub-swarms. Their messages go
+        # through this swarm's log, so they get no sinks of their own
+        self.sub_opt = {key: value for key, value in _opt_dict(opt_df).items()
+                        if not (key.startswith('CC_') or key in ['MAX_WALLTIME', 'MAX_OBJ_TIME',
+                                                                 'LOG_SINKS', 'LOG_FILE', 'LOG_SAMPLE'])}
+        if 'LOG_LEVEL' not in self.sub_opt:
+            self.sub_opt['LOG_LEVEL'] = ['WARNING']
+
+        self.seed_seq = np.random.SeedSequence(_opt_param(opt_df, 'SEED', None))
+        self.seed = self.seed_seq.entropy
+        self.rng = np.random.default_rng(self.seed_seq.spawn(1)[0])
+
+        # context vector: a random point in the bounds, feasible if one is
+        # found in a few tries. Its fitness is unknown until the first result
+        dims = len(self.lbound)
+        for i in range(0, 100):
+            self.context = np.round(self.rng.random(dims)*(self.ubound - self.lbound) + self.lbound,
+                                    self.number_decimals)
+            if self.constr_func(self.context):
+                break
+        self.F_Gb = sys.maxsize*np.ones((1, len(targets)))
+        self.F_Gb_scalar = np.inf
+        self.F_Gb_penalty = 0.0
+        self.Fvals_Gb = np.full(len(targets), np.nan)
+        self.F_Gb_fidelity = -1
+
+        self.iter = 0
+        self.eval_cost = 0.0
+        self.cycles = 0
+        self.make_groups()
+        self.debug_message_printout("cooperative swarm successfully initialized: " +
+                                    str(len(self.groups)) + " groups")
+
+    def make_groups(self):
+        # split the dimensions into groups and create one sub-swarm per group
+        dims = len(self.lbound)
+        order = np.arange(dims)
+        if self.grouping == 'RANDOM':
+            order = self.rng.permutation(dims)
+        count = int(np.ceil(dims/self.group_size))
+        self.groups = [np.sort(g) for g in np.array_split(order, count)]
+        self.subswarms = [self.make_subswarm(idx) for idx in self.groups]
+        self.turn = 0
+        self.start_turn()
+
+    def make_subswarm(self, idx):
+        sub = _Subproblem(self, idx)
+        opt = dict(self.sub_opt)
+        opt['SEED'] = [int(self.seed_seq.spawn(1)[0].generate_state(1)[0])]
+        funcs = [sub.objective(level) for level in range(0, len(self.obj_funcs))]
+        optimizer = swarm([list(self.lbound[idx])], [list(self.ubound[idx])], self.targets,
+                          self.E_TOL, self.maxit, funcs if len(funcs) > 1 else funcs[0],
+                          sub.constraint, opt, parent=self,
+                          evaluate_threshold=self.evaluate_threshold,
+                          obj_threshold=self.obj_threshold,
+                          decimal_limit=self.number_decimals)
+        return optimizer
+
+    def active(self):
+        return self.subswarms[self.turn]
+
+    def start_turn(self):
+        # the sub-swarm's scores were computed against an older context.
+        # Its global best becomes the context, with the context's fitness
+        optimizer = self.active()
+        idx = self.groups[self.turn]
+        if self.F_Gb_fidelity >= 0:
+            optimizer.rebase_best(self.context[idx], self.F_Gb, self.Fvals_Gb,
+                                  self.F_Gb_penalty, self.F_Gb_fidelity)
+        self.turn_start = optimizer.iter
+
+    def end_turn(self):
+        self.turn = self.turn + 1
+        if self.turn >= len(self.subswarms):
+            self.cycles = self.cycles + 1
+            if self.grouping == 'RANDOM':
+                self.make_groups()
+                return
+            self.turn = 0
+        self.start_turn()
+
+    def call_objective(self, allow_update):
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+        optimizer = self.active()
+        iter_before = optimizer.iter
+        cost_before = optimizer.eval_cost
+        time_before = optimizer.objective_time
+        noError = optimizer.call_objective(allow_update)
+        self.iter = self.iter + (optimizer.iter - iter_before)
+        self.eval_cost = self.eval_cost + (optimizer.eval_cost - cost_before)
+        self.objective_time = self.objective_time + (optimizer.objective_time - time_before)
+        return noError
+
+    def step(self, suppress_output):
+        optimizer = self.active()
+        optimizer.step(suppress_output)
+        if optimizer.F_Gb_scalar < self.F_Gb_scalar:
+            # copy the improvement into the context
+            self.context[self.groups[self.turn]] = np.ravel(optimizer.Gb)
+            self.F_Gb = np.array(optimizer.F_Gb)
+            self.F_Gb_scalar = optimizer.F_Gb_scalar
+            self.F_Gb_penalty = optimizer.F_Gb_penalty
+            self.Fvals_Gb = np.ravel(optimizer.Fvals_Gb)
+            self.F_Gb_fidelity = optimizer.F_Gb_fidelity
+        if (optimizer.iter - self.turn_start >= self.turn_length) or optimizer.complete():
+            if not self.complete():
+                self.end_turn()
+
+    def converged(self):
+        return self.F_Gb_scalar < self.E_TOL
+
+    def depleted(self):
+        return False
+
+    def complete(self):
+        return self.converged() or self.maxed()
+
+    def get_obj_inputs(self):
+        return _Subproblem(self, self.groups[self.turn]).full(self.active().get_obj_inputs())
+
+    def get_convergence_data(self):
+        return 1*self.iter, self.F_Gb_scalar
+
+    def get_optimized_soln(self):
+        return np.array(self.context).reshape(-1, 1)
+
+    def get_optimized_outs(self):
+        return self.F_Gb[0]
+
+    def record_params(self):
+        if self.parent is not None:
+            self.parent.record_params()
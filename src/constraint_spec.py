@@ -0,0 +1,178 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/constraint_spec.py'
+#   Declarative constraints for the 'swarm' class. A ConstraintSpec is
+#       made of linear rows (A x <= b), named expressions, and an
+#       optional plain constraint function as a fallback. The rows and
+#       expressions are checked for many points at once with mask(),
+#       which the swarm uses for initialization, the feasible pool, and
+#       warm starts. A spec can be passed anywhere a constr_func is
+#       accepted, since calling it with one point returns a bool.
+#
+#       Expressions are written in terms of the input vector X, either
+#       as an inequality ('X[2] <= X[0]/2') or as a value g(X) that must
+#       be <= 0 ('X[0]**2 + X[1]**2 - 1'). numpy is available as 'np',
+#       and sin, cos, tan, exp, log, sqrt, abs, minimum, maximum directly.
+#
+#       The linear rows and the bounds define a polytope that can be
+#       sampled directly with sample() (hit-and-run).
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import ast
+import numpy as np
+from swarm_constraints import ConstraintError
+
+_EXPR_NAMES = {'np': np, 'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+               'exp': np.exp, 'log': np.log, 'sqrt': np.sqrt, 'abs': np.abs,
+               'minimum': np.minimum, 'maximum': np.maximum}
+
+
+def compile_expression(expr, name='constraint'):
+    # returns g(X), vectorized, where X is (dims,) or (dims, K) and the
+    # constraint holds when g(X) <= 0
+    tree = ast.parse(expr, mode='eval')
+    body = tree.body
+    if isinstance(body, ast.Compare):
+        if (len(body.ops) != 1) or not isinstance(body.ops[0], (ast.LtE, ast.Lt, ast.GtE, ast.Gt)):
+            raise ValueError("constraint '" + name + "' must be a single <= or >= comparison")
+        left = compile(ast.Expression(body.left), name, 'eval')
+        right = compile(ast.Expression(body.comparators[0]), name, 'eval')
+        sign = 1.0 if isinstance(body.ops[0], (ast.LtE, ast.Lt)) else -1.0
+        def g(X):
+            scope = {'X': X}
+            return sign*(eval(left, {'__builtins__': {}}, {**_EXPR_NAMES, **scope})
+                         - eval(right, {'__builtins__': {}}, {**_EXPR_NAMES, **scope}))
+    else:
+        code = compile(tree, name, 'eval')
+        def g(X):
+            return eval(code, {'__builtins__': {}}, {**_EXPR_NAMES, 'X': X})
+    return g
+
+
+class ConstraintSpec:
+    # A, b:         linear constraints A x <= b. A is (rows, dims)
+    # expressions:  {name: expression} nonlinear constraints
+    # func:         plain constraint function X -> bool, checked point by
+    #               point after the other constraints. For anything that
+    #               cannot be written as an expression
+    # names:        optional names for the linear rows
+    # tol:          allowed violation, for rounding
+    def __init__(self, A=None, b=None, expressions=None, func=None, names=None, tol=1e-12):
+        if A is None:
+            self.A = None
+            self.b = None
+        else:
+            self.A = np.atleast_2d(np.array(A, dtype=float))
+            self.b = np.array(b, dtype=float).reshape(-1)
+            if len(self.b) != np.shape(self.A)[0]:
+                raise ValueError("A and b must have the same number of rows")
+        rows = 0 if self.A is None else np.shape(self.A)[0]
+        if names is None:
+            names = ["linear_" + str(i) for i in range(0, rows)]
+        self.names = list(names)
+        self.expressions = {}
+        if expressions is not None:
+            for name, expr in expressions.items():
+                self.expressions[name] = compile_expression(expr, name)
+                self.names.append(name)
+        self.func = func
+        self.tol = float(tol)
+
+    def values(self, points):
+        # (K, constraints) array of constraint values. <= 0 is feasible.
+        # Columns follow self.names. The fallback func is not included
+        points = np.atleast_2d(np.array(points, dtype=float))
+        cols = []
+        if self.A is not None:
+            cols.append(points @ self.A.T - self.b)
+        for name, g in self.expressions.items():
+            cols.append(np.broadcast_to(np.array(g(points.T), dtype=float), (len(points),)).reshape(-1, 1))
+        if len(cols) == 0:
+            return np.zeros((len(points), 0))
+        return np.hstack(cols)
+
+    def mask(self, points):
+        # boolean array, one entry per row of points
+        points = np.atleast_2d(np.array(points, dtype=float))
+        feasible = np.all(self.values(points) <= self.tol, axis=1)
+        if self.func is not None:
+            for i in np.flatnonzero(feasible):
+                feasible[i] = bool(self.func(points[i]))
+        return feasible
+
+    def __call__(self, X):
+        # one point, same interface as constr_func. Checked directly,
+        # since the swarm calls this once per particle update
+        X = np.ravel(X)
+        if (self.A is not None) and np.any(self.A @ X - self.b > self.tol):
+            return False
+        for g in self.expressions.values():
+            if g(X) > self.tol:
+                return False
+        if self.func is not None:
+            return bool(self.func(X))
+        return True
+
+    def violation(self, X):
+        # degree of violation at one point, for CONSTRAINT_MODE 'PENALTY'.
+        # Sum of the positive constraint values, plus 1 if the fallback
+        # function fails
+        total = float(np.sum(np.maximum(self.values(np.ravel(X).reshape(1, -1)), 0.0)))
+        if (self.func is not None) and not self.func(np.ravel(X)):
+            total = total + 1.0
+        return total
+
+    def violated(self, X):
+        # names of the constraints X fails, for error messages
+        vals = self.values(np.ravel(X).reshape(1, -1))[0]
+        failed = [self.names[i] for i in np.flatnonzero(vals > self.tol)]
+        if (self.func is not None) and not self.func(np.ravel(X)):
+            failed.append('func')
+        return failed
+
+    def is_linear(self):
+        return (self.A is not None) and (len(self.expressions) == 0) and (self.func is None)
+
+    def sample(self, rng, n, lbound, ubound, steps=50, max_batches=100):
+        # n points inside the polytope lbound <= x <= ubound, A x <= b,
+        # using n hit-and-run chains run side by side. Expressions and the
+        # fallback func are not used here. Filter the result with mask()
+        lbound = np.asarray(lbound, dtype=float)
+        ubound = np.asarray(ubound, dtype=float)
+        dims = len(lbound)
+        A = np.vstack([np.eye(dims), -np.eye(dims)])
+        b = np.concatenate([ubound, -lbound])
+        if self.A is not None:
+            A = np.vstack([self.A, A])
+            b = np.concatenate([self.b, b])
+
+        # starting points, by rejection from the box
+        start = None
+        for i in range(0, max_batches):
+            batch = rng.random((max(n, 64), dims))*(ubound - lbound) + lbound
+            inside = batch[np.all(batch @ A.T <= b, axis=1)]
+            if len(inside) > 0:
+                start = inside
+                break
+        if start is None:
+            raise ConstraintError("no point found inside the linear constraints and bounds. "
+                                  "The polytope may be empty.")
+        x = start[np.arange(n) % len(start)]
+
+        for step in range(0, int(steps)):
+            d = rng.standard_normal((n, dims))
+            d = d/np.linalg.norm(d, axis=1, keepdims=True)
+            ad = d @ A.T
+            slack = np.maximum(b - x @ A.T, 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = slack/ad
+            t_max = np.min(np.where(ad > 0, ratio, np.inf), axis=1)
+            t_min = np.max(np.where(ad < 0, ratio, -np.inf), axis=1)
+            t = t_min + rng.random(n)*(t_max - t_min)
+            x = x + t[:, None]*d
+        return x
@@ -0,0 +1,409 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/eval_broker.py'
+#   Socket-based distributed objective function evaluation. A broker
+#       on the optimizer side hands out evaluations to worker processes
+#       on any number of simulation hosts over plain TCP. The broker
+#       uses the same evaluator interface as ParallelEvaluator, so it
+#       can be passed straight to swarm.evaluate_generation().
+#
+#       Workers register, pull work, send heartbeats while evaluating,
+#       and return (Fvals, noError). Work held by a worker that stops
+#       sending heartbeats (or disconnects) is requeued. Heartbeats come
+#       from a background thread, so they do not show a hung objective
+#       function. With task_timeout, a worker that holds one evaluation
+#       longer than that is dropped as well, and the evaluation requeued.
+#       A dropped worker registers again once its evaluation returns. If
+#       the last worker is dropped, the pending evaluations are returned
+#       with noError = False instead of waiting for workers that may
+#       never come back.
+#
+#       Wire format. Every message is one frame:
+#           8 bytes   big-endian unsigned frame length (rest of frame)
+#           4 bytes   big-endian unsigned header length
+#           header    UTF-8 JSON object, always with a 'type' field
+#           payload   optional NumPy array in .npy format
+#
+#       Message types:
+#           worker -> broker: REGISTER, PULL, HEARTBEAT, RESULT
+#           broker -> worker: WELCOME, TASK, WAIT, SHUTDOWN
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import io
+import json
+import multiprocessing as mp
+import socket
+import struct
+import threading
+import time
+from collections import deque
+import numpy as np
+
+_FRAME = struct.Struct('>Q')
+_HEADER = struct.Struct('>I')
+
+
+def send_message(sock, header, array=None):
+    header_bytes = json.dumps(header).encode('utf-8')
+    payload = b''
+    if array is not None:
+        buf = io.BytesIO()
+        np.save(buf, np.asarray(array), allow_pickle=False)
+        payload = buf.getvalue()
+    body = _HEADER.pack(len(header_bytes)) + header_bytes + payload
+    sock.sendall(_FRAME.pack(len(body)) + body)
+
+
+def _recv_exact(sock, n):
+    data = bytearray()
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def recv_message(sock):
+    # returns (header dict, array or None)
+    (length,) = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    body = _recv_exact(sock, length)
+    (header_length,) = _HEADER.unpack(body[:_HEADER.size])
+    header = json.loads(body[_HEADER.size:_HEADER.size+header_length].decode('utf-8'))
+    payload = body[_HEADER.size+header_length:]
+    array = None
+    if len(payload) > 0:
+        array = np.load(io.BytesIO(payload), allow_pickle=False)
+    return header, array
+
+
+class EvalBroker:
+    # optimizer-side broker and drop-in evaluator.
+    # host, port:         address to listen on. port=0 picks a free port (see self.port)
+    # output_size:        number of objective function outputs
+    # heartbeat_timeout:  seconds without a heartbeat before a worker is
+    #                     considered dead and its work is requeued
+    # max_retries:        requeues of one evaluation before it is returned
+    #                     with noError = False
+    # task_timeout:       seconds one evaluation may run before its worker is
+    #                     dropped and the evaluation requeued. Default None (no limit)
+    def __init__(self, output_size, host='127.0.0.1', port=0,
+                 heartbeat_timeout=10.0, max_retries=2, task_timeout=None):
+        self.output_size = int(output_size)
+        self.heartbeat_timeout = float(heartbeat_timeout)
+        self.task_timeout = None if task_timeout is None else float(task_timeout)
+        self.max_retries = int(max_retries)
+
+        self._lock = threading.Lock()
+        self._results_ready = threading.Condition(self._lock)
+        self._queue = deque()
+        self._tasks = {}
+        self._results = []
+        self._workers = {}   # worker id -> {'sock', 'task_id', 'task_started', 'last_seen', 'host', 'send_lock'}
+        self._next_task = 0
+        self._next_worker = 0
+        self._closing = False
+
+        # counters for reporting
+        self.completed = 0
+        self.requeued = 0
+        self.failures = 0
+        self.dead_workers = 0
+        self.timeouts = 0
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen()
+        self.host, self.port = self._server.getsockname()[:2]
+
+        self._threads = [threading.Thread(target=self._accept_loop, daemon=True),
+                         threading.Thread(target=self._monitor_loop, daemon=True)]
+        for t in self._threads:
+            t.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # evaluator interface
+    def submit(self, key, position):
+        with self._lock:
+            task_id = self._next_task
+            self._next_task = self._next_task + 1
+            self._tasks[task_id] = {'key': key,
+                                    'position': np.array(position, dtype=float),
+                                    'attempts': 0}
+            self._queue.append(task_id)
+        return task_id
+
+    def pending(self):
+        with self._lock:
+            return len(self._tasks)
+
+    def poll(self, wait=None):
+        # list of (key, Fvals, noError, duration). Blocks until at least one
+        # result is available, nothing is pending, or 'wait' seconds pass
+        with self._results_ready:
+            deadline = None if wait is None else time.monotonic() + wait
+            while (len(self._results) == 0) and (len(self._tasks) > 0):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if (remaining is not None) and (remaining <= 0):
+                    break
+                self._results_ready.wait(timeout=remaining)
+            results = self._results
+            self._results = []
+        return results
+
+    def worker_count(self):
+        with self._lock:
+            return len(self._workers)
+
+    def close(self):
+        self._closing = True
+        with self._lock:
+            workers = list(self._workers.values())
+        for w in workers:
+            try:
+                with w['send_lock']:
+                    send_message(w['sock'], {'type': 'SHUTDOWN'})
+            except OSError:
+                pass
+        try:
+            self._server.close()
+        except OSError:
+            pass
+
+    # broker internals
+    def _accept_loop(self):
+        while not self._closing:
+            try:
+                conn, addr = self._server.accept()
+            except OSError:
+                break
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve_worker, args=(conn,), daemon=True).start()
+
+    def _serve_worker(self, conn):
+        worker_id = None
+        try:
+            header, array = recv_message(conn)
+            if header.get('type') != 'REGISTER':
+                conn.close()
+                return
+            with self._lock:
+                worker_id = self._next_worker
+                self._next_worker = self._next_worker + 1
+                self._workers[worker_id] = {'sock': conn, 'task_id': None, 'task_started': 0.0,
+                                            'last_seen': time.monotonic(),
+                                            'host': header.get('host', ''),
+                                            'send_lock': threading.Lock()}
+            send_lock = self._workers[worker_id]['send_lock']
+            with send_lock:
+                send_message(conn, {'type': 'WELCOME', 'worker_id': worker_id,
+                                    'output_size': self.output_size,
+                                    'heartbeat_interval': self.heartbeat_timeout/4})
+
+            while not self._closing:
+                header, array = recv_message(conn)
+                kind = header.get('type')
+                with self._lock:
+                    if worker_id not in self._workers:
+                        break # declared dead by the monitor
+                    self._workers[worker_id]['last_seen'] = time.monotonic()
+                if kind == 'HEARTBEAT':
+                    continue
+                elif kind == 'RESULT':
+                    self._finish(worker_id, header, array)
+                elif kind == 'PULL':
+                    with send_lock:
+                        self._hand_out(worker_id, conn)
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            if worker_id is not None:
+                self._drop_worker(worker_id)
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _hand_out(self, worker_id, conn):
+        with self._lock:
+            task_id = None
+            while len(self._queue) > 0:
+                candidate = self._queue.popleft()
+                if candidate in self._tasks:
+                    task_id = candidate
+                    break
+            if task_id is not None:
+                self._workers[worker_id]['task_id'] = task_id
+                self._workers[worker_id]['task_started'] = time.monotonic()
+                position = self._tasks[task_id]['position']
+        if task_id is None:
+            send_message(conn, {'type': 'WAIT'})
+        else:
+            send_message(conn, {'type': 'TASK', 'task_id': task_id}, position)
+
+    def _finish(self, worker_id, header, array):
+        with self._results_ready:
+            w = self._workers.get(worker_id)
+            if w is not None:
+                w['task_id'] = None
+            task = self._tasks.pop(header['task_id'], None)
+            if task is None:
+                return # already requeued and returned by another worker
+            Fvals = np.zeros(self.output_size) if array is None else np.array(array, dtype=float).reshape(-1)
+            self._results.append((task['key'], Fvals, bool(header.get('noError', False)),
+                                  float(header.get('duration', 0.0))))
+            self.completed = self.completed + 1
+            self._results_ready.notify_all()
+
+    def _drop_worker(self, worker_id):
+        # remove a dead or disconnected worker and requeue its evaluation
+        with self._results_ready:
+            w = self._workers.pop(worker_id, None)
+            if w is None:
+                return
+            if not self._closing:
+                self.dead_workers = self.dead_workers + 1
+            task = self._tasks.get(w['task_id'])
+            if task is not None:
+                task['attempts'] = task['attempts'] + 1
+                if task['attempts'] > self.max_retries:
+                    self._fail_task(w['task_id'])
+                else:
+                    self.requeued = self.requeued + 1
+                    self._queue.appendleft(w['task_id'])
+            if (len(self._workers) == 0) and not self._closing:
+                # no worker left to run the queue
+                for task_id in list(self._tasks):
+                    self._fail_task(task_id)
+                self._queue.clear()
+        try:
+            w['sock'].shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _fail_task(self, task_id):
+        # return an evaluation with noError = False. Called with the lock held
+        task = self._tasks.pop(task_id)
+        self.failures = self.failures + 1
+        self._results.append((task['key'], np.zeros(self.output_size), False, 0.0))
+        self._results_ready.notify_all()
+
+    def _monitor_loop(self):
+        interval = min(1.0, self.heartbeat_timeout/4)
+        if self.task_timeout is not None:
+            interval = min(interval, self.task_timeout/4)
+        while not self._closing:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                dead = [wid for wid, w in self._workers.items()
+                        if now - w['last_seen'] > self.heartbeat_timeout]
+                if self.task_timeout is not None:
+                    # heartbeats keep coming while the objective hangs
+                    stuck = [wid for wid, w in self._workers.items()
+                             if (w['task_id'] is not None) and (wid not in dead) and
+                             (now - w['task_started'] > self.task_timeout)]
+                    self.timeouts = self.timeouts + len(stuck)
+                    dead = dead + stuck
+            for wid in dead:
+                self._drop_worker(wid)
+
+
+def run_worker(host, port, obj_func, idle_wait=0.05, reconnect=True):
+    # worker loop. Connects to the broker, evaluates positions with
+    # obj_func until the broker sends SHUTDOWN or can no longer be reached.
+    # With reconnect, a worker the broker dropped (e.g. for task_timeout)
+    # registers again once its evaluation returns
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+        except OSError:
+            return # broker closed
+        if _worker_session(sock, obj_func, idle_wait) or not reconnect:
+            return
+
+
+def _worker_session(sock, obj_func, idle_wait):
+    # one connection to the broker. Returns True on SHUTDOWN, False if the
+    # connection was lost. A background thread sends heartbeats while an
+    # evaluation runs.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    send_lock = threading.Lock()
+    stop = threading.Event()
+    try:
+        send_message(sock, {'type': 'REGISTER', 'host': socket.gethostname()})
+        header, array = recv_message(sock)
+        output_size = int(header['output_size'])
+        interval = float(header['heartbeat_interval'])
+
+        def heartbeat():
+            while not stop.wait(interval):
+                try:
+                    with send_lock:
+                        send_message(sock, {'type': 'HEARTBEAT'})
+                except OSError:
+                    break
+        threading.Thread(target=heartbeat, daemon=True).start()
+
+        while True:
+            with send_lock:
+                send_message(sock, {'type': 'PULL'})
+            header, position = recv_message(sock)
+            kind = header.get('type')
+            if kind == 'SHUTDOWN':
+                return True
+            elif kind == 'WAIT':
+                time.sleep(idle_wait)
+                continue
+            elif kind != 'TASK':
+                continue
+            t0 = time.perf_counter()
+            try:
+                Fvals, noError = obj_func(position, output_size)
+                Fvals = np.array(Fvals, dtype=float).reshape(-1)
+            except Exception:
+                Fvals, noError = np.zeros(output_size), False
+            with send_lock:
+                send_message(sock, {'type': 'RESULT', 'task_id': header['task_id'],
+                                    'noError': bool(noError),
+                                    'duration': time.perf_counter()-t0}, Fvals)
+    except (ConnectionError, OSError):
+        return False
+    finally:
+        stop.set()
+        sock.close()
+
+
+def spawn_local_workers(count, host, port, obj_func, start_method=None):
+    # start 'count' worker processes on this machine. Returns the processes
+    ctx = mp.get_context(start_method)
+    procs = []
+    for i in range(0, int(count)):
+        p = ctx.Process(target=run_worker, args=(host, port, obj_func), daemon=True)
+        p.start()
+        procs.append(p)
+    return procs
+
+
+if __name__ == "__main__":
+    # remote worker entry point:
+    #   python eval_broker.py HOST PORT package.module.function
+    import importlib
+    import sys
+    if len(sys.argv) != 4:
+        print("usage: eval_broker.py HOST PORT package.module.function")
+        sys.exit(1)
+    module_name, func_name = sys.argv[3].rsplit('.', 1)
+    obj_func = getattr(importlib.import_module(module_name), func_name)
+    run_worker(sys.argv[1], int(sys.argv[2]), obj_func)
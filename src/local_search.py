@@ -0,0 +1,192 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/local_search.py'
+#   Derivative-free local searches for the hybrid refinement phase of
+#       the 'swarm' class. Both searches use an ask()/tell() interface,
+#       so the swarm can hand out one point per call_objective() like it
+#       does for particles:
+#           x = search.ask()        # next point to evaluate, None when done
+#           search.tell(fitness)    # scalar fitness of that point
+#
+#       Points are clipped to the bounds and rounded to the decimal limit.
+#       Points that fail the feasibility function are scored as inf
+#       without being evaluated, and repeated points are looked up instead
+#       of evaluated again. A search ends when its evaluation budget is
+#       spent or its step falls below the decimal resolution.
+#
+#       NelderMead:    simplex search (reflection, expansion, contraction,
+#                      shrink), with the standard coefficients
+#       PatternSearch: compass search. Polls +/- step along each axis,
+#                      moves on any improvement, halves the step otherwise
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+from abc import ABC, abstractmethod
+import numpy as np
+
+LOCAL_SEARCH_METHODS = ['NONE', 'NELDER_MEAD', 'PATTERN']
+
+
+class _BudgetSpent(Exception):
+    pass
+
+
+class LocalSearch(ABC):
+    # x0, f0:     starting point (Gb) and its fitness
+    # step:       initial step per dimension
+    # feasible:   optional X -> bool. Infeasible points are not evaluated
+    # budget:     maximum number of objective function evaluations
+    def __init__(self, x0, f0, lbound, ubound, decimals, step, feasible=None, budget=100):
+        self.lbound = np.ravel(np.asarray(lbound, dtype=float))
+        self.ubound = np.ravel(np.asarray(ubound, dtype=float))
+        self.decimals = int(decimals)
+        self.resolution = 10.0**(-self.decimals)
+        self.step = np.maximum(np.broadcast_to(np.asarray(step, dtype=float), self.lbound.shape),
+                               self.resolution)
+        self.feasible = feasible
+        self.budget = int(budget)
+        self.evaluations = 0
+        self.best_x = self.project(x0)
+        self.best_f = float(f0)
+        self.cache = {tuple(self.best_x): self.best_f}
+        self.pending = None
+        self.done = False
+        self._search_gen = self._search()
+        self._send(None)
+
+    def project(self, x):
+        return np.round(np.clip(np.ravel(x), self.lbound, self.ubound), self.decimals)
+
+    def ask(self):
+        return None if self.done else np.array(self.pending)
+
+    def tell(self, fitness):
+        if not self.done:
+            self._send(float(fitness))
+
+    def _send(self, value):
+        try:
+            if value is None:
+                self.pending = next(self._search_gen)
+            else:
+                self.pending = self._search_gen.send(value)
+        except (StopIteration, _BudgetSpent):
+            self.pending = None
+            self.done = True
+
+    def _evaluate(self, x):
+        # generator helper. f = yield from self._evaluate(x), with x projected
+        key = tuple(x)
+        if key in self.cache:
+            return self.cache[key]
+        if (self.feasible is not None) and not self.feasible(x):
+            self.cache[key] = np.inf
+            return np.inf
+        if self.evaluations >= self.budget:
+            raise _BudgetSpent()
+        f = yield x
+        self.evaluations = self.evaluations + 1
+        self.cache[key] = f
+        if f < self.best_f:
+            self.best_f = f
+            self.best_x = np.array(x)
+        return f
+
+    @abstractmethod
+    def _search(self):
+        # generator. Gets points scored with 'f = yield from self._evaluate(x)'
+        # and returns when the search is done. _evaluate() keeps best_x/best_f
+        pass
+
+
+class NelderMead(LocalSearch):
+    def _search(self):
+        dims = len(self.best_x)
+        simplex = [np.array(self.best_x)]
+        fs = [self.best_f]
+        for i in range(0, dims):
+            # step along each axis, away from the nearer bound
+            v = np.array(self.best_x)
+            if v[i] + self.step[i] <= self.ubound[i]:
+                v[i] = v[i] + self.step[i]
+            else:
+                v[i] = v[i] - self.step[i]
+            v = self.project(v)
+            simplex.append(v)
+            fs.append((yield from self._evaluate(v)))
+
+        stalled = 0
+        while stalled < 2*dims + 2:
+            order = np.argsort(fs, kind='stable')
+            simplex = [simplex[i] for i in order]
+            fs = [fs[i] for i in order]
+            size = np.max(np.abs(np.array(simplex[1:]) - simplex[0]))
+            if size < self.resolution:
+                return
+            used = self.evaluations
+
+            best, worst = simplex[0], simplex[-1]
+            centroid = np.mean(simplex[:-1], axis=0)
+            xr = self.project(centroid + (centroid - worst))
+            fr = yield from self._evaluate(xr)
+            if fs[0] <= fr < fs[-2]:
+                simplex[-1], fs[-1] = xr, fr
+            elif fr < fs[0]:
+                xe = self.project(centroid + 2.0*(centroid - worst))
+                fe = yield from self._evaluate(xe)
+                if fe < fr:
+                    simplex[-1], fs[-1] = xe, fe
+                else:
+                    simplex[-1], fs[-1] = xr, fr
+            else:
+                if fr < fs[-1]:
+                    xc = self.project(centroid + 0.5*(xr - centroid))
+                else:
+                    xc = self.project(centroid + 0.5*(worst - centroid))
+                fc = yield from self._evaluate(xc)
+                if fc < min(fr, fs[-1]):
+                    simplex[-1], fs[-1] = xc, fc
+                else:
+                    # shrink towards the best vertex
+                    for i in range(1, dims + 1):
+                        simplex[i] = self.project(best + 0.5*(simplex[i] - best))
+                        fs[i] = yield from self._evaluate(simplex[i])
+
+            # rounding can make the simplex cycle through known points
+            stalled = stalled + 1 if self.evaluations == used else 0
+
+
+class PatternSearch(LocalSearch):
+    def _search(self):
+        dims = len(self.best_x)
+        step = np.array(self.step)
+        while np.any(step >= self.resolution):
+            moved = False
+            for i in range(0, dims):
+                if step[i] < self.resolution:
+                    continue
+                for sign in [1.0, -1.0]:
+                    x = np.array(self.best_x)
+                    x[i] = x[i] + sign*step[i]
+                    x = self.project(x)
+                    f0 = self.best_f
+                    yield from self._evaluate(x)
+                    if self.best_f < f0:
+                        moved = True
+                        break
+            if not moved:
+                step = step/2.0
+
+
+def make_local_search(method, x0, f0, lbound, ubound, decimals, step, feasible=None, budget=100):
+    method = str(method).upper()
+    if method == 'NELDER_MEAD':
+        return NelderMead(x0, f0, lbound, ubound, decimals, step, feasible, budget)
+    if method == 'PATTERN':
+        return PatternSearch(x0, f0, lbound, ubound, decimals, step, feasible, budget)
+    raise ValueError("unrecognized local search method '" + str(method) + "'. Use one of " +
+                     str(LOCAL_SEARCH_METHODS[1:]))
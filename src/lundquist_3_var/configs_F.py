@@ -21,6 +21,14 @@ except: # for local
 
 OBJECTIVE_FUNC = func_F
 CONSTR_FUNC = constr_F
+# constr_F as linear rows A x <= b, for a ConstraintSpec built by the
+# driver (see constraint_spec.py)
+#   X[2] <= X[0]/2   ->   -0.5*X[0] + X[2] <= 0
+#   X[2] >= 0.1      ->   -X[2] <= -0.1
+CONSTR_A = [[-0.5, 0, 1],
+            [0, 0, -1]]
+CONSTR_B = [0, -0.1]
+CONSTR_NAMES = ['x3 <= x1/2', 'x3 >= 0.1']
 OBJECTIVE_FUNC_NAME = "lundquist_3_var.func_F"
 CONSTR_FUNC_NAME = "lundquist_3_var.constr_F"
 
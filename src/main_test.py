@@ -16,6 +16,7 @@
 import pandas as pd
 import numpy as np
 from particle_swarm import swarm
+from constraint_spec import ConstraintSpec
 
 # OBJECTIVE FUNCTION SELECTION
 #import one_dim_x_test.configs_F as func_configs     # single objective, 1D input
@@ -36,6 +37,10 @@ if __name__ == "__main__":
     # Objective function dependent variables
     func_F = func_configs.OBJECTIVE_FUNC  # objective function
     constr_F = func_configs.CONSTR_FUNC   # constraint function
+    # lundquist_3_var also lists its constraints as linear rows. The same
+    # constraints as a ConstraintSpec, checked a whole batch at a time:
+    #constr_F = ConstraintSpec(A=func_configs.CONSTR_A, b=func_configs.CONSTR_B,
+    #                          names=func_configs.CONSTR_NAMES)
 
     LB = func_configs.LB              # Lower boundaries, [[0.21, 0, 0.1]]
     UB = func_configs.UB              # Upper boundaries, [[1, 1, 0.5]]   
@@ -59,11 +64,9 @@ if __name__ == "__main__":
     VLIM = 1                           # Initial velocity limit
 
 
-    best_eval = 1
     parent = None             # for the optimizer test ONLY
     evaluate_threshold = True # use target or threshold. True = THRESHOLD, False = EXACT TARGET
     suppress_output = True    # Suppress the console output of particle swarm
-    allow_update = True       # Allow objective call to update state 
 
 
     # Constant variables in a list format
@@ -84,32 +87,21 @@ if __name__ == "__main__":
                             evaluate_threshold=evaluate_threshold, obj_threshold=THRESHOLD,
                             decimal_limit=5)  
 
-    while not myOptimizer.complete():
-        # step through optimizer processing
-        # this will update particle or agent locations
-        myOptimizer.step(suppress_output)
-        # call the objective function, control 
-        # when it is allowed to update and return 
-        # control to optimizer
-        myOptimizer.call_objective(allow_update)
-        # check the current progress of the optimizer
-        # iter: the number of objective function calls
-        # eval: current 'best' evaluation of the optimizer
-        iter, eval = myOptimizer.get_convergence_data()
-        if (eval < best_eval) and (eval != 0):
-            best_eval = eval
-        
+    def report(iter, eval):
         # optional. if the optimizer is not printing out detailed 
         # reports, preview by checking the iteration and best evaluation
+        print("Iteration")
+        print(iter)
+        print("Best Eval")
+        print(eval)
 
-        if suppress_output:
-            if iter%100 ==0: #print out every 100th iteration update
-                print("Iteration")
-                print(iter)
-                print("Best Eval")
-                print(best_eval)
+    # run the step()/call_objective() loop to completion.
+    # report() is called every 100 objective function calls
+    result = myOptimizer.run(callback=report if suppress_output else None, every=100,
+                             suppress_output=suppress_output)
 
+    print("Stopped: " + result.stop_reason)
     print("Optimized Solution")
-    print(myOptimizer.get_optimized_soln())
+    print(result.solution)
     print("Optimized Outputs")
-    print(myOptimizer.get_optimized_outs())
+    print(result.outputs)
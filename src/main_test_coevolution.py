@@ -0,0 +1,60 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/main_test_coevolution.py'
+#   Test function/example for the cooperative coevolution mode in
+#       coevolution.py, on a 1000 dimensional shifted sphere. The input
+#       vector is split into groups of 10 dimensions, each optimized by
+#       its own sub-swarm against a shared context vector.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+from particle_swarm import SwarmConfig
+from coevolution import CooperativeSwarm
+
+
+def func_F(X, NO_OF_OUTS=1):
+    # shifted sphere, minimum 0 at X = 0.3
+    F = np.zeros((NO_OF_OUTS))
+    noErrors = True
+    try:
+        F[0] = np.sum((np.ravel(X) - 0.3)**2)
+    except:
+        noErrors = False
+    return F, noErrors
+
+
+def constr_F(X):
+    return True
+
+
+if __name__ == "__main__":
+    DIMS = 1000                  # input variables
+    MAXIT = 50000                # Maximum allowed iterations
+    TOL = 10 ** -6               # Convergence Tolerance
+
+    LB = [[-1.0]*DIMS]
+    UB = [[1.0]*DIMS]
+    TARGETS = [0]
+
+    opt_df = SwarmConfig(NO_OF_PARTICLES=11, T_MOD=0.65, BOUNDARY=1,
+                         WEIGHTS=[[0.5, 0.7, 0.78]], VLIM=1,
+                         CC_GROUP_SIZE=10,        # dimensions per sub-swarm
+                         CC_GROUPING='RANDOM',    # 'RANDOM' or 'STATIC'
+                         CC_TURN=55)              # evaluations per sub-swarm turn
+    myOptimizer = CooperativeSwarm(LB, UB, TARGETS, TOL, MAXIT,
+                                   func_F, constr_F, opt_df, parent=None,
+                                   evaluate_threshold=False, obj_threshold=None,
+                                   decimal_limit=6)
+
+    def report(iter, eval):
+        print("Iteration: " + str(iter) + "  Best Eval: " + str(eval))
+
+    result = myOptimizer.run(callback=report, every=5000)
+    print("Stopped: " + result.stop_reason)
+    print("Best Eval")
+    print(result.best_eval)
@@ -96,32 +96,27 @@ class TestDetails():
         print(msg)
 
 
+    def report(self, iter, eval):
+        if (eval < self.best_eval) and (eval != 0):
+            self.best_eval = eval
+        if self.suppress_output:
+            print("Iteration")
+            print(iter)
+            print("Best Eval")
+            print(self.best_eval)
+
     def run(self):
 
-        # instantiation of particle swarm optimizer 
-        while not self.myOptimizer.complete():
-
-            # step through optimizer processing
-            self.myOptimizer.step(self.suppress_output)
-
-            # call the objective function, control 
-            # when it is allowed to update and return 
-            # control to optimizer
-            self.myOptimizer.call_objective(self.allow_update)
-            iter, eval = self.myOptimizer.get_convergence_data()
-            if (eval < self.best_eval) and (eval != 0):
-                self.best_eval = eval
-            if self.suppress_output:
-                if iter%100 ==0: #print out every 100th iteration update
-                    print("Iteration")
-                    print(iter)
-                    print("Best Eval")
-                    print(self.best_eval)
+        # run the optimizer to completion. report() is called
+        # every 100 objective function calls
+        result = self.myOptimizer.run(callback=self.report, every=100,
+                                      suppress_output=self.suppress_output)
 
+        print("Stopped: " + result.stop_reason)
         print("Optimized Solution")
-        print(self.myOptimizer.get_optimized_soln())
+        print(result.solution)
         print("Optimized Outputs")
-        print(self.myOptimizer.get_optimized_outs())
+        print(result.outputs)
 
 
 
@@ -21,6 +21,7 @@ import pandas as pd
 import time
 import matplotlib.pyplot as plt
 from particle_swarm import swarm
+from swarm_render import plot_swarm
 
 
 
@@ -137,62 +138,8 @@ class TestGraph():
             self.ax1.clear() #use this to git rid of the 'ant tunnel' trails
             self.ax2.clear()
 
-        # MOVEMENT PLOT
-        if np.shape(x_coords)[1]==1: # 1 dim function
-            x_plot_coords = np.array(x_coords[:,0])*0.0
-            self.ax1.set_title("Search Locations, Iteration: " + str(self.ctr))
-            self.ax1.set_xlabel("$x_1$")
-            self.ax1.set_ylabel("filler coords")
-            self.ax1.set_zlabel("filler coords")
-            self.scatter = self.ax1.scatter(x_coords, x_plot_coords, edgecolors='b')   
-        
-        elif np.shape(x_coords)[1] == 2: #2-dim func
-            self.ax1.set_title("Search Locations, Iteration: " + str(self.ctr))
-            self.ax1.set_xlabel("$x_1$")
-            self.ax1.set_ylabel("$x_2$")
-            self.ax1.set_zlabel("filler coords")            
-            self.scatter = self.ax1.scatter(x_coords[:,0], x_coords[:,1], edgecolors='b')
-
-        elif np.shape(x_coords)[1] == 3: #3-dim func
-            self.ax1.set_title("Search Locations, Iteration: " + str(self.ctr))
-            self.ax1.set_xlabel("$x_1$")
-            self.ax1.set_ylabel("$x_2$")
-            self.ax1.set_zlabel("$x_3$")
-            self.scatter = self.ax1.scatter(x_coords[:,0], x_coords[:,1], x_coords[:,2], edgecolors='b')
-
-
-        # FITNESS PLOT
-        if np.shape(y_coords)[1] == 1: #1-dim obj func
-            y_plot_filler = np.array(y_coords[:,0])*0.0
-            self.ax2.set_title("Global Best Fitness Relation to Target")
-            self.ax2.set_xlabel("$F_{1}(x_1,x_2)$")
-            self.ax2.set_ylabel("filler coords")
-            self.ax2.set_zlabel("filler coords")
-            self.scatter = self.ax2.scatter(y_coords, y_plot_filler,  marker='o', s=40, facecolor="none", edgecolors="k")
-
-        elif np.shape(y_coords)[1] == 2: #2-dim obj func
-            self.ax2.set_title("Global Best Fitness Relation to Target")
-            self.ax2.set_xlabel("$F_{1}(x_1,x_2)$")
-            self.ax2.set_ylabel("$F_{2}(x_1,x_2)$")
-            self.ax2.set_zlabel("filler coords")
-            self.scatter = self.ax2.scatter(y_coords[:,0], y_coords[:,1], marker='o', s=40, facecolor="none", edgecolors="k")
-
-        elif np.shape(y_coords)[1] == 3: #3-dim obj fun
-            self.ax2.set_title("Global Best Fitness Relation to Target")
-            self.ax2.set_xlabel("$F_{1}(x_1,x_2)$")
-            self.ax2.set_ylabel("$F_{2}(x_1,x_2)$")
-            self.ax2.set_zlabel("$F_{3}(x_1,x_2)$")
-            self.scatter = self.ax2.scatter(y_coords[:,0], y_coords[:,1], y_coords[:,2], marker='o', s=40, facecolor="none", edgecolors="k")
-
-
-        if showTarget == True: # plot the target point
-            if len(targets) == 1:
-                self.scatter = self.ax2.scatter(targets[0], 0, marker='*', edgecolors='r')
-            if len(targets) == 2:
-                self.scatter = self.ax2.scatter(targets[0], targets[1], marker='*', edgecolors='r')
-            elif len(targets) == 3:
-                self.scatter = self.ax2.scatter(targets[0], targets[1], targets[2], marker='*', edgecolors='r')
-
+        # same layout as the offline renderer (swarm_render.py)
+        plot_swarm(self.ax1, self.ax2, x_coords, y_coords, targets, self.ctr, showTarget=showTarget)
 
         plt.pause(0.0001)  # Pause to update the plot
         if self.ctr == 0:
@@ -200,34 +147,30 @@ class TestGraph():
 
         self.ctr = self.ctr + 1
 
+    def report(self, iter, eval):
+        if (eval < self.best_eval) and (eval != 0):
+            self.best_eval = eval
+        if self.suppress_output:
+            if iter%100 ==0: #print out every 100th iteration update
+                print("Iteration")
+                print(iter)
+                print("Best Eval")
+                print(self.best_eval)
+        m_coords = self.myOptimizer.M  #get x,y,z coordinate locations
+        f_coords = self.myOptimizer.F_Gb # global best of set
+        self.update_plot(m_coords, f_coords, self.targets, showTarget=True, clearAx=True) #update matplot
+
     def run(self):
-        # instantiation of particle swarm optimizer 
-        while not self.myOptimizer.complete():
-
-            # step through optimizer processing
-            self.myOptimizer.step(self.suppress_output)
-
-            # call the objective function, control 
-            # when it is allowed to update and return 
-            # control to optimizer
-            self.myOptimizer.call_objective(self.allow_update)
-            iter, eval = self.myOptimizer.get_convergence_data()
-            if (eval < self.best_eval) and (eval != 0):
-                self.best_eval = eval
-            if self.suppress_output:
-                if iter%100 ==0: #print out every 100th iteration update
-                    print("Iteration")
-                    print(iter)
-                    print("Best Eval")
-                    print(self.best_eval)
-            m_coords = self.myOptimizer.M  #get x,y,z coordinate locations
-            f_coords = self.myOptimizer.F_Gb # global best of set
-            self.update_plot(m_coords, f_coords, self.targets, showTarget=True, clearAx=True) #update matplot
+        # run the optimizer to completion. report() is called after
+        # every objective function call to redraw the plot
+        result = self.myOptimizer.run(callback=self.report, every=1,
+                                      suppress_output=self.suppress_output)
 
+        print("Stopped: " + result.stop_reason)
         print("Optimized Solution")
-        print(self.myOptimizer.get_optimized_soln())
+        print(result.solution)
         print("Optimized Outputs")
-        print(self.myOptimizer.get_optimized_outs())
+        print(result.outputs)
 
 
         print("Optimization ended. Figure closing in 15 seconds.")
@@ -0,0 +1,93 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/main_test_parallel.py'
+#   Test function/example for using the 'swarm' class in particle_swarm.py
+#       with parallel objective function evaluation. Each generation is
+#       evaluated across a pool of worker processes. Slow or hung
+#       evaluations are timed out and retried, duplicates of straggling
+#       evaluations run on idle workers, and a generation can proceed
+#       once a quorum of its results are in.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+from particle_swarm import swarm, SwarmConfig
+from parallel_evaluator import ParallelEvaluator
+
+# OBJECTIVE FUNCTION SELECTION
+#import one_dim_x_test.configs_F as func_configs     # single objective, 1D input
+#import himmelblau.configs_F as func_configs         # single objective, 2D input
+import lundquist_3_var.configs_F as func_configs     # multi objective function
+
+
+
+if __name__ == "__main__":
+    # Constant variables
+    NO_OF_PARTICLES = 11         # Number of particles in swarm
+    T_MOD = 0.65                 # Variable time-step extinction coefficient
+    TOL = 10 ** -18              # Convergence Tolerance
+    MAXIT = 10000                # Maximum allowed iterations
+    BOUNDARY = 1                 # int boundary 1 = random,      2 = reflecting
+                                 #              3 = absorbing,   4 = invisible
+
+    # Objective function dependent variables
+    func_F = func_configs.OBJECTIVE_FUNC  # objective function
+    constr_F = func_configs.CONSTR_FUNC   # constraint function
+
+    LB = func_configs.LB              # Lower boundaries, [[0.21, 0, 0.1]]
+    UB = func_configs.UB              # Upper boundaries, [[1, 1, 0.5]]   
+    OUT_VARS = func_configs.OUT_VARS  # Number of output variables (y-values)
+    TARGETS = func_configs.TARGETS    # Target values for output
+
+    # optimizer constants
+    WEIGHTS = [[0.5, 0.7, 0.78]]       # Update vector weights
+    VLIM = 1                           # Initial velocity limit
+
+    # parallel evaluation settings
+    WORKERS = 4                  # Number of worker processes
+    EVAL_TIMEOUT = 30            # Seconds before an evaluation is killed and retried
+    MAX_RETRIES = 2              # Retries after a worker crash or timeout
+    QUORUM = 0.8                 # Fraction of a generation's results needed to move on
+    SPECULATIVE = True           # Duplicate straggling evaluations on idle workers
+
+    opt_df = SwarmConfig(NO_OF_PARTICLES=NO_OF_PARTICLES, T_MOD=T_MOD, BOUNDARY=BOUNDARY,
+                         WEIGHTS=WEIGHTS, VLIM=VLIM)
+
+    # optimizer initialization
+    myOptimizer = swarm(LB, UB, TARGETS, TOL, MAXIT,
+                            func_F, constr_F,
+                            opt_df,
+                            parent=None, 
+                            evaluate_threshold=False, obj_threshold=None,
+                            decimal_limit=5)  
+
+    best_eval = 1
+    last_report = 0
+    with ParallelEvaluator(func_F, len(TARGETS), workers=WORKERS, timeout=EVAL_TIMEOUT,
+                           max_retries=MAX_RETRIES, speculative=SPECULATIVE) as evaluator:
+        while not myOptimizer.complete():
+            # evaluate one generation of the swarm across the workers
+            myOptimizer.evaluate_generation(evaluator, quorum=QUORUM)
+
+            iter, eval = myOptimizer.get_convergence_data()
+            if (eval < best_eval) and (eval != 0):
+                best_eval = eval
+            if iter - last_report >= 100: #print out about every 100 iterations
+                last_report = iter
+                print("Iteration")
+                print(iter)
+                print("Best Eval")
+                print(best_eval)
+
+        print("Worker crashes: " + str(evaluator.crashes) + 
+              ", timeouts: " + str(evaluator.timeouts) +
+              ", speculative wins: " + str(evaluator.speculative_wins))
+
+    print("Optimized Solution")
+    print(myOptimizer.get_optimized_soln())
+    print("Optimized Outputs")
+    print(myOptimizer.get_optimized_outs())
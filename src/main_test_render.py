@@ -0,0 +1,49 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/main_test_render.py'
+#   Test function/example for rendering a 'swarm' run after it finishes.
+#       The optimizer runs at full speed while SwarmHistory records the
+#       particle locations and global best. The history is then rendered
+#       headless to a GIF with the same layout as main_test_graph.py.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+from particle_swarm import swarm, SwarmConfig
+from swarm_render import SwarmHistory, render
+
+# OBJECTIVE FUNCTION SELECTION
+#import one_dim_x_test.configs_F as func_configs     # single objective, 1D input
+#import himmelblau.configs_F as func_configs         # single objective, 2D input
+import lundquist_3_var.configs_F as func_configs     # multi objective function
+
+
+if __name__ == "__main__":
+    MAXIT = 5000                 # Maximum allowed iterations
+    MAX_FRAMES = 200             # long runs are downsampled to this many frames
+    FPS = 20                     # animation frame rate
+    OUTPUT = 'swarm_run.gif'     # .gif, .mp4 (needs ffmpeg), or a directory for the frames
+
+    opt_df = SwarmConfig(NO_OF_PARTICLES=11, T_MOD=0.65, BOUNDARY=1,
+                         WEIGHTS=[[0.5, 0.7, 0.78]], VLIM=1)
+    myOptimizer = swarm(func_configs.LB, func_configs.UB, func_configs.TARGETS,
+                        10 ** -18, MAXIT, func_configs.OBJECTIVE_FUNC,
+                        func_configs.CONSTR_FUNC, opt_df, parent=None,
+                        evaluate_threshold=False, obj_threshold=None)
+
+    history = SwarmHistory()
+    while not myOptimizer.complete():
+        myOptimizer.step(True)
+        myOptimizer.call_objective(True)
+        history.record(myOptimizer)
+    history.save('swarm_history.npz')
+
+    print("Optimized Solution")
+    print(myOptimizer.get_optimized_soln())
+
+    # can also be run separately: python swarm_render.py swarm_history.npz swarm_run.gif
+    render('swarm_history.npz', OUTPUT, max_frames=MAX_FRAMES, fps=FPS)
+    print("Animation written to " + OUTPUT)
@@ -0,0 +1,52 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/main_test_replay.py'
+#   Test function/example for recording a run of the 'swarm' class
+#       and replaying it from the recording. The replay feeds the
+#       recorded objective function results back in, checks that the
+#       trajectory matches, and runs at optimizer speed.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import time
+from particle_swarm import swarm, SwarmConfig
+from run_record import RecordingObjective, ReplayObjective
+
+# OBJECTIVE FUNCTION SELECTION
+#import one_dim_x_test.configs_F as func_configs     # single objective, 1D input
+#import himmelblau.configs_F as func_configs         # single objective, 2D input
+import lundquist_3_var.configs_F as func_configs     # multi objective function
+
+
+def run_swarm(obj_func, seed):
+    opt_df = SwarmConfig(NO_OF_PARTICLES=11, T_MOD=0.65, BOUNDARY=1,
+                         WEIGHTS=[[0.5, 0.7, 0.78]], VLIM=1, SEED=seed)
+    myOptimizer = swarm(func_configs.LB, func_configs.UB, func_configs.TARGETS,
+                        10 ** -18, 5000, obj_func, func_configs.CONSTR_FUNC,
+                        opt_df, parent=None, evaluate_threshold=False,
+                        obj_threshold=None, decimal_limit=4)
+    t0 = time.perf_counter()
+    while not myOptimizer.complete():
+        myOptimizer.step(True)
+        myOptimizer.call_objective(True)
+    return myOptimizer, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    # record. SEED=None draws fresh entropy, saved with the recording
+    recorder = RecordingObjective(func_configs.OBJECTIVE_FUNC)
+    recorded, record_time = run_swarm(recorder, None)
+    recorder.save('recorded_run.npz', seed=recorded.seed)
+    print("Recorded " + str(len(recorder)) + " evaluations in " + str(round(record_time, 3)) + " s")
+
+    # replay. Raises ReplayMismatchError if the trajectory diverges
+    replay = ReplayObjective.from_file('recorded_run.npz')
+    replayed, replay_time = run_swarm(replay, replay.seed)
+    print("Replayed " + str(replay.index) + " evaluations in " + str(round(replay_time, 3)) + " s")
+    print("Same result: " + str(recorded.get_convergence_data() == replayed.get_convergence_data()))
+    print("Optimized Solution")
+    print(replayed.get_optimized_soln())
@@ -0,0 +1,342 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/parallel_evaluator.py'
+#   Process-based parallel objective function evaluation for the
+#       'swarm' class generation mode (swarm.evaluate_generation).
+#       Each worker process evaluates one position at a time. Handles
+#       per-evaluation timeouts, retries after a worker crash or
+#       timeout, and speculative duplicate execution of evaluations
+#       that run much longer than usual while other workers are idle.
+#
+#       With a shared memory swarm (SHARED_MEMORY, see shared_state.py)
+#       workers read positions from M and write results to the shared
+#       Fvals rows in place. Only task ids cross the pipes.
+#
+#       Workers exit on their own if the optimizer process dies without
+#       close(): each worker watches its parent pid, and with the 'fork'
+#       start method it closes the pipe ends it inherited from the parent.
+#
+#       Evaluator interface (shared with the socket broker):
+#           submit(key, position)   queue one evaluation
+#           poll(wait=None)         list of (key, Fvals, noError, duration)
+#           pending()               number of evaluations not yet returned
+#           close()
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import os
+import threading
+import multiprocessing as mp
+from multiprocessing.connection import wait as wait_connections
+from collections import deque
+import time
+import numpy as np
+from shared_state import SharedSwarmState, EVAL_DONE, EVAL_ERROR, EVAL_REQUESTED
+
+
+def _watch_parent(parent_pid, interval=1.0):
+    # ends the worker once the optimizer process is gone, even while the
+    # objective function is running
+    while True:
+        time.sleep(interval)
+        if os.getppid() != parent_pid:
+            os._exit(1)
+
+
+def _worker_main(conn, obj_func, output_size, shared_name=None, parent_pid=None, inherited=()):
+    # worker process loop. A None message is the shutdown request.
+    # inherited: parent side pipe ends copied by fork. Closed here, so the
+    # pipes see EOF when the parent dies
+    for c in inherited:
+        c.close()
+    if parent_pid is not None:
+        threading.Thread(target=_watch_parent, args=(parent_pid,), daemon=True).start()
+    state = None
+    if shared_name is not None:
+        # the worker shares the optimizer's resource tracker
+        state = SharedSwarmState.attach(shared_name, untrack=False)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        task_id, position, key = msg
+        if state is not None:
+            position = state.M[key]
+        t0 = time.perf_counter()
+        try:
+            Fvals, noError = obj_func(position, output_size)
+            Fvals = np.array(Fvals, dtype=float).reshape(-1)
+        except Exception:
+            Fvals, noError = np.zeros(output_size), False
+        duration = time.perf_counter()-t0
+        if state is not None:
+            # results go straight into the shared block
+            state.Fvals[key] = Fvals
+            state.status[key] = EVAL_DONE if noError else EVAL_ERROR
+            Fvals = None
+        conn.send((task_id, Fvals, bool(noError), duration))
+    if state is not None:
+        state.close()
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, proc, conn):
+        self.proc = proc
+        self.conn = conn
+        self.task_id = None
+        self.started = 0.0
+
+
+class ParallelEvaluator:
+    # obj_func:           objective function, same signature as for swarm
+    # output_size:        number of objective function outputs
+    # workers:            number of worker processes. Defaults to the CPU count
+    # timeout:            seconds before a running evaluation is killed and retried
+    # max_retries:        retries after a crash or timeout before the evaluation
+    #                     is returned with noError = False
+    # speculative:        run duplicates of slow evaluations on idle workers
+    # speculative_factor: an evaluation is slow once it has run this many times
+    #                     longer than the median evaluation
+    # shared_state:       SharedSwarmState (or its name) of a shared memory swarm.
+    #                     Keys passed to submit() must then be particle indices
+    def __init__(self, obj_func, output_size, workers=None, timeout=None,
+                 max_retries=2, speculative=False, speculative_factor=2.0,
+                 start_method=None, poll_interval=0.05, shared_state=None):
+
+        self.shared_state = None
+        self.shared_name = None
+        if shared_state is not None:
+            if isinstance(shared_state, str):
+                shared_state = SharedSwarmState.attach(shared_state)
+            self.shared_state = shared_state
+            self.shared_name = shared_state.name
+
+        self.obj_func = obj_func
+        self.output_size = int(output_size)
+        self.timeout = timeout
+        self.max_retries = int(max_retries)
+        self.speculative = speculative
+        self.speculative_factor = float(speculative_factor)
+        self.poll_interval = poll_interval
+        self._ctx = mp.get_context(start_method)
+
+        if workers is None:
+            workers = mp.cpu_count()
+        self.workers = []
+        for i in range(0, int(workers)):
+            self.workers.append(self._start_worker())
+
+        self._queue = deque()
+        self._tasks = {}
+        self._next_id = 0
+        self._durations = deque(maxlen=200)
+
+        # counters for reporting
+        self.completed = 0
+        self.crashes = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.failures = 0
+        self.speculative_launched = 0
+        self.speculative_wins = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        inherited = []
+        if self._ctx.get_start_method() == 'fork':
+            # a forked child gets copies of every open parent side end
+            inherited = [parent_conn] + [w.conn for w in self.workers]
+        proc = self._ctx.Process(target=_worker_main,
+                                 args=(child_conn, self.obj_func, self.output_size, self.shared_name,
+                                       os.getpid(), inherited),
+                                 daemon=True)
+        proc.start()
+        child_conn.close()
+        return _Worker(proc, parent_conn)
+
+    def _restart_worker(self, w):
+        # kill a hung, crashed, or superseded worker and replace it in place
+        if w.proc.is_alive():
+            w.proc.terminate()
+            w.proc.join(1)
+            if w.proc.is_alive():
+                w.proc.kill()
+                w.proc.join()
+        w.conn.close()
+        new_w = self._start_worker()
+        self.workers[self.workers.index(w)] = new_w
+        return new_w
+
+    def submit(self, key, position):
+        task_id = self._next_id
+        self._next_id = self._next_id + 1
+        self._tasks[task_id] = {'key': key,
+                                'position': np.array(position, dtype=float),
+                                'attempts': 0,
+                                'running': []}
+        if self.shared_state is not None:
+            self.shared_state.status[key] = EVAL_REQUESTED
+        self._queue.append(task_id)
+        return task_id
+
+    def pending(self):
+        return len(self._tasks)
+
+    def median_duration(self):
+        if len(self._durations) < 1:
+            return None
+        return float(np.median(self._durations))
+
+    def _dispatch(self, results):
+        for w in self.workers:
+            if w.task_id is not None:
+                continue
+            while len(self._queue) > 0:
+                task_id = self._queue.popleft()
+                if task_id in self._tasks:
+                    self._send(w, task_id, results)
+                    break
+
+    def _send(self, w, task_id, results):
+        try:
+            task = self._tasks[task_id]
+            if self.shared_state is None:
+                w.conn.send((task_id, task['position'], task['key']))
+            else:
+                w.conn.send((task_id, None, task['key']))
+        except (BrokenPipeError, EOFError, OSError):
+            # worker died while idle. Replace it and requeue the task
+            self.crashes = self.crashes + 1
+            self._restart_worker(w)
+            self._queue.appendleft(task_id)
+            return
+        w.task_id = task_id
+        w.started = time.perf_counter()
+        self._tasks[task_id]['running'].append(w)
+
+    def _abandon(self, w, results):
+        # the evaluation on w is lost (crash or timeout). Retry it if no
+        # other copy is still running
+        task_id = w.task_id
+        w = self._restart_worker(w)
+        task = self._tasks.get(task_id)
+        if task is None:
+            return
+        task['running'] = [r for r in task['running'] if r.task_id == task_id and r.proc.is_alive()]
+        if len(task['running']) > 0:
+            return
+        task['attempts'] = task['attempts'] + 1
+        if task['attempts'] > self.max_retries:
+            self.failures = self.failures + 1
+            del self._tasks[task_id]
+            results.append((task['key'], np.zeros(self.output_size), False, 0.0))
+        else:
+            self.retries = self.retries + 1
+            self._queue.appendleft(task_id)
+
+    def _finish(self, w, msg, results):
+        task_id, Fvals, noError, duration = msg
+        w.task_id = None
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return # a speculative copy already returned this result
+        self._durations.append(duration)
+        self.completed = self.completed + 1
+        if Fvals is None:
+            Fvals = np.array(self.shared_state.Fvals[task['key']])
+        if len(task['running']) > 1:
+            if task['running'][0] is not w:
+                self.speculative_wins = self.speculative_wins + 1
+            # stop the other copies, they are stragglers
+            for other in task['running']:
+                if (other is not w) and (other.task_id == task_id):
+                    self._restart_worker(other)
+        results.append((task['key'], Fvals, noError, duration))
+
+    def _check_running(self, results):
+        now = time.perf_counter()
+        for w in list(self.workers):
+            if w.task_id is None:
+                continue
+            if not w.proc.is_alive():
+                self.crashes = self.crashes + 1
+                self._abandon(w, results)
+            elif (self.timeout is not None) and (now - w.started > self.timeout):
+                self.timeouts = self.timeouts + 1
+                self._abandon(w, results)
+
+    def _speculate(self, results):
+        if (not self.speculative) or (len(self._queue) > 0) or (len(self._durations) < 3):
+            return
+        idle = [w for w in self.workers if w.task_id is None]
+        if len(idle) < 1:
+            return
+        limit = self.speculative_factor*self.median_duration()
+        now = time.perf_counter()
+        for task_id, task in self._tasks.items():
+            if len(idle) < 1:
+                break
+            if (len(task['running']) == 1) and (now - task['running'][0].started > limit):
+                self.speculative_launched = self.speculative_launched + 1
+                self._send(idle.pop(), task_id, results)
+
+    def poll(self, wait=None):
+        # returns the evaluations that completed, as a list of
+        # (key, Fvals, noError, duration). Blocks until at least one
+        # result is available, nothing is pending, or 'wait' seconds pass.
+        results = []
+        deadline = None if wait is None else time.perf_counter() + wait
+        while True:
+            self._dispatch(results)
+            self._check_running(results)
+            self._speculate(results)
+            if (len(results) > 0) or (len(self._tasks) == 0):
+                break
+
+            tick = self.poll_interval
+            if deadline is not None:
+                tick = max(0.0, min(tick, deadline - time.perf_counter()))
+            busy = [w for w in self.workers if w.task_id is not None]
+            ready = wait_connections([w.conn for w in busy], timeout=tick)
+            for w in busy:
+                if (w.conn not in ready) or (w not in self.workers):
+                    continue # not ready, or replaced while handling another result
+                try:
+                    msg = w.conn.recv()
+                except (EOFError, OSError):
+                    self.crashes = self.crashes + 1
+                    self._abandon(w, results)
+                    continue
+                self._finish(w, msg, results)
+
+            if (len(results) > 0) or ((deadline is not None) and (time.perf_counter() >= deadline)):
+                break
+        return results
+
+    def close(self):
+        for w in self.workers:
+            try:
+                w.conn.send(None)
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+        for w in self.workers:
+            w.proc.join(1)
+            if w.proc.is_alive():
+                w.proc.terminate()
+                w.proc.join()
+            w.conn.close()
+        self.workers = []
@@ -16,15 +16,308 @@
 
 
 import numpy as np
-from numpy.random import Generator, MT19937
+from dataclasses import dataclass, asdict
 import sys
+import math
+import time
+from swarm_init import initial_positions, feasibility_mask
+from swarm_kernels import select_kernels
+from swarm_random import make_streams, DEFAULT_BLOCK_SIZE
+from swarm_constraints import FeasiblePool, CONSTRAINT_MODES, binary_violation
+from swarm_adapt import ParameterAdapter, ADAPT_STRATEGIES
+from local_search import make_local_search, LOCAL_SEARCH_METHODS
+from spatial_index import EvaluationIndex
+from swarm_log import SwarmLogger, ConsoleSink, ParentSink, JSONLinesSink, DEBUG, INFO, message_level
 np.seterr(all='raise')
 
-class swarm:
+
+@dataclass
+class SwarmConfig:
+    # typed alternative to the single-row opt_df dataframe.
+    # Field names match the opt_df column names so either can be passed
+    # to the swarm constructor. Optional fields left as None use the
+    # swarm defaults.
+    NO_OF_PARTICLES: int = 11
+    T_MOD: float = 0.65
+    BOUNDARY: int = 1
+    WEIGHTS: list = None
+    VLIM: float = 1
+    FITNESS_AGG: object = None
+    AGG_WEIGHTS: list = None
+    INIT_STRATEGY: str = None
+    INIT_CONSTRAINED: bool = None
+    SHARED_MEMORY: bool = None
+    KERNEL_BACKEND: str = None
+    SEED: int = None
+    RNG_BLOCK: int = None
+    FIDELITY_COSTS: list = None
+    FIDELITY_MARGIN: float = None
+    CONSTRAINT_MODE: str = None
+    PENALTY_WEIGHT: float = None
+    VIOLATION_FUNC: object = None
+    POOL_SIZE: int = None
+    POOL_MAX_BATCHES: int = None
+    REACTIVATION: str = None
+    REACTIVATION_SCALE: float = None
+    LOG_LEVEL: str = None
+    LOG_SAMPLE: dict = None
+    LOG_FILE: str = None
+    LOG_SINKS: list = None
+    LOCAL_SEARCH: str = None
+    LOCAL_DISPERSION: float = None
+    LOCAL_STALL: int = None
+    LOCAL_BUDGET: int = None
+    LOCAL_STEP: float = None
+    MAX_WALLTIME: float = None
+    MAX_OBJ_TIME: float = None
+    SKIP_STATIC: bool = None
+    EVAL_INDEX: bool = None
+    DUPLICATE_TOL: float = None
+    ADAPT: str = None
+    ADAPT_T_MOD: bool = None
+    ADAPT_FINAL_WEIGHTS: list = None
+    ADAPT_LIMITS: list = None
+    # cooperative coevolution (coevolution.py). Not used by swarm itself
+    CC_GROUP_SIZE: int = None
+    CC_GROUPING: str = None
+    CC_TURN: int = None
+
+    def __post_init__(self):
+        if self.WEIGHTS is None:
+            self.WEIGHTS = [[0.5, 0.7, 0.78]]
+
+    def as_opt_params(self):
+        # single-row column format, for pd.DataFrame(config.as_opt_params())
+        return {key: [value] for key, value in asdict(self).items() if value is not None}
+
+
+REACTIVATION_POLICIES = ['NONE', 'GBEST', 'POOL', 'RANDOM']
+
+
+def _step_text(event):
+    # text form of the 'step' event, same layout as the original printout
+    return "\n-----------------------------\n" + \
+        "STEP #" + str(event['iteration']) +"\n" + \
+        "-----------------------------\n" + \
+        "Current Particle:\n" + \
+        str(event['particle']) +"\n" + \
+        "Current Particle Velocity\n" + \
+        str(event['velocity']) +"\n" + \
+        "Current Particle Location\n" + \
+        str(event['position']) +"\n" + \
+        "Delta T\n" + \
+        str(event['delta_t']) +"\n" + \
+        "Absolute mean deviation\n" + \
+        str(event['dispersion']) +"\n" + \
+        "-----------------------------"
+
+
+def _complete_text(event):
+    return "\nPoints: \n" + str(event['Gb']) + "\n" + \
+        "Iterations: \n" + str(event['iteration']) + "\n" + \
+        "Flist: \n" + str(event['F_Gb']) + "\n" + \
+        "Norm Flist: \n" + str(event['best_eval']) + "\n"
+
+
+@dataclass(frozen=True)
+class SwarmResult:
+    # returned by swarm.run()
+    solution: np.ndarray       # Gb, as a column (same as get_optimized_soln())
+    outputs: np.ndarray        # F_Gb (same as get_optimized_outs())
+    best_eval: float           # aggregated fitness of the global best
+    iterations: int            # objective function evaluations
+    eval_cost: float           # weighted evaluation cost
+    stop_reason: str           # 'converged', 'maxit', 'walltime', 'objective_time',
+                               # 'depleted', or 'callback'
+    elapsed: float             # seconds spent in run()
+    seed: int                  # seed entropy, to reproduce the run
+
+
+class SwarmSnapshot:
+    # read-only progress record yielded by swarm.iterate(). The cheap
+    # fields are captured when the snapshot is taken. Gb is held by
+    # reference (the swarm replaces Gb, it never writes into it), and
+    # dispersion is computed from a copy of M only when it is read.
+    __slots__ = ('iteration', 'best_eval', 'delta_t', 'eval_cost', 'done',
+                 '_Gb', '_M', '_dispersion')
+
+    def __init__(self, optimizer):
+        init = object.__setattr__
+        init(self, 'iteration', int(optimizer.iter))
+        init(self, 'best_eval', float(optimizer.F_Gb_scalar))
+        init(self, 'delta_t', float(optimizer.delta_t))
+        init(self, 'eval_cost', float(optimizer.eval_cost))
+        init(self, 'done', bool(optimizer.complete()))
+        init(self, '_Gb', optimizer.Gb)
+        M = optimizer.M
+        if len(optimizer.active_index) < optimizer.number_of_particles:
+            M = M[optimizer.active_index]
+        init(self, '_M', np.array(M))
+        init(self, '_dispersion', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SwarmSnapshot is read-only")
+
+    @property
+    def Gb(self):
+        Gb = np.ravel(self._Gb).view()
+        Gb.flags.writeable = False
+        return Gb
+
+    @property
+    def dispersion(self):
+        # absolute mean deviation of the (active) particles, as in
+        # swarm.absolute_mean_deviation_of_particles()
+        if self._dispersion is None:
+            if len(self._M) == 0:
+                value = 0.0
+            else:
+                abs_data = np.abs(self._M - np.mean(self._M, axis=0).reshape(1, -1))
+                value = float(np.linalg.norm(np.mean(abs_data, axis=0)))
+            object.__setattr__(self, '_dispersion', value)
+        return self._dispersion
+
+    def __repr__(self):
+        return ("SwarmSnapshot(iteration=" + str(self.iteration) + ", best_eval=" +
+                str(self.best_eval) + ", delta_t=" + str(self.delta_t) + ")")
+
+
+def _opt_param(opt_df, key, default=None):
+    # opt_df may be a pandas DataFrame, a dict in the same column format
+    # ({'KEY': [value]}), or a SwarmConfig. Optional tuning parameters 
+    # can be left out entirely, in which case the default is used
+    if isinstance(opt_df, SwarmConfig):
+        value = getattr(opt_df, key, None)
+        return default if value is None else value
+    if key in opt_df:
+        return opt_df[key][0]
+    return default
+
+
+class SwarmDriver:
+    # driver loop, result, time budgets and logging shared by 'swarm' and
+    # CooperativeSwarm (coevolution.py). A subclass provides:
+    #   methods:    step(), call_objective(), complete(), converged(),
+    #               depleted(), get_optimized_soln(), get_optimized_outs()
+    #   attributes: iter, eval_cost, maxit, fidelity_levels, F_Gb_scalar, seed,
+    #               max_walltime, max_objective_time, objective_time,
+    #               start_time, elapsed_before
+    # and calls setup_log() before its first message.
+
+    def setup_log(self, opt_df, parent):
+        log_level = _opt_param(opt_df, 'LOG_LEVEL', None)
+        log_sinks = _opt_param(opt_df, 'LOG_SINKS', None)
+        log_file = _opt_param(opt_df, 'LOG_FILE', None)
+        if log_sinks is None:
+            log_sinks = [ConsoleSink() if parent is None else ParentSink(parent)]
+        if log_file is not None:
+            log_sinks = list(log_sinks) + [JSONLinesSink(log_file)]
+        self.log = SwarmLogger(DEBUG if log_level is None else log_level, log_sinks,
+                               _opt_param(opt_df, 'LOG_SAMPLE', None))
+        # with an explicit LOG_LEVEL, tracing no longer depends on suppress_output
+        self.log_always = log_level is not None
+
+    def debug_message_printout(self, msg):
+        # plain text messages. The level is taken from the 'WARNING'/'Error'
+        # prefix. Sent to the parent (or printed) through the log sinks
+        level = message_level(msg)
+        if self.log.enabled(level, 'message'):
+            self.log.emit(level, 'message', {'message': msg})
+
+    def budget_used(self):
+        # with several fidelities, maxit is a budget of weighted evaluations
+        return self.eval_cost if self.fidelity_levels > 1 else self.iter
+
+    def maxed(self):
+        return (self.budget_used() >= self.maxit) or self.out_of_time()
+
+    def out_of_time(self):
+        # MAX_WALLTIME or MAX_OBJ_TIME spent
+        if (self.max_walltime is not None) and (self.walltime() >= self.max_walltime):
+            return True
+        if (self.max_objective_time is not None) and (self.objective_time >= self.max_objective_time):
+            return True
+        return False
+
+    def walltime(self):
+        # seconds since the first call_objective(), including time before
+        # an import_swarm()
+        if self.start_time is None:
+            return self.elapsed_before
+        return self.elapsed_before + time.perf_counter() - self.start_time
+
+    def run(self, callback=None, every=None, on_improvement=False, suppress_output=True):
+        # Run the optimization to completion and return a SwarmResult. This
+        # is the step()/call_objective() loop without the per-evaluation
+        # calls from the driver. 
+        # callback(iteration, best_eval) is called every 'every' evaluations,
+        # and with on_improvement, whenever the global best improves. 
+        # If it returns False, the run stops early.
+        # The state machine can still be driven directly, e.g. from a GUI.
+        t0 = time.perf_counter()
+        stopped = False
+        if callback is None:
+            every = None
+            on_improvement = False
+        for due in self.drive(every, on_improvement, suppress_output):
+            if callback(self.iter, self.F_Gb_scalar) is False:
+                stopped = True
+                break
+        return self.result(time.perf_counter() - t0, stopped)
+
+    def drive(self, every, on_improvement, suppress_output):
+        # the step()/call_objective() loop behind run() and iterate().
+        # Runs until complete(), and yields after each step on which a
+        # report is due: every 'every' evaluations, and with on_improvement,
+        # whenever the global best improved
+        best = self.F_Gb_scalar
+        next_report = None
+        if every is not None:
+            next_report = (self.iter//int(every) + 1)*int(every)
+        while not self.complete():
+            self.call_objective(True)
+            self.step(suppress_output)
+            report = False
+            if (next_report is not None) and (self.iter >= next_report):
+                next_report = (self.iter//int(every) + 1)*int(every)
+                report = True
+            if on_improvement and (self.F_Gb_scalar < best):
+                report = True
+            best = self.F_Gb_scalar
+            if report:
+                yield True
+
+    def result(self, elapsed=0.0, stopped=False):
+        # SwarmResult for the current state
+        if stopped:
+            reason = 'callback'
+        elif self.converged():
+            reason = 'converged'
+        elif self.depleted():
+            reason = 'depleted'
+        elif self.maxed():
+            reason = 'maxit'
+            if self.out_of_time():
+                if self.budget_used() < self.maxit:
+                    reason = 'walltime' if (self.max_walltime is not None) and \
+                        (self.walltime() >= self.max_walltime) else 'objective_time'
+        else:
+            reason = 'running'
+        return SwarmResult(solution=np.array(self.get_optimized_soln()),
+                           outputs=np.array(self.get_optimized_outs()),
+                           best_eval=float(self.F_Gb_scalar),
+                           iterations=int(self.iter),
+                           eval_cost=float(self.eval_cost),
+                           stop_reason=reason,
+                           elapsed=float(elapsed),
+                           seed=self.seed)
+
+
+class swarm(SwarmDriver):
     # arguments should take the form: 
     # swarm([[float, float, ...]], [[float, float, ...]], [[float, ...]], float, int,
     # func, func,
-    # dataFrame,
+    # dataFrame, dict, or SwarmConfig
     # class obj, 
     # bool, [int, int, ...], 
     # int) 
@@ -34,6 +327,81 @@ class swarm:
     # weights: [[float, float, float]]
     # boundary: int. 1 = random, 2 = reflecting, 3 = absorbing,   4 = invisible
     # vlim: float
+    #
+    # optional opt_df parameters
+    # FITNESS_AGG: str or func. 'L2' (default), 'WEIGHTED_SUM', 'CHEBYSHEV',
+    #               or a callable that takes the Flist array and returns a float
+    # AGG_WEIGHTS: [float, ...]. per-output weights for WEIGHTED_SUM and CHEBYSHEV
+    # INIT_STRATEGY: str. initial position sampling. 'UNIFORM' (default), 'LHS',
+    #               'SOBOL', or 'HALTON'
+    # INIT_CONSTRAINED: bool. reject initial positions that fail constr_func
+    # SHARED_MEMORY: bool. keep M, V, Pb, F_Pb, and Active in a shared memory
+    #               block (see shared_state.py)
+    # KERNEL_BACKEND: str. per-particle update kernels. 'NUMPY' (default), 'JIT'
+    #               (numba, falls back to NUMPY if not installed), or 'AUTO'
+    # SEED: int. seed for the random streams. None (default) uses fresh entropy,
+    #               which is recorded in self.seed so the run can be reproduced
+    # RNG_BLOCK: int. random numbers pre-generated per particle stream refill
+    # FIDELITY_COSTS: [float, ...]. relative cost of each objective function when
+    #               obj_func is a list ordered from cheapest to most expensive.
+    #               Default 1 each. maxit is then a budget of weighted evaluations
+    # FIDELITY_MARGIN: float. a result is promoted to the next fidelity if its
+    #               fitness is within this relative margin of the particle's
+    #               personal best. Default 0
+    # CONSTRAINT_MODE: str. 'RESAMPLE' (default) moves particles that fail constr_func
+    #               to a point from the feasible pool. 'PENALTY' keeps them where
+    #               they are and adds PENALTY_WEIGHT*violation to their fitness
+    # PENALTY_WEIGHT: float. weight on the violation degree in PENALTY mode. Default 1
+    # VIOLATION_FUNC: func. X -> float >= 0, the violation degree. Default is 0 if
+    #               constr_func passes and 1 if not, or the spec's own violation()
+    #               if constr_func is a ConstraintSpec (constraint_spec.py)
+    # POOL_SIZE: int. feasible points kept in the pool used for resets. Default 256
+    # POOL_MAX_BATCHES: int. sampling batches tried per pool fill before raising
+    #               ConstraintError. Default 100
+    # REACTIVATION: str. what happens to a particle that leaves the search space
+    #               with BOUNDARY 4. 'NONE' (default) leaves it inactive. 'GBEST'
+    #               moves it near the global best, 'POOL' to a point from the
+    #               feasible pool, and 'RANDOM' to a random point in the bounds
+    # REACTIVATION_SCALE: float. for 'GBEST', the size of the region around Gb, as a
+    #               fraction of (ubound - lbound). Default 0.1
+    # LOG_LEVEL: str. 'DEBUG', 'INFO', 'WARNING', or 'ERROR'. When set, step and
+    #               completion events are logged at this level regardless of
+    #               suppress_output. None (default) logs everything, with the step
+    #               and completion events controlled by suppress_output as before
+    # LOG_SAMPLE: dict. {event name: n} keeps every n-th event, e.g. {'step': 100}
+    # LOG_FILE: str. also write events as JSON lines to this file
+    # LOG_SINKS: list. sinks to use instead of the default console or parent
+    #               sink (see swarm_log.py)
+    # LOCAL_SEARCH: str. hybrid local refinement around Gb (see local_search.py).
+    #               'NONE' (default), 'NELDER_MEAD', or 'PATTERN'
+    # LOCAL_DISPERSION: float. start a refinement phase when the particle spread
+    #               falls below this fraction of the initial spread. Default 0.05
+    # LOCAL_STALL: int. also start one after this many evaluations without a Gb
+    #               improvement. Default 20*NO_OF_PARTICLES
+    # LOCAL_BUDGET: int. objective function evaluations per refinement phase.
+    #               Default 100
+    # LOCAL_STEP: float. initial local search step, as a fraction of
+    #               (ubound - lbound). Default None uses the current particle spread
+    # MAX_WALLTIME: float. also stop after this many seconds of wall clock time,
+    #               counted from the first call_objective(). Default None
+    # MAX_OBJ_TIME: float. also stop after this many seconds spent in the
+    #               objective function. Default None
+    # SKIP_STATIC: bool. skip the evaluation of a particle that has not moved
+    #               since its last evaluation (its movement rounded to zero at
+    #               decimal_limit), and reuse its last outputs. The particle still
+    #               takes its next step. Default False
+    # EVAL_INDEX: bool. keep a nearest-neighbor index (spatial_index.py) of all
+    #               evaluated points and their outputs in self.eval_index. Default False
+    # DUPLICATE_TOL: float. reuse the outputs of an evaluated point within this
+    #               distance instead of calling the objective function. Distances
+    #               are normalized by (ubound - lbound). Turns on EVAL_INDEX. Default None
+    # ADAPT: str. online adaptation of WEIGHTS (see swarm_adapt.py). 'NONE' (default),
+    #               'LINEAR', 'SUCCESS', or 'SELF' (per-particle weights)
+    # ADAPT_T_MOD: bool. also adapt T_MOD from the success rate. Default False
+    # ADAPT_FINAL_WEIGHTS: [float, float, float]. end point for 'LINEAR'.
+    #               Default [0.4, 0.5, 1.5] times WEIGHTS
+    # ADAPT_LIMITS: [[float x3], [float x3]]. lower and upper weights.
+    #               Default 0.2 and 2 times WEIGHTS
     # 
    
     def __init__(self,  lbound, ubound, targets, E_TOL, maxit,
@@ -46,6 +414,10 @@ class swarm:
         # Optional parent class func call to write out values that trigger constraint issues
         self.parent = parent 
 
+        # structured logging (see swarm_log.py). Set up first so every
+        # message from here on goes through it
+        self.setup_log(opt_df, parent)
+
         self.number_decimals = int(decimal_limit)  # limit the number of decimals
                                               # used in cases where real life has limitations on resolution
 
@@ -69,11 +441,30 @@ class swarm:
         
 
         #unpack the opt_df standardized vals
-        NO_OF_PARTICLES = int(opt_df['NO_OF_PARTICLES'][0])
-        weights = np.array(opt_df['WEIGHTS'][0])
-        boundary = int(opt_df['BOUNDARY'][0])
-        vlimit = np.array(opt_df['VLIM'][0])
-        T_MOD = float(opt_df['T_MOD'][0])
+        NO_OF_PARTICLES = int(_opt_param(opt_df, 'NO_OF_PARTICLES'))
+        weights = np.array(_opt_param(opt_df, 'WEIGHTS'))
+        boundary = int(_opt_param(opt_df, 'BOUNDARY'))
+        vlimit = np.array(_opt_param(opt_df, 'VLIM'))
+        T_MOD = float(_opt_param(opt_df, 'T_MOD'))
+        init_strategy = str(_opt_param(opt_df, 'INIT_STRATEGY', 'UNIFORM'))
+        init_constrained = bool(_opt_param(opt_df, 'INIT_CONSTRAINED', False))
+        use_shared_memory = bool(_opt_param(opt_df, 'SHARED_MEMORY', False))
+        fidelity_costs = _opt_param(opt_df, 'FIDELITY_COSTS', None)
+        fidelity_margin = float(_opt_param(opt_df, 'FIDELITY_MARGIN', 0.0))
+        constraint_mode = str(_opt_param(opt_df, 'CONSTRAINT_MODE', 'RESAMPLE')).upper()
+        if constraint_mode not in CONSTRAINT_MODES:
+            self.debug_message_printout("WARNING: unrecognized constraint mode. Defaulting to RESAMPLE.")
+            constraint_mode = 'RESAMPLE'
+
+        # per-particle update kernels (see swarm_kernels.py)
+        self.kernels, msg = select_kernels(_opt_param(opt_df, 'KERNEL_BACKEND', 'NUMPY'))
+        if msg is not None:
+            self.debug_message_printout(msg)
+
+        # scalar fitness aggregation. Set before the fitness arrays are
+        # initialized so the cached scalar values can be computed
+        self.set_fitness_aggregation(_opt_param(opt_df, 'FITNESS_AGG', 'L2'),
+                                     _opt_param(opt_df, 'AGG_WEIGHTS', None))
 
 
         heightl = np.shape(lbound)[0]
@@ -84,7 +475,19 @@ class swarm:
         lbound = np.array(lbound[0])
         ubound = np.array(ubound[0])
 
-        self.rng = Generator(MT19937())
+        # random streams. self.rng is used for initialization, and each
+        # particle draws from its own stream (see swarm_random.py)
+        self.seed_seq, self.rng, self.particle_rngs = \
+            make_streams(_opt_param(opt_df, 'SEED', None), NO_OF_PARTICLES,
+                         int(_opt_param(opt_df, 'RNG_BLOCK', DEFAULT_BLOCK_SIZE)))
+        self.seed = self.seed_seq.entropy
+        # side streams, split off in a fixed order so that turning one
+        # option on does not change another's samples: the feasible pool
+        # (created now so it can be checkpointed before the pool is used),
+        # then the parameter adapter
+        pool_seq, adapt_seq = self.seed_seq.spawn(2)
+        self.pool_rng = np.random.default_rng(pool_seq)
+        self.shared_state = None
 
         if ((heightl > 1) and (widthl > 1)) \
            or ((heightu > 1) and (widthu > 1)) \
@@ -95,7 +498,7 @@ class swarm:
                 pass
             else:
                 self.parent.record_params()
-                self.parent.debug_message_printout("Error lbound and ubound must be 1xN-dimensional \
+                self.debug_message_printout("Error lbound and ubound must be 1xN-dimensional \
                                                         arrays  with the same length")
            
         else:
@@ -108,47 +511,57 @@ class swarm:
 
             self.lbound = lbound
             self.ubound = ubound
-            variation = ubound-lbound
 
             # position
-            self.M = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl, widthl]))), variation)+lbound), self.number_decimals)   
+            # sampled for the whole swarm at once. With INIT_CONSTRAINED the
+            # samples are drawn in batches and infeasible points are rejected
+            self.M, infeasible = initial_positions(init_strategy, self.rng, NO_OF_PARTICLES,
+                                                   lbound, ubound, self.number_decimals,
+                                                   constr_func=constr_func if init_constrained else None)
+            if infeasible > 0:
+                self.debug_message_printout("WARNING: " + str(infeasible) + \
+                    " initial particle(s) could not be placed in the feasible region.")
 
             # velocity
-            self.V = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl,widthl]))), vlimit)), self.number_decimals)
-
-
-
-            for i in range(2,int(NO_OF_PARTICLES)+1):
-
-                M = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl, widthl]))), variation)+lbound), self.number_decimals)
-
-                V = np.round(np.array(np.multiply(self.rng.random((1,np.max([heightl,widthl]))), vlimit)), self.number_decimals)
-
-                self.M = \
-                    np.vstack([self.M, 
-                               M])
-
-                self.V = \
-                    np.vstack([self.V,
-                               V])               
- 
+            self.V = np.round(np.multiply(self.rng.random((NO_OF_PARTICLES, np.max([heightl, widthl]))), vlimit), self.number_decimals)
  
             '''
             self.M                      : An array of current particle locations.
             self.V                      : An array of current particle velocities.
             self.output_size            : An integer value for the output size of obj func
             self.Active                 : An array indicating the activity status of each particle.
+            self.active_index           : Sorted indices of the active particles. The particles stepped through.
+            self.reactivation           : 'NONE', 'GBEST', 'POOL', or 'RANDOM'.
+            self.reactivation_scale     : Size of the 'GBEST' reactivation region.
+            self.reactivations          : Number of particles reactivated so far.
             self.Gb                     : Global best position, initialized with a large value.
             self.F_Gb                   : Fitness value corresponding to the global best position.
             self.Pb                     : Personal best position for each particle.
             self.F_Pb                   : Fitness value corresponding to the personal best position for each particle.
+            self.F_Gb_scalar            : Cached aggregated (scalar) value of F_Gb.
+            self.F_Pb_scalar            : Cached aggregated (scalar) values of F_Pb, one per particle.
+            self.Fvals_Gb               : Raw objective function output at the global best position.
+            self.Fvals_Pb               : Raw objective function output at each personal best position.
             self.weights                : Weights for the optimization process.
             self.targets                : Target values for the optimization process.
             self.T_MOD                  : Time modulation parameter            
             self.maxit                  : Maximum number of iterations.
             self.E_TOL                  : Error tolerance.
             self.obj_func               : Objective function to be optimized.      
+            self.obj_funcs              : Objective functions, cheapest fidelity first.
+            self.fidelity_costs         : Relative cost of each objective function.
+            self.fidelity_margin        : Relative margin for promotion to the next fidelity.
+            self.eval_cost              : Weighted evaluation cost spent so far.
+            self.fidelity               : Fidelity level of the result in self.Fvals.
+            self.F_Gb_fidelity          : Fidelity level that produced the global best. -1 if none.
+            self.F_Pb_fidelity          : Fidelity level that produced each personal best. -1 if none.
             self.constr_func            : Constraint function.  
+            self.constraint_mode        : 'RESAMPLE' or 'PENALTY'.
+            self.penalty_weight         : Weight on the violation degree in PENALTY mode.
+            self.violation_func         : Violation degree function, X -> float.
+            self.feasible_pool          : Pool of feasible points for resets. Created on first use.
+            self.F_Gb_penalty           : Penalty included in F_Gb_scalar.
+            self.F_Pb_penalty           : Penalty included in each F_Pb_scalar.
             self.iter                   : Current iteration count.
             self.current_particle       : Index of the current particle being evaluated.
             self.number_of_particles    : Total number of particles. 
@@ -158,22 +571,74 @@ class swarm:
             self.Fvals                  : List to store fitness values.
             self.vlimit                 : Velocity limits for the particles.
             self.Mlast                  : Last location of particle.
+            self.pending_evals          : Particles waiting on a result in generation mode.
+            self.shared_state           : Shared memory block holding M, V, Pb, F_Pb, Active. None if not used.
             self.InitDeviation          : Initial deviation of particles.
             self.delta_t                : Adaptive time modulation.
             '''
             self.output_size = len(targets)
             self.Active = np.ones((NO_OF_PARTICLES))                        
+            self.active_index = np.arange(NO_OF_PARTICLES)
+            self.reactivation = str(_opt_param(opt_df, 'REACTIVATION', 'NONE')).upper()
+            if self.reactivation not in REACTIVATION_POLICIES:
+                self.debug_message_printout("WARNING: unrecognized reactivation policy. Defaulting to NONE.")
+                self.reactivation = 'NONE'
+            self.reactivation_scale = float(_opt_param(opt_df, 'REACTIVATION_SCALE', 0.1))
+            self.reactivations = 0
+            self.local_method = str(_opt_param(opt_df, 'LOCAL_SEARCH', 'NONE')).upper()
+            if self.local_method not in LOCAL_SEARCH_METHODS:
+                self.debug_message_printout("WARNING: unrecognized local search. Defaulting to NONE.")
+                self.local_method = 'NONE'
+            self.local_dispersion = _opt_param(opt_df, 'LOCAL_DISPERSION', 0.05)
+            self.local_stall = _opt_param(opt_df, 'LOCAL_STALL', 20*NO_OF_PARTICLES)
+            self.local_budget = int(_opt_param(opt_df, 'LOCAL_BUDGET', 100))
+            self.local_step = _opt_param(opt_df, 'LOCAL_STEP', None)
+            self.local_search = None
+            self.local_point = None
+            self.local_fitness = None
+            self.local_from = np.inf
+            self.local_phases = 0
+            self.local_evals = 0
+            self.last_improvement = 0
             self.Gb = sys.maxsize*np.ones((1,np.max([heightl, widthl])))   
             self.F_Gb = sys.maxsize*np.ones((1,self.output_size))                
             self.Pb = sys.maxsize*np.ones(np.shape(self.M))                 
             self.F_Pb = sys.maxsize*np.ones((NO_OF_PARTICLES,self.output_size))  
+            self.Fvals_Gb = np.full(self.output_size, np.nan)
+            self.Fvals_Pb = np.full((NO_OF_PARTICLES,self.output_size), np.nan)
+            self.F_Gb_fidelity = -1
+            self.F_Pb_fidelity = -np.ones(NO_OF_PARTICLES, dtype=int)
+            self.F_Gb_penalty = 0.0
+            self.F_Pb_penalty = np.zeros(NO_OF_PARTICLES)
             self.weights = np.array(weights)                     
             self.targets = np.array(targets).reshape(-1, 1)        
             self.T_MOD = T_MOD
             self.maxit = maxit
+            adapt = str(_opt_param(opt_df, 'ADAPT', 'NONE')).upper()
+            adapt_t_mod = bool(_opt_param(opt_df, 'ADAPT_T_MOD', False))
+            if adapt not in ADAPT_STRATEGIES:
+                self.debug_message_printout("WARNING: unrecognized adaptation strategy. Defaulting to NONE.")
+                adapt = 'NONE'
+            self.adapter = None
+            if (adapt != 'NONE') or adapt_t_mod:
+                # 'NONE' with ADAPT_T_MOD adapts only T_MOD
+                self.adapter = ParameterAdapter(adapt, self.weights[0], T_MOD, NO_OF_PARTICLES,
+                                                _opt_param(opt_df, 'ADAPT_FINAL_WEIGHTS', None),
+                                                _opt_param(opt_df, 'ADAPT_LIMITS', None),
+                                                adapt_t_mod, np.random.default_rng(adapt_seq))
             self.E_TOL = E_TOL
             self.obj_func = obj_func
             self.constr_func = constr_func
+            self.constraint_mode = constraint_mode
+            self.penalty_weight = float(_opt_param(opt_df, 'PENALTY_WEIGHT', 1.0))
+            self.violation_func = _opt_param(opt_df, 'VIOLATION_FUNC', None)
+            if self.violation_func is None:
+                # constraint specs report a degree of violation
+                self.violation_func = getattr(constr_func, 'violation', None) or binary_violation(constr_func)
+            self.pool_size = int(_opt_param(opt_df, 'POOL_SIZE', 256))
+            self.pool_max_batches = int(_opt_param(opt_df, 'POOL_MAX_BATCHES', 100))
+            self.feasible_pool = None
+            self.set_fidelities(obj_func, fidelity_costs, fidelity_margin)
             self.iter = 0
             self.current_particle = 0
             self.number_of_particles = NO_OF_PARTICLES
@@ -183,6 +648,31 @@ class swarm:
             self.Fvals = []
             self.vlimit = vlimit
             self.Mlast = 1*self.ubound
+            self.pending_evals = set()
+            # evaluation timing and time budgets
+            self.max_walltime = _opt_param(opt_df, 'MAX_WALLTIME', None)
+            self.max_objective_time = _opt_param(opt_df, 'MAX_OBJ_TIME', None)
+            self.eval_durations = []
+            self.objective_time = 0.0
+            self.start_time = None
+            self.elapsed_before = 0.0
+            self.skip_static = bool(_opt_param(opt_df, 'SKIP_STATIC', False))
+            self.duplicate_tol = _opt_param(opt_df, 'DUPLICATE_TOL', None)
+            self.duplicates_reused = 0
+            self.eval_index = None
+            if bool(_opt_param(opt_df, 'EVAL_INDEX', False)) or (self.duplicate_tol is not None):
+                self.eval_index = EvaluationIndex(self.lbound, self.ubound)
+            # last evaluated position and outputs of each particle, for
+            # reusing the outputs while the particle does not move
+            self.M_evaluated = np.full(np.shape(self.M), np.nan)
+            self.Fvals_evaluated = np.full((self.number_of_particles, self.output_size), np.nan)
+            self.reuse_counts = np.zeros(self.number_of_particles, dtype=int)
+            self.skip_current = False
+            self.skips_in_row = 0
+            self.skipped_evals = 0
+            if use_shared_memory:
+                self.enable_shared_memory()
+            self.refresh_fitness_cache()
             self.InitDeviation = self.absolute_mean_deviation_of_particles() 
             self.delta_t = self.absolute_mean_deviation_of_particles()/(T_MOD*self.InitDeviation)
 
@@ -190,20 +680,97 @@ class swarm:
 
 
     def call_objective(self, allow_update):
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+        if self.local_search is not None:
+            return self.call_local_objective(allow_update)
         if self.Active[self.current_particle]:
+            if allow_update and self.skip_static and self.is_static(self.current_particle):
+                # same point as the last evaluation. The outputs are reused,
+                # and the call does not count as an iteration
+                self.Fvals = self.Fvals_evaluated[self.current_particle].reshape(-1, 1)
+                self.skip_current = True
+                self.allow_update = 1
+                return True
+            self.skip_current = False
+            if allow_update:
+                Fvals = self.find_duplicate(self.current_particle)
+                if Fvals is not None:
+                    # a point close enough was evaluated before. Its outputs
+                    # are scored for this particle, without counting an iteration
+                    self.Fvals = np.array(Fvals).reshape(-1, 1)
+                    self.Flist = self.objective_function_evaluation(self.Fvals, self.targets)
+                    self.fidelity = self.fidelity_levels - 1
+                    self.allow_update = 1
+                    return True
+            self.skips_in_row = 0
             # call the objective function. If there's an issue with the function execution, 'noError' returns False
-            newFVals, noError = self.obj_func(self.M[self.current_particle], self.output_size)
+            # With several fidelities, the result is promoted up the list
+            # while it could still improve the personal best
+            t0 = time.perf_counter()
+            level = 0
+            while level is not None:
+                newFVals, noError = self.obj_funcs[level](self.M[self.current_particle], self.output_size)
+                level = self.next_fidelity(self.current_particle, level, newFVals, noError)
+            self.record_duration(time.perf_counter() - t0)
+            newFVals, noError, self.fidelity = self.fidelity_result(self.current_particle)
             if noError == True:
                 self.Fvals = np.array(newFVals).reshape(-1, 1)
                 if allow_update:
                     # EVALUATE OBJECTIVE FUNCTION - TARGET OR THRESHOLD
                     self.Flist = self.objective_function_evaluation(self.Fvals, self.targets)# abs(self.targets - self.Fvals)
                     self.iter = self.iter + 1
+                    self.remember_evaluation(self.current_particle, self.Fvals)
                     self.allow_update = 1
                 else:
                     self.allow_update = 0
             return noError# return is for error reporting purposes only
 
+    def set_fidelities(self, obj_func, fidelity_costs=None, fidelity_margin=0.0):
+        # obj_func is a single function, or a list of functions for the same
+        # problem ordered from cheapest (coarsest) to most expensive
+        if isinstance(obj_func, (list, tuple)):
+            self.obj_funcs = list(obj_func)
+        else:
+            self.obj_funcs = [obj_func]
+        self.fidelity_levels = len(self.obj_funcs)
+        if fidelity_costs is None:
+            fidelity_costs = np.ones(self.fidelity_levels)
+        self.fidelity_costs = np.array(fidelity_costs, dtype=float).reshape(-1)
+        if len(self.fidelity_costs) != self.fidelity_levels:
+            self.debug_message_printout("WARNING: FIDELITY_COSTS does not match the number of objective functions. Using a cost of 1 for each.")
+            self.fidelity_costs = np.ones(self.fidelity_levels)
+        self.fidelity_margin = float(fidelity_margin)
+        self.fidelity_results = {}
+        self.fidelity = self.fidelity_levels - 1
+        self.eval_cost = 0.0
+
+    def could_improve(self, particle, Fvals):
+        # promotion test. Only the personal best is checked, since any
+        # result that improves the global best also improves the personal best
+        Flist = self.objective_function_evaluation(np.array(Fvals).reshape(-1, 1), self.targets)
+        fitness = self.aggregate_fitness(Flist) + self.penalty(self.M[particle])
+        best = self.F_Pb_scalar[particle]
+        return fitness <= best + self.fidelity_margin*abs(best)
+
+    def next_fidelity(self, particle, level, Fvals, noError):
+        # book one evaluation of 'particle' at 'level'. Returns the next
+        # level to evaluate, or None when the particle's result is final.
+        # The highest fidelity result that succeeded is kept for fidelity_result()
+        self.eval_cost = self.eval_cost + self.fidelity_costs[level]
+        if noError == True:
+            self.fidelity_results[particle] = (Fvals, level)
+            if (level + 1 < self.fidelity_levels) and self.could_improve(particle, Fvals):
+                return level + 1
+        return None
+
+    def fidelity_result(self, particle):
+        # (Fvals, noError, level) of the final result for 'particle'
+        result = self.fidelity_results.pop(particle, None)
+        if result is None:
+            return np.zeros(self.output_size), False, 0
+        return result[0], True, result[1]
+
     def objective_function_evaluation(self, Fvals, targets):
         #pass in the Fvals & targets so that it's easier to track bugs
 
@@ -257,7 +824,7 @@ class swarm:
                         Flist[ctr] = abs(t - fv)
 
                 else: #o_thres == 0. #TARGET. default
-                    self.parent.debug_message_printout("ERROR: unrecognized threshold value. Evaluating as TARGET")
+                    self.debug_message_printout("ERROR: unrecognized threshold value. Evaluating as TARGET")
                     Flist[ctr] = abs(t - fv)
 
                 ctr = ctr + 1
@@ -271,41 +838,67 @@ class swarm:
         
  
     def update_velocity(self,particle):
-        for i in range(0,np.shape(self.V)[1]):                      
-            self.V[particle,i] = \
-                np.round(self.weights[0][0]* self.rng.random()*self.V[particle,i] \
-                + self.weights[0][1]*self.rng.random()*(self.Pb[particle,i]-self.M[particle,i]) \
-                + self.weights[0][2]*self.rng.random()*(self.Gb[i]-self.M[particle,i])
-                , self.number_decimals)
+        # 3 random numbers per dimension (inertia, cognitive, social),
+        # drawn in the same order as the original per-dimension loop
+        r = self.particle_rngs[particle].take(3*np.shape(self.V)[1])
+        weights = self.weights[0] if self.adapter is None else self.adapter.weights[particle]
+        self.kernels.velocity_update(self.V, self.M, self.Pb, np.ravel(self.Gb), weights,
+                                     r, particle, self.number_decimals)
             
     def check_bounds(self, particle):
-        update = 0
-        for i in range(0,(np.shape(self.M)[1])):
-            if (self.lbound[i] > self.M[particle,i]) \
-               or (self.ubound[i] < self.M[particle,i]):
-                update = i+1        
-        return update
+        # index+1 of the last out of bounds dimension, 0 if in bounds
+        return self.kernels.out_of_bounds(self.M, self.lbound, self.ubound, particle)
+
+    def feasible(self, X):
+        # constraint check used by the boundary handlers. In PENALTY mode
+        # infeasible points are scored instead of moved
+        if self.constraint_mode == 'PENALTY':
+            return True
+        return self.constr_func(X)
+
+    def penalty(self, X):
+        # added to the aggregated fitness of X in PENALTY mode
+        if self.constraint_mode != 'PENALTY':
+            return 0.0
+        return self.penalty_weight*float(self.violation_func(X))
 
     def random_bound(self, particle):
         # If particle is out of bounds, bring the particle back in bounds
         # The first condition checks if constraints are met, 
         # and the second determines if the values are to large (positive or negative)
         # and may cause a buffer overflow with large exponents (a bug that was found experimentally)
-        update = self.check_bounds(particle) or not self.constr_func(self.M[particle])
+        update = self.check_bounds(particle) or not self.feasible(self.M[particle])
         if update > 0:
-            while (self.check_bounds(particle) > 0) or (self.constr_func(self.M[particle]) == False):
-                variation = self.ubound - self.lbound
-                self.M[particle] = np.round(
-                    np.squeeze(
-                        self.rng.random() *
-                        np.multiply(np.ones((1, np.shape(self.M)[1])), variation) +
-                        self.lbound
-                    ), self.number_decimals)
-                
+            # one uniform draw per dimension inside the bounds
+            variation = self.ubound - self.lbound
+            self.M[particle] = np.round(
+                self.particle_rngs[particle].take(np.shape(self.M)[1])*variation + self.lbound,
+                self.number_decimals)
+            if not self.feasible(self.M[particle]):
+                # the draw missed the feasible region. Use a point from the
+                # feasible pool, so the reset takes bounded time
+                self.M[particle] = self.get_feasible_pool().draw()
+
+    def get_feasible_pool(self):
+        # created on first use, with its own random stream. Raises
+        # ConstraintError if no feasible point can be found
+        if self.feasible_pool is None:
+            self.feasible_pool = self.new_feasible_pool()
+            self.feasible_pool.fill()
+            if self.feasible_pool.acceptance is not None and self.feasible_pool.acceptance < 0.01:
+                self.debug_message_printout("WARNING: less than 1% of the search space is feasible. Consider CONSTRAINT_MODE 'PENALTY'.")
+        return self.feasible_pool
+
+    def new_feasible_pool(self):
+        # an empty pool on the swarm's pool stream
+        return FeasiblePool(self.constr_func, self.lbound, self.ubound,
+                            self.number_decimals, self.pool_rng,
+                            size=self.pool_size,
+                            max_batches=self.pool_max_batches)
             
     def reflecting_bound(self, particle):        
         update = self.check_bounds(particle)
-        constr = self.constr_func(self.M[particle])
+        constr = self.feasible(self.M[particle])
         if (update > 0) and constr:
             self.M[particle] = 1*self.Mlast
             NewV = np.multiply(-1,self.V[update-1,particle])
@@ -315,7 +908,7 @@ class swarm:
 
     def absorbing_bound(self, particle):
         update = self.check_bounds(particle)
-        constr = self.constr_func(self.M[particle])
+        constr = self.feasible(self.M[particle])
         if (update > 0) and constr:
             self.M[particle] = 1*self.Mlast
             self.V[particle,update-1] = 0
@@ -323,12 +916,61 @@ class swarm:
             self.random_bound(particle)
 
     def invisible_bound(self, particle):
-        update = self.check_bounds(particle) or not self.constr_func(self.M[particle])
+        update = self.check_bounds(particle) or not self.feasible(self.M[particle])
         if update > 0:
-            self.Active[particle] = 0  
+            self.deactivate(particle)
         else:
             pass            
 
+    def deactivate(self, particle):
+        # take the particle out of the swarm, or recycle it with the
+        # reactivation policy so the swarm size stays constant
+        if self.reactivation != 'NONE':
+            self.reactivate(particle)
+            return
+        self.Active[particle] = 0
+        self.active_index = self.active_index[self.active_index != particle]
+        if len(self.active_index) == 0:
+            self.debug_message_printout("WARNING: all particles have left the search space. Stopping. "
+                                        "Set REACTIVATION to keep the swarm size constant.")
+
+    def reactivate(self, particle):
+        # give the particle a new position and velocity. Its personal best
+        # is kept. 'GBEST' falls back to 'RANDOM' until there is a global best
+        dims = np.shape(self.M)[1]
+        variation = self.ubound - self.lbound
+        draw = self.particle_rngs[particle].take(2*dims)
+        if (self.reactivation == 'GBEST') and (self.F_Gb_fidelity >= 0):
+            X = np.ravel(self.Gb) + (2*draw[:dims] - 1)*self.reactivation_scale*variation
+            X = np.clip(X, self.lbound, self.ubound)
+        else:
+            X = draw[:dims]*variation + self.lbound
+        self.M[particle] = np.round(X, self.number_decimals)
+        if (self.reactivation == 'POOL') or not self.feasible(self.M[particle]):
+            self.M[particle] = self.get_feasible_pool().draw()
+        self.V[particle] = np.round(draw[dims:]*self.vlimit, self.number_decimals)
+
+        if not self.Active[particle]:
+            self.Active[particle] = 1
+            self.active_index = np.union1d(self.active_index, [particle]).astype(int)
+        self.reactivations = self.reactivations + 1
+
+    def refresh_active(self):
+        # rebuild the active index list from self.Active, e.g. after an import
+        self.active_index = np.flatnonzero(self.Active)
+
+    def next_active(self, particle):
+        # the active particle after 'particle', and whether the sweep
+        # wrapped around to the start
+        if len(self.active_index) == self.number_of_particles:
+            if particle + 1 < self.number_of_particles:
+                return particle + 1, False
+            return 0, True
+        pos = np.searchsorted(self.active_index, particle, side='right')
+        if pos < len(self.active_index):
+            return int(self.active_index[pos]), False
+        return int(self.active_index[0]), True
+
     def handle_bounds(self, particle):
         if self.boundary == 1:
             self.random_bound(particle)
@@ -341,15 +983,162 @@ class swarm:
         else:
             self.debug_message_printout("Error: No boundary is set!")
 
+    def set_fitness_aggregation(self, aggregation='L2', agg_weights=None):
+        # the aggregation reduces the Flist array to the single value used
+        # for best-tracking and convergence. 
+        if agg_weights is not None:
+            agg_weights = np.array(agg_weights, dtype=float).reshape(-1)
+
+        if callable(aggregation):
+            self.fitness_aggregation = aggregation
+        elif str(aggregation).upper() == 'L2':
+            self.fitness_aggregation = self.kernels.l2_norm
+        elif str(aggregation).upper() == 'WEIGHTED_SUM':
+            if agg_weights is None:
+                self.fitness_aggregation = lambda F: np.sum(F)
+            else:
+                self.fitness_aggregation = lambda F: np.dot(agg_weights, np.ravel(F))
+        elif str(aggregation).upper() == 'CHEBYSHEV':
+            if agg_weights is None:
+                self.fitness_aggregation = lambda F: np.max(np.abs(F))
+            else:
+                self.fitness_aggregation = lambda F: np.max(agg_weights*np.abs(np.ravel(F)))
+        else:
+            self.debug_message_printout("WARNING: unrecognized fitness aggregation. Defaulting to L2 norm.")
+            self.fitness_aggregation = self.kernels.l2_norm
+
+    def aggregate_fitness(self, Flist):
+        return float(self.fitness_aggregation(np.ravel(Flist)))
+
+    def refresh_fitness_cache(self):
+        # recompute the cached scalar fitness values from F_Gb and F_Pb.
+        # Only needed when those arrays are replaced wholesale (init, import)
+        self.F_Gb_scalar = self.aggregate_fitness(self.F_Gb) + self.F_Gb_penalty
+        self.F_Pb_scalar = np.array([self.aggregate_fitness(F) for F in self.F_Pb]) + self.F_Pb_penalty
+
     def check_global_local(self, Flist, particle):
+        penalty = self.penalty(self.M[particle])
+        fitness = self.aggregate_fitness(Flist) + penalty
 
-        if np.linalg.norm(Flist) < np.linalg.norm(self.F_Gb):
+        if fitness < self.F_Gb_scalar:
             self.F_Gb = np.array([Flist])
+            self.F_Gb_scalar = fitness
+            self.F_Gb_penalty = penalty
+            self.Fvals_Gb = np.ravel(self.Fvals)
+            self.F_Gb_fidelity = self.fidelity
             self.Gb = np.array(self.M[particle])
+            self.last_improvement = self.iter
         
-        if np.linalg.norm(Flist) < np.linalg.norm(self.F_Pb[particle]):
+        if fitness < self.F_Pb_scalar[particle]:
             self.F_Pb[particle] = np.squeeze(Flist)
+            self.F_Pb_scalar[particle] = fitness
+            self.F_Pb_penalty[particle] = penalty
+            self.Fvals_Pb[particle] = np.ravel(self.Fvals)
+            self.F_Pb_fidelity[particle] = self.fidelity
             self.Pb[particle] = self.M[particle]
+            if self.adapter is not None:
+                self.adapter.record(particle, True)
+        elif self.adapter is not None:
+            self.adapter.record(particle, False)
+
+    def rebase_best(self, position, F_Gb, Fvals=None, penalty=0.0, fidelity=None):
+        # Replace the global best with a point that was scored outside this
+        # swarm, and clear the personal best scores (the positions are kept
+        # as attractors). Used when the objective seen by the swarm changes,
+        # e.g. a new context vector in cooperative coevolution (coevolution.py)
+        self.Gb = np.array(np.ravel(position), dtype=float)
+        self.F_Gb = np.array(F_Gb)
+        self.F_Gb_penalty = float(penalty)
+        self.Fvals_Gb = np.full(self.output_size, np.nan) if Fvals is None else np.ravel(Fvals)
+        self.F_Gb_fidelity = (self.fidelity_levels - 1) if fidelity is None else int(fidelity)
+        self.F_Pb[:] = sys.maxsize
+        self.F_Pb_penalty[:] = 0.0
+        self.Fvals_Pb[:] = np.nan
+        self.F_Pb_fidelity[:] = -1
+        self.refresh_fitness_cache()
+        self.last_improvement = self.iter
+        self.local_from = np.inf
+        self.forget_evaluations()
+
+    def warm_start(self, positions, Fvals, noError=None, move_seeds=True, fidelity=None):
+        # Seed the swarm with previously evaluated points. The raw Fvals are
+        # re-scored against the current targets/obj_threshold without calling
+        # the objective function, and the best unique points become the
+        # starting M/Pb of the first particles. Gb is set to the best point.
+        # With move_seeds, seeded particles take one velocity step so the
+        # first sweep does not spend evaluations on points that are known.
+        # fidelity: level the Fvals were evaluated at. Default is the highest.
+        # Returns the number of particles that were seeded.
+        if fidelity is None:
+            fidelity = self.fidelity_levels - 1
+        if self.iter > 0:
+            self.debug_message_printout("WARNING: warm start requested after the optimization started. Ignoring.")
+            return 0
+
+        positions = np.array(positions, dtype=float)
+        Fvals = np.array(Fvals, dtype=float)
+        if positions.ndim == 1:
+            positions = positions.reshape(1, -1)
+        if Fvals.ndim == 1:
+            Fvals = Fvals.reshape(len(positions), -1)
+
+        if (np.shape(positions)[1] != np.shape(self.M)[1]) \
+           or (np.shape(Fvals)[1] != self.output_size) \
+           or (len(positions) != len(Fvals)):
+            self.debug_message_printout("Error: warm start positions and Fvals do not match the swarm dimensions.")
+            return 0
+
+        # drop failed evaluations, and points that are no longer valid
+        # under the current bounds and constraints (PENALTY mode scores
+        # infeasible points instead)
+        keep = np.all(np.isfinite(Fvals), axis=1)
+        if noError is not None:
+            keep = keep & np.array(noError, dtype=bool).reshape(-1)
+        keep = keep & np.all(positions >= self.lbound, axis=1) & np.all(positions <= self.ubound, axis=1)
+        if self.constraint_mode != 'PENALTY':
+            keep[keep] = feasibility_mask(self.constr_func, positions[keep])
+        positions = positions[keep]
+        Fvals = Fvals[keep]
+        if len(positions) < 1:
+            self.debug_message_printout("WARNING: no usable points for warm start.")
+            return 0
+
+        positions, unique_idx = np.unique(positions, axis=0, return_index=True)
+        Fvals = Fvals[unique_idx]
+
+        Flists = [self.objective_function_evaluation(F.reshape(-1, 1), self.targets) for F in Fvals]
+        penalties = np.array([self.penalty(X) for X in positions])
+        fitness = np.array([self.aggregate_fitness(Flist) for Flist in Flists]) + penalties
+        order = np.argsort(fitness, kind='stable')[:self.number_of_particles]
+
+        for particle, idx in enumerate(order):
+            self.M[particle] = positions[idx]
+            self.Pb[particle] = positions[idx]
+            self.F_Pb[particle] = np.squeeze(Flists[idx])
+            self.F_Pb_scalar[particle] = fitness[idx]
+            self.Fvals_Pb[particle] = Fvals[idx]
+            self.F_Pb_fidelity[particle] = fidelity
+            self.F_Pb_penalty[particle] = penalties[idx]
+
+        best = order[0]
+        self.Gb = np.array(positions[best])
+        self.F_Gb = np.array([Flists[best]])
+        self.F_Gb_scalar = fitness[best]
+        self.Fvals_Gb = np.array(Fvals[best])
+        self.F_Gb_fidelity = fidelity
+        self.F_Gb_penalty = penalties[best]
+
+        if move_seeds:
+            for particle in range(0, len(order)):
+                self.update_velocity(particle)
+                self.update_point(particle)
+                self.handle_bounds(particle)
+
+        self.InitDeviation = self.absolute_mean_deviation_of_particles()
+        self.delta_t = self.absolute_mean_deviation_of_particles()/(self.T_MOD*self.InitDeviation)
+
+        self.debug_message_printout("warm start seeded " + str(len(order)) + " particle(s)")
+        return len(order)
 
     def update_point(self,particle):
         self.Mlast = 1*self.M[particle]
@@ -360,60 +1149,335 @@ class swarm:
         # if enforcing decimal limit, no need to check floating point error handler anymore. 
         self.delta_t = np.round(self.delta_t, self.number_decimals) 
 
-        self.M[particle] = np.round(self.M[particle] + self.delta_t*self.V[particle], self.number_decimals)
+        self.kernels.point_update(self.M, self.V, self.delta_t, particle, self.number_decimals)
+
+    def adapt_parameters(self):
+        # after each sweep or generation (see swarm_adapt.py)
+        if self.adapter is None:
+            return
+        used = self.budget_used()
+        weights, self.T_MOD = self.adapter.update(used/self.maxit, self.T_MOD, self.iter)
+        self.weights = np.array([weights])
 
     def update_delta_t(self):
         self.delta_t = self.absolute_mean_deviation_of_particles()/(self.T_MOD*self.InitDeviation)
 
+    def start_local_search(self, suppress_output):
+        # called after each sweep. Starts a refinement phase from Gb if the
+        # swarm has clustered or stalled, and Gb has improved since the
+        # last phase started (so the same point is not refined twice)
+        if (self.local_method == 'NONE') or (self.F_Gb_fidelity < 0):
+            return
+        if self.F_Gb_scalar >= self.local_from:
+            return
+        # delta_t was just recomputed: spread/(T_MOD*initial spread)
+        clustered = (self.local_dispersion is not None) and \
+            (self.delta_t*self.T_MOD < float(self.local_dispersion))
+        stalled = (self.local_stall is not None) and \
+            (self.iter - self.last_improvement >= int(self.local_stall))
+        if not (clustered or stalled):
+            return
+
+        if self.local_step is None:
+            # current spread of the swarm along each dimension
+            M = self.M[self.active_index]
+            step = np.mean(np.abs(M - np.mean(M, axis=0)), axis=0)
+        else:
+            step = float(self.local_step)*(np.ravel(self.ubound) - np.ravel(self.lbound))
+        feasible = None if self.constraint_mode == 'PENALTY' else self.constr_func
+        self.local_search = make_local_search(self.local_method, self.Gb, self.F_Gb_scalar,
+                                              self.lbound, self.ubound, self.number_decimals,
+                                              step, feasible, self.local_budget)
+        self.local_from = self.F_Gb_scalar
+        self.local_point = self.local_search.ask()
+        if self.local_point is None:
+            self.end_local_search(suppress_output)
+
+    def call_local_objective(self, allow_update):
+        # call_objective() during a refinement phase. The point comes from
+        # the local search, and is evaluated at the highest fidelity
+        level = self.fidelity_levels - 1
+        t0 = time.perf_counter()
+        newFVals, noError = self.obj_funcs[level](self.local_point, self.output_size)
+        self.record_duration(time.perf_counter() - t0)
+        self.eval_cost = self.eval_cost + self.fidelity_costs[level]
+        self.fidelity = level
+        self.local_fitness = np.inf
+        if noError == True:
+            self.Fvals = np.array(newFVals).reshape(-1, 1)
+            if allow_update:
+                self.Flist = self.objective_function_evaluation(self.Fvals, self.targets)
+                self.local_fitness = self.aggregate_fitness(self.Flist) + self.penalty(self.local_point)
+                self.iter = self.iter + 1
+                self.allow_update = 1
+            else:
+                self.allow_update = 0
+        return noError
+
+    def step_local(self, suppress_output):
+        # step() during a refinement phase. Folds the last result into Gb
+        # and moves on to the next point. The particles are not moved
+        fitness = self.local_fitness
+        self.local_fitness = None
+        if fitness is not None:
+            if fitness < self.F_Gb_scalar:
+                self.F_Gb = np.array([self.Flist])
+                self.F_Gb_scalar = fitness
+                self.F_Gb_penalty = self.penalty(self.local_point)
+                self.Fvals_Gb = np.ravel(self.Fvals)
+                self.F_Gb_fidelity = self.fidelity
+                self.Gb = np.array(self.local_point)
+                self.last_improvement = self.iter
+            self.local_search.tell(fitness)
+        self.local_point = self.local_search.ask()
+        if self.local_point is None:
+            self.end_local_search(suppress_output)
+
+    def end_local_search(self, suppress_output):
+        self.local_phases = self.local_phases + 1
+        self.local_evals = self.local_evals + self.local_search.evaluations
+        if (self.log_always or not suppress_output) and self.log.enabled(DEBUG, 'local_search'):
+            self.log.emit(DEBUG, 'local_search', {'iteration': self.iter,
+                                                  'evaluations': self.local_search.evaluations,
+                                                  'start_eval': self.local_from,
+                                                  'best_eval': self.F_Gb_scalar})
+        self.local_search = None
+        self.local_point = None
+
     def converged(self):
-        convergence = np.linalg.norm(self.F_Gb) < self.E_TOL
+        convergence = self.F_Gb_scalar < self.E_TOL
         return convergence
     
-    def maxed(self):
-        max_iter = self.iter >= self.maxit
-        return max_iter
+    def record_duration(self, duration):
+        self.eval_durations.append(duration)
+        self.objective_time = self.objective_time + duration
+
+    def is_static(self, particle):
+        # True if the particle is where it was last evaluated. After a full
+        # sweep of skipped particles the next one is evaluated anyway, so a
+        # frozen swarm still uses up its budget
+        if self.skips_in_row >= self.number_of_particles:
+            return False
+        if np.array_equal(self.M[particle], self.M_evaluated[particle]):
+            self.skips_in_row = self.skips_in_row + 1
+            self.skipped_evals = self.skipped_evals + 1
+            self.reuse_counts[particle] = self.reuse_counts[particle] + 1
+            return True
+        return False
+
+    def remember_evaluation(self, particle, Fvals):
+        # outputs of a successful evaluation of M[particle]
+        self.M_evaluated[particle] = self.M[particle]
+        self.Fvals_evaluated[particle] = np.ravel(Fvals)
+        if (self.eval_index is not None) and (self.fidelity == self.fidelity_levels - 1):
+            self.eval_index.insert(self.M[particle], np.ravel(Fvals))
+
+    def find_duplicate(self, particle):
+        # outputs of an evaluated point within DUPLICATE_TOL of M[particle],
+        # or None. Shares the limit of one sweep of skips in a row with
+        # SKIP_STATIC
+        if (self.duplicate_tol is None) or (self.skips_in_row >= self.number_of_particles):
+            return None
+        idx = self.eval_index.find_duplicate(self.M[particle], self.duplicate_tol)
+        if idx is None:
+            return None
+        Fvals = self.eval_index.value(idx)
+        self.skips_in_row = self.skips_in_row + 1
+        self.duplicates_reused = self.duplicates_reused + 1
+        # not added to the index, so approximations do not chain
+        self.M_evaluated[particle] = self.M[particle]
+        self.Fvals_evaluated[particle] = Fvals
+        return Fvals
+
+    def forget_evaluations(self):
+        # the stored outputs no longer hold, e.g. after the objective changed.
+        # Every particle is evaluated again at its next turn
+        self.M_evaluated[:] = np.nan
+        self.Fvals_evaluated[:] = np.nan
+        self.skips_in_row = 0
+        if self.eval_index is not None:
+            self.eval_index.clear()
+
+    def get_reuse_data(self):
+        # SKIP_STATIC and DUPLICATE_TOL summary: evaluations saved in total
+        # and per particle (unmoved particles), near duplicates, and the
+        # objective time they would have taken at the mean duration
+        count = len(self.eval_durations)
+        mean = self.objective_time/count if count > 0 else 0.0
+        return {'reused': self.skipped_evals,
+                'per_particle': self.reuse_counts.tolist(),
+                'duplicates': self.duplicates_reused,
+                'saved_time': (self.skipped_evals + self.duplicates_reused)*mean}
+
+    def estimate_remaining(self):
+        # estimated seconds until the run stops on maxit or a time budget,
+        # from the rates measured so far. Convergence can end it sooner.
+        # None before the first evaluation
+        used = self.budget_used()
+        elapsed = self.walltime()
+        if (used <= 0) or (elapsed <= 0):
+            return None
+        estimates = [elapsed/used*(self.maxit - used)]
+        if self.max_walltime is not None:
+            estimates.append(self.max_walltime - elapsed)
+        if (self.max_objective_time is not None) and (self.objective_time > 0):
+            estimates.append((self.max_objective_time - self.objective_time)*elapsed/self.objective_time)
+        return max(0.0, min(estimates))
+
+    def get_time_data(self):
+        # timing summary. Durations are per objective function call
+        count = len(self.eval_durations)
+        return {'walltime': self.walltime(),
+                'objective_time': self.objective_time,
+                'evaluations': count,
+                'mean_eval_time': self.objective_time/count if count > 0 else None,
+                'last_eval_time': self.eval_durations[-1] if count > 0 else None,
+                'skipped': self.skipped_evals,
+                'remaining': self.estimate_remaining()}
     
+    def depleted(self):
+        # no active particles left (BOUNDARY 4 without reactivation)
+        return len(self.active_index) == 0
+
     def complete(self):
-        done = self.converged() or self.maxed()
+        done = self.converged() or self.maxed() or self.depleted()
         return done
     
     def step(self, suppress_output):
-        if not suppress_output:
-            msg = "\n-----------------------------\n" + \
-                "STEP #" + str(self.iter) +"\n" + \
-                "-----------------------------\n" + \
-                "Current Particle:\n" + \
-                str(self.current_particle) +"\n" + \
-                "Current Particle Velocity\n" + \
-                str(self.V[self.current_particle]) +"\n" + \
-                "Current Particle Location\n" + \
-                str(self.M[self.current_particle]) +"\n" + \
-                "Delta T\n" + \
-                str(self.delta_t) +"\n" + \
-                "Absolute mean deviation\n" + \
-                str(self.absolute_mean_deviation_of_particles()) +"\n" + \
-                "-----------------------------"
-            self.debug_message_printout(msg)
-            
-
-        if self.allow_update:
+        trace = self.log_always or not suppress_output
+        if trace and self.log.enabled(DEBUG, 'step'):
+            particle = self.current_particle
+            # dispersion is only computed if a sink writes it
+            self.log.emit(DEBUG, 'step', {'iteration': self.iter,
+                                          'particle': particle,
+                                          'velocity': np.array(self.V[particle]),
+                                          'position': np.array(self.M[particle]),
+                                          'delta_t': self.delta_t,
+                                          'dispersion': self.absolute_mean_deviation_of_particles},
+                          text=_step_text)
+
+
+        if self.allow_update and (self.local_search is not None):
+            self.step_local(suppress_output)
+            if trace and self.complete():
+                self.log_complete()
+        elif self.allow_update and not self.depleted():
             if self.Active[self.current_particle]:
-                self.check_global_local(self.Flist,self.current_particle)
+                if self.skip_current:
+                    self.skip_current = False
+                else:
+                    self.check_global_local(self.Flist,self.current_particle)
                 self.update_velocity(self.current_particle)
                 self.update_point(self.current_particle)
                 self.handle_bounds(self.current_particle)
-            self.current_particle = self.current_particle + 1
-            if self.current_particle == self.number_of_particles:
-                self.current_particle = 0
-                self.update_delta_t()
-            if self.complete() and not suppress_output:
-                msg =  "\nPoints: \n" + str(self.Gb) + "\n" + \
-                    "Iterations: \n" + str(self.iter) + "\n" + \
-                    "Flist: \n" + str(self.F_Gb) + "\n" + \
-                    "Norm Flist: \n" + str(np.linalg.norm(self.F_Gb)) + "\n"
-                self.debug_message_printout(msg)
-
-
+            # only active particles are stepped through
+            if not self.depleted():
+                self.current_particle, wrapped = self.next_active(self.current_particle)
+                if wrapped:
+                    self.adapt_parameters()
+                    self.update_delta_t()
+                    self.start_local_search(suppress_output)
+            if trace and self.complete():
+                self.log_complete()
+
+
+    def iterate(self, every=100, on_improvement=False):
+        # Generator version of run(). Runs the optimization and yields a
+        # SwarmSnapshot every 'every' evaluations, and with on_improvement,
+        # whenever the global best improves. A final snapshot (done=True)
+        # is yielded when the optimizer completes. Stop early by leaving
+        # the loop; the swarm keeps its state and can be resumed.
+        #   for snapshot in myOptimizer.iterate(every=100):
+        #       print(snapshot.iteration, snapshot.best_eval)
+        last = None
+        for due in self.drive(every, on_improvement, True):
+            last = self.iter
+            yield SwarmSnapshot(self)
+        if last != self.iter:
+            yield SwarmSnapshot(self)
+
+    async def aiterate(self, every=100, on_improvement=False):
+        # iterate() for an asyncio loop. Control is handed back to the
+        # event loop after each snapshot, so the loop is blocked for at
+        # most 'every' objective function calls at a time.
+        #   async for snapshot in myOptimizer.aiterate(every=100):
+        #       await websocket.send(str(snapshot.best_eval))
+        # asyncio is imported here to keep it out of the module import
+        import asyncio
+        for snapshot in self.iterate(every, on_improvement):
+            yield snapshot
+            await asyncio.sleep(0)
+
+    def evaluate_generation(self, evaluator, quorum=1.0, suppress_output=True):
+        # Synchronous generation mode, used with a parallel evaluator
+        # (see parallel_evaluator.py) instead of step()/call_objective().
+        # Every active particle that is not already waiting on a result is
+        # submitted. The generation ends once 'quorum' (fraction) of the 
+        # outstanding results are in. Particles whose results are late stay
+        # where they are and are updated when their result lands.
+        # With several fidelities, 'evaluator' is a list with one evaluator
+        # per objective function, and promoted particles are resubmitted
+        # to the next evaluator.
+        evaluators = list(evaluator) if isinstance(evaluator, (list, tuple)) else [evaluator]
+        if len(evaluators) != self.fidelity_levels:
+            raise ValueError("generation mode needs one evaluator per objective function fidelity ("
+                             + str(self.fidelity_levels) + "), got " + str(len(evaluators)))
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+        for particle in self.active_index:
+            if particle not in self.pending_evals:
+                particle = int(particle)
+                if self.skip_static and self.is_static(particle):
+                    # not moved since its last evaluation. Only take the next step
+                    self.apply_evaluation(particle, None, False)
+                    continue
+                Fvals = self.find_duplicate(particle)
+                if Fvals is not None:
+                    self.apply_evaluation(particle, Fvals, True, reused=True)
+                    continue
+                self.skips_in_row = 0
+                evaluators[0].submit(particle, np.array(self.M[particle]))
+                self.pending_evals.add(particle)
+
+        needed = math.ceil(quorum*len(self.pending_evals))
+        received = 0
+        # a single evaluator blocks in poll(). Several are polled in turn
+        wait = None if len(evaluators) == 1 else 0.01
+        while (received < needed) and (len(self.pending_evals) > 0) and not self.complete():
+            for level in range(0, len(evaluators)):
+                for particle, Fvals, noError, duration in evaluators[level].poll(wait):
+                    self.record_duration(duration)
+                    next_level = self.next_fidelity(particle, level, Fvals, noError)
+                    if next_level is not None:
+                        evaluators[next_level].submit(particle, np.array(self.M[particle]))
+                        continue
+                    Fvals, noError, fidelity = self.fidelity_result(particle)
+                    self.pending_evals.discard(particle)
+                    self.apply_evaluation(particle, Fvals, noError, fidelity)
+                    received = received + 1
+
+        self.adapt_parameters()
+        self.update_delta_t()
+        if (self.log_always or not suppress_output) and self.complete():
+            self.log_complete()
+        return received
+
+    def apply_evaluation(self, particle, Fvals, noError, fidelity=None, reused=False):
+        # fold one result for M[particle] into the swarm and move the particle.
+        # Failed evaluations do not count as iterations and do not update
+        # the bests, but the particle still moves on. Reused outputs
+        # (DUPLICATE_TOL) update the bests but do not count either
+        if noError == True:
+            self.fidelity = self.fidelity_levels - 1 if fidelity is None else fidelity
+            self.Fvals = np.array(Fvals).reshape(-1, 1)
+            self.Flist = self.objective_function_evaluation(self.Fvals, self.targets)
+            if not reused:
+                self.iter = self.iter + 1
+                self.remember_evaluation(particle, self.Fvals)
+            self.check_global_local(self.Flist, particle)
+        self.update_velocity(particle)
+        self.update_point(particle)
+        self.handle_bounds(particle)
 
     def export_swarm(self):
         #These do NOT export.
@@ -447,15 +1511,35 @@ class swarm:
             'T_MOD': [self.T_MOD],
             'InitDeviation': [self.InitDeviation],    
             'delta_t': [self.delta_t],
+            'rng_state': [self.get_rng_state()],
 
             # shared format vars for AntennaCAT set
-            'M': [self.M], 
-            'V': [self.V],
-            'Active': [self.Active],                    
+            # copies, so the export stays valid if the shared block is released
+            'M': [np.array(self.M)], 
+            'V': [np.array(self.V)],
+            'Active': [np.array(self.Active)],                    
+            'reactivations': [self.reactivations],
+            'walltime': [self.walltime()],
+            'objective_time': [self.objective_time],
+            'skipped_evals': [self.skipped_evals],
+            'skips_in_row': [self.skips_in_row],
+            'M_evaluated': [np.array(self.M_evaluated)],
+            'Fvals_evaluated': [np.array(self.Fvals_evaluated)],
+            'reuse_counts': [np.array(self.reuse_counts)],
+            'duplicates_reused': [self.duplicates_reused],
+            'eval_index': [None if self.eval_index is None else self.eval_index.get_state()],
+            'adapt_state': [None if self.adapter is None else self.adapter.get_state()],
             'Gb': [self.Gb],
             'F_Gb': [self.F_Gb],             
-            'Pb': [self.Pb],           
-            'F_Pb': [self.F_Pb],
+            'Pb': [np.array(self.Pb)],           
+            'F_Pb': [np.array(self.F_Pb)],
+            'Fvals_Gb': [self.Fvals_Gb],
+            'Fvals_Pb': [self.Fvals_Pb],
+            'eval_cost': [self.eval_cost],
+            'F_Gb_fidelity': [self.F_Gb_fidelity],
+            'F_Pb_fidelity': [np.array(self.F_Pb_fidelity)],
+            'F_Gb_penalty': [self.F_Gb_penalty],
+            'F_Pb_penalty': [np.array(self.F_Pb_penalty)],
             'weights': [self.weights], 
             'Flist': [self.Flist],                                                
             'Fvals': [self.Fvals],
@@ -464,11 +1548,13 @@ class swarm:
             } 
         
        
-        return swarm_export # this is turned into a dataframe in the driver class
+        # this can be turned into a dataframe in the driver class, but the
+        # dict can also be passed straight back into import_swarm()
+        return swarm_export
 
     def import_swarm(self, swarm_export):
-        # swarm export is a dataframe. this is unpacked and converted just like
-        # with the initialized opt_df params
+        # swarm export is a dataframe or the dict from export_swarm(). 
+        # this is unpacked and converted just like with the initialized opt_df params
 
         # These are values that define the swarm and current solution space
         # These are retained because the dimensionality of M, F_pb, etc. are strict
@@ -491,28 +1577,152 @@ class swarm:
         self.T_MOD = float(swarm_export['T_MOD'][0])  
         self.InitDeviation = float(swarm_export['InitDeviation'][0])  
         self.delta_t = float(swarm_export['delta_t'][0]) 
+        rng_state = _opt_param(swarm_export, 'rng_state', None)
+        if rng_state is not None:
+            self.set_rng_state(rng_state)
 
         # shared format vars for AntennaCAT set
 
         self.M = np.array(swarm_export['M'][0]) 
         self.V = np.array(swarm_export['V'][0])
         self.Active = np.array(swarm_export['Active'][0])                    
+        self.refresh_active()
+        self.reactivations = int(_opt_param(swarm_export, 'reactivations', 0))
+        # the clock restarts at the next call_objective()
+        self.elapsed_before = float(_opt_param(swarm_export, 'walltime', 0.0))
+        self.start_time = None
+        self.objective_time = float(_opt_param(swarm_export, 'objective_time', 0.0))
+        self.skipped_evals = int(_opt_param(swarm_export, 'skipped_evals', 0))
+        self.M_evaluated = np.array(_opt_param(swarm_export, 'M_evaluated', np.full(np.shape(self.M), np.nan)))
+        self.Fvals_evaluated = np.array(_opt_param(swarm_export, 'Fvals_evaluated',
+                                                   np.full((self.number_of_particles, self.output_size), np.nan)))
+        self.reuse_counts = np.array(_opt_param(swarm_export, 'reuse_counts',
+                                                np.zeros(self.number_of_particles, dtype=int)))
+        if 'Fvals_evaluated' not in swarm_export:
+            self.forget_evaluations()
+        self.skips_in_row = int(_opt_param(swarm_export, 'skips_in_row', 0))
+        self.duplicates_reused = int(_opt_param(swarm_export, 'duplicates_reused', 0))
+        index_state = _opt_param(swarm_export, 'eval_index', None)
+        if (self.eval_index is not None) and (index_state is not None):
+            self.eval_index.set_state(index_state)
+        self.skip_current = False
+        adapt_state = _opt_param(swarm_export, 'adapt_state', None)
+        if (self.adapter is not None) and (adapt_state is not None):
+            if not self.adapter.set_state(adapt_state):
+                self.debug_message_printout("WARNING: saved adaptation state does not match the number of particles. Not restored.")
         self.Gb = np.array(swarm_export['Gb'][0]) 
         self.F_Gb = np.array(swarm_export['F_Gb'][0])
         self.Pb = np.array(swarm_export['Pb'][0])              
         self.F_Pb = np.array(swarm_export['F_Pb'][0])  
+        # raw best outputs were added to the export later. Older exports
+        # do not have them
+        self.Fvals_Gb = np.array(_opt_param(swarm_export, 'Fvals_Gb', np.full(self.output_size, np.nan)))
+        self.Fvals_Pb = np.array(_opt_param(swarm_export, 'Fvals_Pb', np.full(np.shape(self.F_Pb), np.nan)))
+        self.eval_cost = float(_opt_param(swarm_export, 'eval_cost', self.iter))
+        self.F_Gb_fidelity = int(_opt_param(swarm_export, 'F_Gb_fidelity', self.fidelity_levels - 1))
+        self.F_Pb_fidelity = np.array(_opt_param(swarm_export, 'F_Pb_fidelity',
+                                                 (self.fidelity_levels - 1)*np.ones(np.shape(self.F_Pb)[0])), dtype=int)
         self.weights = np.array(swarm_export['weights'][0])                
         self.Flist = np.array(swarm_export['Flist'][0])                                                 
         self.Fvals= np.array(swarm_export['Fvals'][0])
         self.vlimit = np.array(swarm_export['vlimit'][0]) # used in initial setup                                               
         self.Mlast= np.array(swarm_export['Mlast'][0])   
 
+        self.F_Gb_penalty = float(_opt_param(swarm_export, 'F_Gb_penalty', 0.0))
+        self.F_Pb_penalty = np.array(_opt_param(swarm_export, 'F_Pb_penalty', np.zeros(np.shape(self.F_Pb)[0])), dtype=float)
+
+        # cached scalar fitness is derived, not exported
+        self.refresh_fitness_cache()
+
+        # a refinement phase in progress is not exported. The swarm resumes
+        self.local_search = None
+        self.local_point = None
+        self.local_fitness = None
+        self.local_from = np.inf
+        self.last_improvement = self.iter
+
+        # imported arrays are copied back into the shared block
+        if self.shared_state is not None:
+            if (self.shared_state.N, self.shared_state.D, self.shared_state.O) == \
+               (np.shape(self.M)[0], np.shape(self.M)[1], np.shape(self.F_Pb)[1]):
+                self._bind_shared_arrays()
+            else:
+                self.release_shared_memory()
+                self.enable_shared_memory()
+
+    def enable_shared_memory(self, name=None):
+        # move M, V, Pb, F_Pb, and Active into a shared memory block. 
+        # Workers and monitors attach with SharedSwarmState.attach(self.shared_state.name)
+        from shared_state import SharedSwarmState
+        if self.shared_state is not None:
+            return self.shared_state.name
+        self.shared_state = SharedSwarmState.create(np.shape(self.M)[0], np.shape(self.M)[1],
+                                                    np.shape(self.F_Pb)[1], name=name)
+        self._bind_shared_arrays()
+        return self.shared_state.name
+
+    def _bind_shared_arrays(self):
+        # copy the current values into the shared block, then use the
+        # shared views. All updates to these arrays are made in place
+        state = self.shared_state
+        state.M[:] = self.M
+        state.V[:] = self.V
+        state.Pb[:] = self.Pb
+        state.F_Pb[:] = self.F_Pb
+        state.Active[:] = self.Active
+        self.M = state.M
+        self.V = state.V
+        self.Pb = state.Pb
+        self.F_Pb = state.F_Pb
+        self.Active = state.Active
+
+    def release_shared_memory(self):
+        # copy the arrays back to private memory and free the shared block
+        if self.shared_state is None:
+            return
+        self.M = np.array(self.M)
+        self.V = np.array(self.V)
+        self.Pb = np.array(self.Pb)
+        self.F_Pb = np.array(self.F_Pb)
+        self.Active = np.array(self.Active)
+        self.shared_state.close()
+        self.shared_state = None
+
+
+    def get_rng_state(self):
+        # seed entropy, main stream, and every particle stream (including
+        # the unused part of its pre-generated block), and the feasible pool
+        # stream with the points still in the pool. The adapter stream is
+        # saved with the adaptation state
+        return {'seed': self.seed,
+                'main': self.rng.bit_generator.state,
+                'particles': [stream.get_state() for stream in self.particle_rngs],
+                'pool': self.pool_rng.bit_generator.state,
+                'pool_points': None if self.feasible_pool is None else np.array(self.feasible_pool.points)}
+
+    def set_rng_state(self, rng_state):
+        if len(rng_state['particles']) != len(self.particle_rngs):
+            self.debug_message_printout("WARNING: saved random state does not match the number of particles. Not restored.")
+            return
+        self.seed = rng_state['seed']
+        self.rng.bit_generator.state = rng_state['main']
+        for stream, state in zip(self.particle_rngs, rng_state['particles']):
+            stream.set_state(state)
+        # older exports do not have the pool stream
+        if 'pool' in rng_state:
+            self.pool_rng.bit_generator.state = rng_state['pool']
+            self.feasible_pool = None
+            if rng_state['pool_points'] is not None:
+                self.feasible_pool = self.new_feasible_pool()
+                self.feasible_pool.points = np.array(rng_state['pool_points'])
 
     def get_obj_inputs(self):
+        if self.local_search is not None:
+            return self.local_point
         return self.M[self.current_particle]
     
     def get_convergence_data(self):
-        best_eval = np.linalg.norm(self.F_Gb)
+        best_eval = self.F_Gb_scalar
         iteration = 1*self.iter
         return iteration, best_eval
         
@@ -523,17 +1733,21 @@ class swarm:
         return self.F_Gb[0] #correction for extra brackets that happen with the math/passing
     
     def absolute_mean_deviation_of_particles(self):
-        mean_data = np.array(np.mean(self.M, axis=0)).reshape(1, -1)
-        abs_data = np.zeros(np.shape(self.M))
-        for i in range(0,self.number_of_particles):
-            abs_data[i] = np.squeeze(np.abs(self.M[i]-mean_data))
+        # over the active particles. Inactive particles are out of bounds
+        M = self.M
+        if len(self.active_index) < self.number_of_particles:
+            if len(self.active_index) == 0:
+                return self.InitDeviation
+            M = self.M[self.active_index]
+        mean_data = np.array(np.mean(M, axis=0)).reshape(1, -1)
+        abs_data = np.abs(M - mean_data)
 
         abs_mean_dev = np.linalg.norm(np.mean(abs_data,axis=0))
         return abs_mean_dev
 
 
-    def debug_message_printout(self, msg):
-        if self.parent == None:
-            print(msg)
-        else:
-            self.parent.debug_message_printout(msg)
\ No newline at end of file
+    def log_complete(self):
+        if self.log.enabled(INFO, 'complete'):
+            self.log.emit(INFO, 'complete', {'Gb': self.Gb, 'iteration': self.iter,
+                                             'F_Gb': self.F_Gb, 'best_eval': self.F_Gb_scalar},
+                          text=_complete_text)
\ No newline at end of file
@@ -0,0 +1,333 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/run_experiments.py'
+#   Batch runner for the 'swarm' class. Runs every combination of
+#       problems x optimizer settings x seeds from a job file across a
+#       process pool, and appends one JSON line per run to a single
+#       output file as the runs finish. A summary per problem and
+#       setting is printed at the end.
+#
+#       Problem packages are found by their configs_F.py contract
+#       (OBJECTIVE_FUNC, CONSTR_FUNC, LB, UB, TARGETS), which is checked
+#       by parsing the file, without importing it.
+#
+#       usage: run_experiments.py JOBS.json OUTPUT.jsonl [--workers N] [--resume]
+#              run_experiments.py --list
+#              run_experiments.py --summary OUTPUT.jsonl
+#
+#       Job file (JSON):
+#           {"problems": ["himmelblau", "lundquist_3_var"],   (or "all")
+#            "seeds": [1, 2, 3],                  (or a count, e.g. 10)
+#            "maxit": 10000, "tol": 1e-18, "decimal_limit": 4,
+#            "settings": [
+#                {"name": "default", "NO_OF_PARTICLES": 11},
+#                {"name": "local", "NO_OF_PARTICLES": 11, "LOCAL_SEARCH": "PATTERN",
+#                 "maxit": 5000}]}
+#       Upper case keys of a setting are SwarmConfig options. Lower case
+#       keys (maxit, tol, decimal_limit, evaluate_threshold, obj_threshold,
+#       optimizer) override the top level values for that setting.
+#       optimizer is 'swarm' (default) or 'cooperative' (coevolution.py).
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import os
+import sys
+import ast
+import json
+import time
+import itertools
+import traceback
+import importlib
+import multiprocessing as mp
+from dataclasses import fields
+import numpy as np
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from particle_swarm import swarm, SwarmConfig
+
+# names a configs_F.py must assign to be picked up as a problem package
+CONFIGS_CONTRACT = ['OBJECTIVE_FUNC', 'CONSTR_FUNC', 'LB', 'UB', 'TARGETS']
+
+# lower case setting keys, and their defaults
+RUN_KEYS = {'maxit': 10000, 'tol': 10 ** -18, 'decimal_limit': 4,
+            'evaluate_threshold': False, 'obj_threshold': None, 'optimizer': 'swarm'}
+
+OPTIMIZERS = ['swarm', 'cooperative']
+
+
+def _assigned_names(filename):
+    # top level names assigned in a python file, with their literal values
+    # where they have one
+    with open(filename) as f:
+        tree = ast.parse(f.read(), filename)
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    try:
+                        names[target.id] = ast.literal_eval(node.value)
+                    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                        names[target.id] = None
+    return names
+
+
+def discover_problems(root=SRC_DIR):
+    # {package name: {'IN_VARS': ..., 'OUT_VARS': ..., ...}} for every
+    # package under root whose configs_F.py meets CONFIGS_CONTRACT
+    problems = {}
+    for name in sorted(os.listdir(root)):
+        filename = os.path.join(root, name, 'configs_F.py')
+        if not os.path.isfile(filename):
+            continue
+        try:
+            names = _assigned_names(filename)
+        except SyntaxError:
+            continue
+        if all(key in names for key in CONFIGS_CONTRACT):
+            problems[name] = {key: names.get(key) for key in
+                              ['IN_VARS', 'OUT_VARS', 'LB', 'UB', 'TARGETS', 'OBJECTIVE_FUNC_NAME']}
+    return problems
+
+
+_loaded = {}
+
+
+def load_problem(name, root=SRC_DIR):
+    # imports <root>/<name>/configs_F.py. The configs modules add to
+    # sys.path when they are imported, so sys.path is restored afterwards
+    key = (root, name)
+    if key not in _loaded:
+        saved = list(sys.path)
+        try:
+            if root not in sys.path:
+                sys.path.insert(0, root)
+            _loaded[key] = importlib.import_module(name + '.configs_F')
+        finally:
+            sys.path[:] = saved
+    return _loaded[key]
+
+
+def _swarm_options():
+    return [f.name for f in fields(SwarmConfig)]
+
+
+def expand_jobs(spec, root=SRC_DIR):
+    # list of job dicts, one per problem x setting x seed. Raises
+    # ValueError for unknown problems, options, or optimizers
+    available = discover_problems(root)
+    problems = spec.get('problems', 'all')
+    if problems == 'all':
+        problems = list(available)
+    unknown = [p for p in problems if p not in available]
+    if len(unknown) > 0:
+        raise ValueError("unknown problem(s) " + str(unknown) + ". Found: " + str(list(available)))
+
+    seeds = spec.get('seeds', 1)
+    if isinstance(seeds, int):
+        seeds = list(range(0, seeds))
+
+    settings = spec.get('settings', [{'name': 'default'}])
+    options = _swarm_options()
+    defaults = {key: spec.get(key, value) for key, value in RUN_KEYS.items()}
+    runs = []
+    for i, setting in enumerate(settings):
+        name = str(setting.get('name', 'setting_' + str(i)))
+        opt = {key: value for key, value in setting.items() if key.isupper()}
+        bad = [key for key in opt if key not in options]
+        bad = bad + [key for key in setting if not key.isupper() and key != 'name' and key not in RUN_KEYS]
+        if len(bad) > 0:
+            raise ValueError("setting '" + name + "': unknown option(s) " + str(bad))
+        run = dict(defaults)
+        run.update({key: value for key, value in setting.items() if key in RUN_KEYS})
+        if run['optimizer'] not in OPTIMIZERS:
+            raise ValueError("setting '" + name + "': optimizer must be one of " + str(OPTIMIZERS))
+        runs.append((name, opt, run))
+
+    jobs = []
+    for problem, (name, opt, run), seed in itertools.product(problems, runs, seeds):
+        jobs.append({'id': problem + "/" + name + "/" + str(seed),
+                     'problem': problem, 'setting': name, 'seed': seed,
+                     'options': opt, 'run': run, 'root': root})
+    return jobs
+
+
+def _plain(value):
+    # JSON-safe version of a result value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return str(value)
+    return value
+
+
+def run_job(job):
+    # runs one job and returns its record. Errors are recorded, not raised,
+    # so one bad job does not stop the batch
+    record = {'id': job['id'], 'problem': job['problem'], 'setting': job['setting'],
+              'seed': job['seed']}
+    try:
+        configs = load_problem(job['problem'], job['root'])
+        run = job['run']
+        opt = dict(job['options'])
+        opt['SEED'] = job['seed']
+        if 'LOG_LEVEL' not in opt:
+            opt['LOG_LEVEL'] = 'WARNING'
+        if run['optimizer'] == 'cooperative':
+            from coevolution import CooperativeSwarm
+            optimizer_class = CooperativeSwarm
+        else:
+            optimizer_class = swarm
+        opt_df = SwarmConfig(**opt)
+        myOptimizer = optimizer_class(configs.LB, configs.UB, configs.TARGETS,
+                                      run['tol'], run['maxit'],
+                                      configs.OBJECTIVE_FUNC, configs.CONSTR_FUNC,
+                                      opt_df, parent=None,
+                                      evaluate_threshold=run['evaluate_threshold'],
+                                      obj_threshold=run['obj_threshold'],
+                                      decimal_limit=run['decimal_limit'])
+        result = myOptimizer.run(suppress_output=True)
+        record.update({'best_eval': _plain(result.best_eval),
+                       'iterations': result.iterations,
+                       'eval_cost': _plain(result.eval_cost),
+                       'stop_reason': result.stop_reason,
+                       'elapsed': result.elapsed,
+                       'objective_time': _plain(myOptimizer.objective_time),
+                       'solution': _plain(np.ravel(result.solution)),
+                       'outputs': _plain(np.ravel(result.outputs))})
+    except Exception:
+        record['error'] = traceback.format_exc()
+    return record
+
+
+def completed_ids(filename):
+    # ids of the runs already in an output file, for --resume
+    done = set()
+    if not os.path.isfile(filename):
+        return done
+    with open(filename) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'error' not in record:
+                done.add(record.get('id'))
+    return done
+
+
+def run_jobs(jobs, output, workers=None, resume=False, start_method=None, report=print):
+    # runs the jobs on a process pool and appends each record to output
+    # as it arrives. Returns the number of runs written
+    if resume:
+        done = completed_ids(output)
+        jobs = [job for job in jobs if job['id'] not in done]
+    workers = os.cpu_count() if workers is None else int(workers)
+    workers = max(1, min(workers, len(jobs)))
+    if len(jobs) == 0:
+        return 0
+    written = 0
+    t0 = time.perf_counter()
+    with open(output, 'a') as f:
+        if workers == 1:
+            records = map(run_job, jobs)
+            pool = None
+        else:
+            pool = mp.get_context(start_method).Pool(workers)
+            records = pool.imap_unordered(run_job, jobs)
+        try:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                written = written + 1
+                if report is not None:
+                    status = "ERROR " + record['error'].strip().splitlines()[-1] if 'error' in record else \
+                        record['stop_reason'] + " " + str(record['best_eval'])
+                    report("[" + str(written) + "/" + str(len(jobs)) + "] " + record['id'] + ": " + status +
+                           " (" + str(round(time.perf_counter() - t0, 1)) + " s)")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    return written
+
+
+def summarize(output):
+    # per (problem, setting): runs, errors, converged, best, median and
+    # mean best_eval, mean iterations and elapsed time
+    groups = {}
+    with open(output) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            groups.setdefault((record['problem'], record['setting']), []).append(record)
+    summary = []
+    for (problem, setting), records in sorted(groups.items()):
+        ok = [r for r in records if 'error' not in r]
+        evals = np.array([float(r['best_eval']) for r in ok])
+        summary.append({'problem': problem, 'setting': setting, 'runs': len(records),
+                        'errors': len(records) - len(ok),
+                        'converged': sum(1 for r in ok if r['stop_reason'] == 'converged'),
+                        'best': float(np.min(evals)) if len(ok) > 0 else None,
+                        'median': float(np.median(evals)) if len(ok) > 0 else None,
+                        'mean': float(np.mean(evals)) if len(ok) > 0 else None,
+                        'mean_iterations': float(np.mean([r['iterations'] for r in ok])) if len(ok) > 0 else None,
+                        'mean_elapsed': float(np.mean([r['elapsed'] for r in ok])) if len(ok) > 0 else None})
+    return summary
+
+
+def print_summary(summary):
+    for row in summary:
+        print(row['problem'] + " / " + row['setting'] + ": " + str(row['runs']) + " runs, " +
+              str(row['errors']) + " errors, " + str(row['converged']) + " converged")
+        if row['best'] is not None:
+            print("    best eval " + str(row['best']) + ", median " + str(row['median']) +
+                  ", mean " + str(row['mean']))
+            print("    mean iterations " + str(round(row['mean_iterations'], 1)) +
+                  ", mean time " + str(round(row['mean_elapsed'], 3)) + " s")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="run problems x settings x seeds across a process pool")
+    parser.add_argument('jobs', nargs='?', help="job file (JSON)")
+    parser.add_argument('output', nargs='?', help="output file, one JSON line per run")
+    parser.add_argument('--workers', type=int, default=None, help="processes. Default: one per CPU")
+    parser.add_argument('--resume', action='store_true', help="skip runs already in the output file")
+    parser.add_argument('--problems', default=SRC_DIR, help="directory of the problem packages")
+    parser.add_argument('--list', action='store_true', help="list the problem packages and exit")
+    parser.add_argument('--summary', metavar='OUTPUT', help="summarize an output file and exit")
+    args = parser.parse_args()
+    root = os.path.abspath(args.problems)
+
+    if args.list:
+        for name, info in discover_problems(root).items():
+            print(name + ": IN_VARS=" + str(info['IN_VARS']) + ", OUT_VARS=" + str(info['OUT_VARS']))
+        sys.exit(0)
+    if args.summary is not None:
+        print_summary(summarize(args.summary))
+        sys.exit(0)
+    if (args.jobs is None) or (args.output is None):
+        parser.error("JOBS and OUTPUT are required")
+
+    with open(args.jobs) as f:
+        spec = json.load(f)
+    try:
+        jobs = expand_jobs(spec, root)
+    except ValueError as e:
+        print("ERROR: " + str(e))
+        sys.exit(1)
+    print(str(len(jobs)) + " runs")
+    run_jobs(jobs, args.output, args.workers, args.resume)
+    print_summary(summarize(args.output))
@@ -0,0 +1,245 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/run_record.py'
+#   Record and replay of optimizer runs. RecordingObjective wraps an
+#       objective function and logs every (position, Fvals, noError)
+#       result. ReplayObjective stands in for the objective function
+#       and returns the recorded results in order, checking that the
+#       swarm asks for the same positions. With the recorded SEED the
+#       replay follows the original trajectory at optimizer speed.
+#       RecordingEvaluator/ReplayEvaluator do the same for parallel
+#       generations, including the order results arrived in.
+#
+#       Recordings are .npz archives readable by warm_start.py
+#       (positions, Fvals, noError), plus 'seed', and for evaluator
+#       recordings the poll() 'batch' and particle 'key' of each result.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+
+
+class ReplayMismatchError(ValueError):
+    # the swarm asked for a different position than the recording has
+    pass
+
+
+def _same_position(X, recorded, atol):
+    if np.shape(X) != np.shape(recorded):
+        return False
+    if atol == 0:
+        return np.array_equal(X, recorded)
+    return float(np.max(np.abs(X - recorded))) <= atol
+
+
+def save_recording(filename, positions, Fvals, noError, seed=None, batch=None, keys=None):
+    positions = np.array(positions, dtype=float).reshape(len(positions), -1)
+    Fvals = np.array(Fvals, dtype=float).reshape(len(positions), -1)
+    if batch is None:
+        batch = np.arange(len(positions))
+    if keys is None:
+        keys = -np.ones(len(positions), dtype=np.int64)
+    # seed entropy can be wider than 64 bits. Stored as text
+    np.savez(filename, positions=positions, Fvals=Fvals,
+             noError=np.array(noError, dtype=bool),
+             batch=np.array(batch, dtype=np.int64),
+             keys=np.array(keys, dtype=np.int64),
+             seed=np.array('' if seed is None else str(seed)))
+
+
+def load_recording(filename):
+    # returns (positions, Fvals, noError, seed, batch, keys).
+    # keys are -1 for serial recordings
+    data = np.load(filename)
+    positions = data['positions']
+    Fvals = data['Fvals']
+    noError = data['noError'] if 'noError' in data else np.ones(len(positions), dtype=bool)
+    batch = data['batch'] if 'batch' in data else np.arange(len(positions))
+    keys = data['keys'] if 'keys' in data else -np.ones(len(positions), dtype=np.int64)
+    seed = None
+    if ('seed' in data) and (str(data['seed']) != ''):
+        seed = int(str(data['seed']))
+    return positions, Fvals, noError, seed, batch, keys
+
+
+class RecordingObjective:
+    # drop-in objective function: obj_func(X, NO_OF_OUTS) -> (Fvals, noError)
+    def __init__(self, obj_func):
+        self.obj_func = obj_func
+        self.positions = []
+        self.Fvals = []
+        self.noError = []
+
+    def __call__(self, X, NO_OF_OUTS):
+        Fvals, noError = self.obj_func(X, NO_OF_OUTS)
+        self.positions.append(np.array(X, dtype=float).reshape(-1))
+        self.Fvals.append(np.array(Fvals, dtype=float).reshape(-1))
+        self.noError.append(bool(noError))
+        return Fvals, noError
+
+    def __len__(self):
+        return len(self.positions)
+
+    def save(self, filename, seed=None):
+        # seed: the swarm's seed (myOptimizer.seed), needed for the replay
+        save_recording(filename, self.positions, self.Fvals, self.noError, seed)
+
+
+class ReplayObjective:
+    # drop-in objective function returning recorded results.
+    # atol: allowed difference between the requested and recorded
+    # positions. 0 (default) requires an exact match.
+    def __init__(self, positions, Fvals, noError=None, seed=None, atol=0.0):
+        self.positions = np.array(positions, dtype=float).reshape(len(positions), -1)
+        self.Fvals = np.array(Fvals, dtype=float).reshape(len(self.positions), -1)
+        if noError is None:
+            noError = np.ones(len(self.positions), dtype=bool)
+        self.noError = np.array(noError, dtype=bool)
+        self.seed = seed
+        self.atol = float(atol)
+        self.index = 0
+
+    @classmethod
+    def from_file(cls, filename, atol=0.0):
+        positions, Fvals, noError, seed, batch, keys = load_recording(filename)
+        return cls(positions, Fvals, noError, seed, atol)
+
+    def _check(self, X, index):
+        if index >= len(self.positions):
+            raise ReplayMismatchError("replay ran past the end of the recording ("
+                                      + str(len(self.positions)) + " evaluations)")
+        X = np.ravel(X)
+        recorded = self.positions[index]
+        if not _same_position(X, recorded, self.atol):
+            raise ReplayMismatchError("trajectory diverged at evaluation " + str(index)
+                                      + ": requested " + str(X) + ", recorded " + str(recorded))
+
+    def __call__(self, X, NO_OF_OUTS):
+        self._check(X, self.index)
+        index = self.index
+        self.index = self.index + 1
+        return np.array(self.Fvals[index]), bool(self.noError[index])
+
+    def finished(self):
+        # True once every recorded evaluation has been replayed
+        return self.index == len(self.positions)
+
+
+class RecordingEvaluator:
+    # wraps an evaluator (ParallelEvaluator, EvalBroker) and records
+    # results in the order they were returned by poll()
+    def __init__(self, evaluator):
+        self.evaluator = evaluator
+        self.submitted = {}
+        self.positions = []
+        self.Fvals = []
+        self.noError = []
+        self.batch = []
+        self.keys = []
+        self.polls = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, key, position):
+        self.submitted[key] = np.array(position, dtype=float).reshape(-1)
+        return self.evaluator.submit(key, position)
+
+    def poll(self, wait=None):
+        results = self.evaluator.poll(wait)
+        for key, Fvals, noError, duration in results:
+            self.positions.append(self.submitted.pop(key))
+            self.Fvals.append(np.array(Fvals, dtype=float).reshape(-1))
+            self.noError.append(bool(noError))
+            self.batch.append(self.polls)
+            self.keys.append(key)
+        if len(results) > 0:
+            self.polls = self.polls + 1
+        return results
+
+    def pending(self):
+        return self.evaluator.pending()
+
+    def close(self):
+        self.evaluator.close()
+
+    def save(self, filename, seed=None):
+        save_recording(filename, self.positions, self.Fvals, self.noError, seed,
+                       self.batch, self.keys)
+
+
+class ReplayEvaluator:
+    # evaluator returning recorded results, one recorded poll() batch at
+    # a time, so quorum decisions and update order match the original run.
+    # Keys are the particle indices passed to submit()
+    def __init__(self, positions, Fvals, noError=None, seed=None, batch=None,
+                 keys=None, atol=0.0):
+        self.replay = ReplayObjective(positions, Fvals, noError, seed, atol)
+        if batch is None:
+            batch = np.arange(len(self.replay.positions))
+        if keys is None:
+            keys = -np.ones(len(self.replay.positions), dtype=np.int64)
+        self.batch = np.array(batch, dtype=np.int64)
+        self.keys = np.array(keys, dtype=np.int64)
+        self.seed = seed
+        self.submitted = {}
+
+    @classmethod
+    def from_file(cls, filename, atol=0.0):
+        positions, Fvals, noError, seed, batch, keys = load_recording(filename)
+        return cls(positions, Fvals, noError, seed, batch, keys, atol)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, key, position):
+        self.submitted[key] = np.array(position, dtype=float).reshape(-1)
+        return key
+
+    def poll(self, wait=None):
+        replay = self.replay
+        if replay.index >= len(replay.positions):
+            if len(self.submitted) > 0:
+                raise ReplayMismatchError("replay ran past the end of the recording ("
+                                          + str(len(replay.positions)) + " evaluations)")
+            return []
+        results = []
+        current = self.batch[replay.index]
+        while (replay.index < len(replay.positions)) and (self.batch[replay.index] == current):
+            key = int(self.keys[replay.index])
+            if key < 0:
+                # serial recording. The result belongs to whichever
+                # submitted particle asked for the recorded position
+                recorded = replay.positions[replay.index]
+                for k, position in self.submitted.items():
+                    if _same_position(position, recorded, replay.atol):
+                        key = k
+                        break
+            if key not in self.submitted:
+                raise ReplayMismatchError("trajectory diverged at evaluation " + str(replay.index)
+                                          + ": recorded position " + str(replay.positions[replay.index])
+                                          + " was not submitted")
+            replay._check(self.submitted.pop(key), replay.index)
+            results.append((key, np.array(replay.Fvals[replay.index]),
+                            bool(replay.noError[replay.index]), 0.0))
+            replay.index = replay.index + 1
+        return results
+
+    def pending(self):
+        return len(self.submitted)
+
+    def finished(self):
+        return self.replay.finished()
+
+    def close(self):
+        pass
@@ -0,0 +1,143 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/shared_state.py'
+#   Shared-memory storage for the core 'swarm' arrays. When the swarm
+#       is created with SHARED_MEMORY enabled, M, V, Pb, F_Pb, and
+#       Active are views into one multiprocessing.shared_memory block.
+#       Evaluator workers and out-of-process monitors attach to the
+#       block by name and read/write the arrays in place.
+#
+#       Block layout (little-endian, C order, no padding):
+#           offset 0     int64[8]      header: magic, version, N, D, O, 0, 0, 0
+#           then         float64[N,D]  M       particle positions
+#                        float64[N,D]  V       particle velocities
+#                        float64[N,D]  Pb      personal best positions
+#                        float64[N,O]  F_Pb    personal best fitness (Flist)
+#                        float64[N]    Active  1.0 active, 0.0 inactive
+#                        float64[N,O]  Fvals   raw results written by evaluators
+#                        float64[N]    status  evaluation status per particle
+#       N = particles, D = input variables, O = output variables.
+#       status values are EVAL_IDLE, EVAL_REQUESTED, EVAL_DONE, EVAL_ERROR.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import sys
+import weakref
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+SHARED_MAGIC = 0x50534F53   # 'PSOS'
+SHARED_VERSION = 1
+_HEADER_SLOTS = 8
+
+EVAL_IDLE = 0.0
+EVAL_REQUESTED = 1.0
+EVAL_DONE = 2.0
+EVAL_ERROR = 3.0
+
+# tracker names of the blocks created by this process
+_owned = set()
+
+
+def _layout(N, D, O):
+    # (name, shape) in block order
+    return [('M', (N, D)),
+            ('V', (N, D)),
+            ('Pb', (N, D)),
+            ('F_Pb', (N, O)),
+            ('Active', (N,)),
+            ('Fvals', (N, O)),
+            ('status', (N,))]
+
+
+def _unlink_block(shm):
+    # owner cleanup. Run by close(), or when the owner is garbage collected
+    # or the interpreter exits without close(), e.g. after a failed run.
+    # Array views may still use the mapping, so only the name is removed
+    _owned.discard(shm._name)
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def block_size(N, D, O):
+    size = _HEADER_SLOTS*8
+    for name, shape in _layout(N, D, O):
+        size = size + 8*int(np.prod(shape))
+    return size
+
+
+class SharedSwarmState:
+    # use create() in the optimizer process and attach() everywhere else.
+    # The creating process owns the block. Its close() also unlinks the
+    # block, so it does not stay in /dev/shm after the run. The block is
+    # also unlinked if the owner is dropped or the process exits without
+    # close(). Both can be used as context managers.
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((_HEADER_SLOTS,), dtype='<i8', buffer=shm.buf, offset=0)
+        if (int(self.header[0]) != SHARED_MAGIC) or (int(self.header[1]) != SHARED_VERSION):
+            raise ValueError("shared memory block '" + shm.name + "' is not a swarm state block")
+        self.N, self.D, self.O = [int(v) for v in self.header[2:5]]
+
+        offset = _HEADER_SLOTS*8
+        for name, shape in _layout(self.N, self.D, self.O):
+            arr = np.ndarray(shape, dtype='<f8', buffer=shm.buf, offset=offset)
+            setattr(self, name, arr)
+            offset = offset + arr.nbytes
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def create(cls, N, D, O, name=None):
+        shm = shared_memory.SharedMemory(name=name, create=True, size=block_size(N, D, O))
+        header = np.ndarray((_HEADER_SLOTS,), dtype='<i8', buffer=shm.buf, offset=0)
+        header[:] = [SHARED_MAGIC, SHARED_VERSION, N, D, O, 0, 0, 0]
+        del header
+        _owned.add(shm._name)
+        state = cls(shm, owner=True)
+        state.status[:] = EVAL_IDLE
+        state._finalizer = weakref.finalize(state, _unlink_block, shm)
+        return state
+
+    @classmethod
+    def attach(cls, name, untrack=True):
+        # attaching processes do not own the block. Their resource tracker
+        # must not unlink it when they exit.
+        # untrack: False for child processes of the owner. They share its
+        #          resource tracker, where the block is already registered
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # older versions always register the block. Unregister this
+            # segment only, unless that would drop the owner's registration
+            shm = shared_memory.SharedMemory(name=name)
+            if untrack and (shm._name not in _owned):
+                resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm, owner=False)
+
+    def close(self):
+        # drop the array views before closing the mapping. The owner also
+        # unlinks the block
+        if self.header is None:
+            return
+        for name, shape in _layout(self.N, self.D, self.O):
+            setattr(self, name, None)
+        self.header = None
+        self.shm.close()
+        if self.owner:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
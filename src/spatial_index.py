@@ -0,0 +1,267 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/spatial_index.py'
+#   Nearest-neighbor index over evaluated points, for the 'swarm' class.
+#       Distances are Euclidean, in coordinates normalized to [0, 1] by
+#       lbound/ubound, so one tolerance works for every dimension.
+#       Supports near-duplicate lookups (find_duplicate), k-nearest
+#       neighbors (nearest, e.g. for surrogates), and radius queries
+#       (within, count_within, e.g. for density and diversity measures).
+#
+#       Points are added incrementally. New points go to a small buffer
+#       that is searched directly. When the buffer is full it is merged
+#       with the static k-d trees of the same or smaller size into one new
+#       tree (the logarithmic method), so there are at most log2(n) trees
+#       and every point is rebuilt O(log n) times. Inserts are amortized
+#       O(log^2 n), and queries visit O(log n) trees.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+
+
+class _KDTree:
+    # static k-d tree over a block of normalized points. Nodes are kept in
+    # flat arrays, and each leaf is a contiguous range of self.points
+    def __init__(self, points, ids, leaf_size):
+        self.leaf_size = int(leaf_size)
+        self.lo = []
+        self.hi = []
+        self.start = []
+        self.end = []
+        self.left = []
+        self.right = []
+        order = np.arange(len(ids))
+        self._build(points, order, 0, len(ids))
+        self.points = points[order]
+        self.ids = ids[order]
+        self.lo = np.array(self.lo)
+        self.hi = np.array(self.hi)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _build(self, points, order, start, end):
+        node = len(self.start)
+        block = points[order[start:end]]
+        lo = np.min(block, axis=0)
+        hi = np.max(block, axis=0)
+        self.lo.append(lo)
+        self.hi.append(hi)
+        self.start.append(start)
+        self.end.append(end)
+        self.left.append(-1)
+        self.right.append(-1)
+        if end - start > self.leaf_size:
+            # split the widest dimension at the median. Identical points
+            # (no spread) stay in one leaf
+            spread = hi - lo
+            dim = int(np.argmax(spread))
+            if spread[dim] > 0:
+                mid = (end - start)//2
+                part = np.argpartition(block[:, dim], mid)
+                order[start:end] = order[start:end][part]
+                self.left[node] = self._build(points, order, start, start + mid)
+                self.right[node] = self._build(points, order, start + mid, end)
+        return node
+
+    def box_distance(self, node, x):
+        # squared distance from x to the bounding box of a node
+        d = np.maximum(self.lo[node] - x, 0.0) + np.maximum(x - self.hi[node], 0.0)
+        return float(d @ d)
+
+    def nearest(self, x, k, best_d2, best_ids):
+        # merges this tree's k nearest points into (best_d2, best_ids)
+        stack = [(0, self.box_distance(0, x))]
+        while len(stack) > 0:
+            node, box_d2 = stack.pop()
+            if (len(best_d2) >= k) and (box_d2 > best_d2[-1]):
+                continue
+            if self.left[node] < 0:
+                s, e = self.start[node], self.end[node]
+                diff = self.points[s:e] - x
+                d2 = np.einsum('ij,ij->i', diff, diff)
+                best_d2 = np.concatenate([best_d2, d2])
+                best_ids = np.concatenate([best_ids, self.ids[s:e]])
+                keep = np.argsort(best_d2, kind='stable')[:k]
+                best_d2 = best_d2[keep]
+                best_ids = best_ids[keep]
+                continue
+            l, r = self.left[node], self.right[node]
+            dl, dr = self.box_distance(l, x), self.box_distance(r, x)
+            # the nearer child is searched first
+            if dl <= dr:
+                stack.append((r, dr))
+                stack.append((l, dl))
+            else:
+                stack.append((l, dl))
+                stack.append((r, dr))
+        return best_d2, best_ids
+
+    def within(self, x, r2, count_only=False):
+        # (ids, squared distances) of the points within r2 of x, or the
+        # number of them. Nodes entirely inside the ball are counted
+        # without computing distances
+        ids = []
+        d2s = []
+        count = 0
+        stack = [0]
+        while len(stack) > 0:
+            node = stack.pop()
+            if self.box_distance(node, x) > r2:
+                continue
+            s, e = self.start[node], self.end[node]
+            if count_only:
+                far = np.maximum(np.abs(x - self.lo[node]), np.abs(x - self.hi[node]))
+                if float(far @ far) <= r2:
+                    count = count + (e - s)
+                    continue
+            if self.left[node] < 0:
+                diff = self.points[s:e] - x
+                d2 = np.einsum('ij,ij->i', diff, diff)
+                inside = d2 <= r2
+                if count_only:
+                    count = count + int(np.count_nonzero(inside))
+                else:
+                    ids.append(self.ids[s:e][inside])
+                    d2s.append(d2[inside])
+                continue
+            stack.append(self.left[node])
+            stack.append(self.right[node])
+        if count_only:
+            return count
+        if len(ids) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        return np.concatenate(ids), np.concatenate(d2s)
+
+
+class EvaluationIndex:
+    # lbound, ubound:  bounds of the search space, for the normalization
+    # leaf_size:       points per k-d tree leaf
+    # buffer_size:     points kept in the unsorted buffer before a merge
+    # Each point gets an integer id, in insertion order, and can carry a
+    # value (e.g. the Fvals of the evaluation)
+    def __init__(self, lbound, ubound, leaf_size=32, buffer_size=512):
+        self.lbound = np.ravel(np.asarray(lbound, dtype=float))
+        self.ubound = np.ravel(np.asarray(ubound, dtype=float))
+        width = self.ubound - self.lbound
+        self.scale = np.where(width > 0, width, 1.0)
+        self.leaf_size = max(1, int(leaf_size))
+        self.buffer_size = max(1, int(buffer_size))
+        self.clear()
+
+    def clear(self):
+        dims = len(self.lbound)
+        self.positions = np.zeros((64, dims))
+        self.values = []
+        self.count = 0
+        self.trees = []
+        self.buffer_start = 0
+
+    def __len__(self):
+        return self.count
+
+    def normalize(self, X):
+        return (np.asarray(X, dtype=float) - self.lbound)/self.scale
+
+    def insert(self, position, value=None):
+        # returns the id of the new point
+        return int(self.insert_many(np.reshape(position, (1, -1)), [value])[0])
+
+    def insert_many(self, positions, values=None):
+        positions = np.atleast_2d(np.asarray(positions, dtype=float))
+        n = len(positions)
+        if values is None:
+            values = [None]*n
+        if self.count + n > len(self.positions):
+            capacity = max(2*len(self.positions), self.count + n)
+            grown = np.zeros((capacity, np.shape(self.positions)[1]))
+            grown[:self.count] = self.positions[:self.count]
+            self.positions = grown
+        ids = np.arange(self.count, self.count + n)
+        self.positions[ids] = positions
+        self.values.extend(values)
+        self.count = self.count + n
+        if self.count - self.buffer_start >= self.buffer_size:
+            self._merge()
+        return ids
+
+    def _merge(self):
+        # the buffer and every tree no larger than the result so far
+        # become one new tree
+        ids = np.arange(self.buffer_start, self.count)
+        while (len(self.trees) > 0) and (len(self.trees[-1]) <= len(ids)):
+            ids = np.concatenate([self.trees.pop().ids, ids])
+        self.trees.append(_KDTree(self.normalize(self.positions[ids]), ids, self.leaf_size))
+        self.buffer_start = self.count
+
+    def position(self, i):
+        return np.array(self.positions[i])
+
+    def value(self, i):
+        return self.values[i]
+
+    def _buffer_d2(self, x):
+        diff = self.normalize(self.positions[self.buffer_start:self.count]) - x
+        return np.einsum('ij,ij->i', diff, diff)
+
+    def nearest(self, X, k=1):
+        # (ids, distances) of the k nearest points to X, nearest first
+        x = self.normalize(np.ravel(X))
+        k = int(k)
+        d2 = self._buffer_d2(x)
+        keep = np.argsort(d2, kind='stable')[:k]
+        best_d2 = d2[keep]
+        best_ids = np.arange(self.buffer_start, self.count)[keep]
+        for tree in reversed(self.trees):
+            best_d2, best_ids = tree.nearest(x, k, best_d2, best_ids)
+        return best_ids, np.sqrt(best_d2)
+
+    def within(self, X, radius):
+        # (ids, distances) of all points within radius of X, nearest first
+        x = self.normalize(np.ravel(X))
+        r2 = float(radius)**2
+        d2 = self._buffer_d2(x)
+        inside = d2 <= r2
+        ids = [np.arange(self.buffer_start, self.count)[inside]]
+        d2s = [d2[inside]]
+        for tree in self.trees:
+            tree_ids, tree_d2 = tree.within(x, r2)
+            ids.append(tree_ids)
+            d2s.append(tree_d2)
+        ids = np.concatenate(ids)
+        d2 = np.concatenate(d2s)
+        order = np.argsort(d2, kind='stable')
+        return ids[order], np.sqrt(d2[order])
+
+    def count_within(self, X, radius):
+        # number of points within radius of X. A density measure
+        x = self.normalize(np.ravel(X))
+        r2 = float(radius)**2
+        count = int(np.count_nonzero(self._buffer_d2(x) <= r2))
+        for tree in self.trees:
+            count = count + tree.within(x, r2, count_only=True)
+        return count
+
+    def find_duplicate(self, X, eps):
+        # id of the nearest point within eps of X, or None
+        if self.count == 0:
+            return None
+        ids, dist = self.nearest(X, 1)
+        if (len(ids) > 0) and (dist[0] <= eps):
+            return int(ids[0])
+        return None
+
+    def get_state(self):
+        return {'positions': np.array(self.positions[:self.count]), 'values': list(self.values)}
+
+    def set_state(self, state):
+        self.clear()
+        if len(state['positions']) > 0:
+            self.insert_many(state['positions'], list(state['values']))
+            if self.count > self.buffer_start:
+                self._merge()
@@ -0,0 +1,137 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/swarm_adapt.py'
+#   Online adaptation of the WEIGHTS (inertia, cognitive, social) and
+#       T_MOD of the 'swarm' class. The swarm reports whether each update
+#       improved the particle's personal best, and calls update() after
+#       every sweep (or generation). Strategies:
+#           LINEAR   weights move linearly from WEIGHTS to the final weights
+#                    over the run (maxit)
+#           SUCCESS  inertia follows the success rate of the last sweep,
+#                    between the lower and upper limits
+#           SELF     each particle has its own weights. After an update
+#                    that did not improve its personal best, the particle's
+#                    weights are mutated (log-normal); successful weights
+#                    are kept
+#           NONE     weights are not changed. For adapting only T_MOD
+#       With adapt_t_mod, T_MOD follows a smoothed success rule: the time
+#       step grows while the success rate, averaged over the last few
+#       sweeps, is above target_rate, and shrinks while it is below. Each
+#       update also pulls log(T_MOD) part of the way back toward the
+#       starting T_MOD, so T_MOD settles where the two balance (between
+#       about 0.1x and 2.5x the starting value) instead of stepping to a
+#       limit after a run of equal sweeps. The target is 0.3 rather than
+#       the 1/5 of evolution strategies: personal-best updates succeed
+#       more often, typically 0.3 to 0.9 of a sweep on the bundled problems.
+#       Every update is recorded in 'history', and get_state()/set_state()
+#       are used for checkpoints.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+
+ADAPT_STRATEGIES = ['NONE', 'LINEAR', 'SUCCESS', 'SELF']
+
+
+class ParameterAdapter:
+    # strategy:       one of ADAPT_STRATEGIES
+    # weights:        starting [inertia, cognitive, social]
+    # final_weights:  LINEAR end point. Default [0.4, 0.5, 1.5] times weights
+    # limits:         [[lower x3], [upper x3]]. Default 0.2 and 2 times weights
+    # rng:            numpy Generator, for SELF mutations
+    # target_rate:    success rate at which T_MOD is left alone
+    def __init__(self, strategy, weights, T_MOD, particles, final_weights=None,
+                 limits=None, adapt_t_mod=False, rng=None, target_rate=0.3):
+        self.strategy = str(strategy).upper()
+        if self.strategy not in ADAPT_STRATEGIES:
+            raise ValueError("unrecognized adaptation strategy '" + str(strategy) + "'")
+        self.initial = np.array(weights, dtype=float).reshape(-1)[:3]
+        if final_weights is None:
+            self.final = self.initial*np.array([0.4, 0.5, 1.5])
+        else:
+            self.final = np.array(final_weights, dtype=float).reshape(-1)[:3]
+        if limits is None:
+            self.lower = 0.2*self.initial
+            self.upper = 2.0*self.initial
+        else:
+            self.lower = np.array(limits[0], dtype=float).reshape(-1)[:3]
+            self.upper = np.array(limits[1], dtype=float).reshape(-1)[:3]
+        self.T_MOD0 = float(T_MOD)
+        self.adapt_t_mod = bool(adapt_t_mod)
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.mutation = 0.2
+        self.target_rate = float(target_rate)
+        # per update: change of log(T_MOD) per unit of rate error, and the
+        # fraction of log(T_MOD/T_MOD0) given back
+        self.t_mod_gain = 0.3
+        self.t_mod_decay = 0.1
+        # success rate smoothed over the last few updates. None before the first
+        self.rate_avg = None
+
+        # per-particle weights. The same row for every particle except with SELF
+        self.weights = np.tile(self.initial, (int(particles), 1))
+        self.success = np.zeros(int(particles))
+        self.trials = np.zeros(int(particles))
+        # (iteration, inertia, cognitive, social, T_MOD, success rate) per update
+        self.history = []
+
+    def record(self, particle, improved):
+        self.trials[particle] = self.trials[particle] + 1
+        if improved:
+            self.success[particle] = self.success[particle] + 1
+        elif self.strategy == 'SELF':
+            w = self.weights[particle]*np.exp(self.mutation*self.rng.standard_normal(3))
+            self.weights[particle] = np.clip(w, self.lower, self.upper)
+
+    def success_rate(self):
+        trials = np.sum(self.trials)
+        return np.sum(self.success)/trials if trials > 0 else 0.0
+
+    def update(self, progress, T_MOD, iteration):
+        # progress: fraction of the run used, 0 to 1.
+        # Returns the swarm-wide weights (the mean with SELF) and T_MOD
+        rate = self.success_rate()
+        if self.strategy == 'LINEAR':
+            self.weights[:] = self.initial + (self.final - self.initial)*min(max(progress, 0.0), 1.0)
+        elif self.strategy == 'SUCCESS':
+            self.weights[:, 0] = self.lower[0] + (self.upper[0] - self.lower[0])*rate
+
+        if self.adapt_t_mod and (np.sum(self.trials) > 0):
+            # one sweep is a few particles, so the rate is smoothed first.
+            # Larger T_MOD means a smaller time step
+            if self.rate_avg is None:
+                self.rate_avg = rate
+            else:
+                self.rate_avg = 0.7*self.rate_avg + 0.3*rate
+            log_t = np.log(T_MOD/self.T_MOD0)
+            log_t = (1.0 - self.t_mod_decay)*log_t - self.t_mod_gain*(self.rate_avg - self.target_rate)
+            T_MOD = self.T_MOD0*float(np.exp(log_t))
+            T_MOD = min(max(T_MOD, 0.1*self.T_MOD0), 10.0*self.T_MOD0)
+
+        weights = np.mean(self.weights, axis=0)
+        self.history.append([int(iteration), float(weights[0]), float(weights[1]),
+                             float(weights[2]), float(T_MOD), float(rate)])
+        self.success[:] = 0
+        self.trials[:] = 0
+        return weights, T_MOD
+
+    def get_state(self):
+        return {'weights': self.weights.tolist(), 'success': self.success.tolist(),
+                'trials': self.trials.tolist(), 'history': [list(h) for h in self.history],
+                'rate_avg': self.rate_avg, 'rng': self.rng.bit_generator.state}
+
+    def set_state(self, state):
+        weights = np.array(state['weights'], dtype=float)
+        if np.shape(weights) != np.shape(self.weights):
+            return False
+        self.weights = weights
+        self.success = np.array(state['success'], dtype=float)
+        self.trials = np.array(state['trials'], dtype=float)
+        self.history = [list(h) for h in state['history']]
+        self.rate_avg = state.get('rate_avg', None)
+        self.rng.bit_generator.state = state['rng']
+        return True
@@ -0,0 +1,101 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/swarm_constraints.py'
+#   Bounded-time constraint handling for the 'swarm' class.
+#       FeasiblePool keeps a stock of feasible points, sampled uniformly
+#       inside the bounds in batches and filtered with the constraint
+#       function. Particles that need a reset draw from the pool instead
+#       of resampling one point at a time in an open-ended loop. If no
+#       feasible point turns up within the attempt cap, ConstraintError
+#       is raised. Constraint specs with linear rows (constraint_spec.py)
+#       are sampled inside their polytope instead of the whole box.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+from swarm_init import feasibility_mask
+
+CONSTRAINT_MODES = ['RESAMPLE', 'PENALTY']
+
+
+class ConstraintError(RuntimeError):
+    # no feasible point could be found within the attempt cap
+    pass
+
+
+def binary_violation(constr_func):
+    # default violation degree for PENALTY mode: 0 if feasible, 1 if not
+    def violation(X):
+        return 0.0 if constr_func(X) else 1.0
+    return violation
+
+
+class FeasiblePool:
+    # constr_func:  constraint function, X -> bool
+    # size:         number of feasible points kept in the pool
+    # batch_size:   candidates sampled and checked per batch
+    # max_batches:  batches tried per fill before ConstraintError is raised
+    def __init__(self, constr_func, lbound, ubound, decimals, rng,
+                 size=256, batch_size=None, max_batches=100):
+        self.constr_func = constr_func
+        self.lbound = np.asarray(lbound, dtype=float)
+        self.ubound = np.asarray(ubound, dtype=float)
+        self.decimals = int(decimals)
+        self.rng = rng
+        self.size = int(size)
+        self.batch_size = max(self.size, 64) if batch_size is None else int(batch_size)
+        self.max_batches = int(max_batches)
+        self.points = np.empty((0, len(self.lbound)))
+        # acceptance rate of the last fill, for reporting
+        self.acceptance = None
+
+    def __len__(self):
+        return len(self.points)
+
+    def fill(self):
+        # top the pool up to 'size' feasible points
+        variation = self.ubound - self.lbound
+        found = [self.points]
+        count = len(self.points)
+        sampled = 0
+        accepted = 0
+        for b in range(0, self.max_batches):
+            if count >= self.size:
+                break
+            if hasattr(self.constr_func, 'sample') and (self.constr_func.A is not None):
+                # linear constraint spec. Sample inside the polytope directly
+                batch = np.round(self.constr_func.sample(self.rng, self.batch_size,
+                                                         self.lbound, self.ubound), self.decimals)
+            else:
+                batch = np.round(self.rng.random((self.batch_size, len(self.lbound)))*variation
+                                 + self.lbound, self.decimals)
+            feasible = feasibility_mask(self.constr_func, batch)
+            found.append(batch[feasible])
+            count = count + int(np.sum(feasible))
+            sampled = sampled + self.batch_size
+            accepted = accepted + int(np.sum(feasible))
+        if sampled > 0:
+            self.acceptance = accepted/sampled
+        self.points = np.concatenate(found)[:self.size]
+        if len(self.points) == 0:
+            raise ConstraintError("no feasible point found in " + str(sampled) +
+                                  " samples inside the bounds. The feasible region may be empty or very small. "
+                                  "Check constr_func, or use CONSTRAINT_MODE 'PENALTY'.")
+
+    def refresh(self):
+        # discard the stored points and resample, e.g. after the
+        # constraints or bounds change
+        self.points = np.empty((0, len(self.lbound)))
+        self.fill()
+
+    def draw(self):
+        # one feasible point. The pool is refilled when it runs out
+        if len(self.points) == 0:
+            self.fill()
+        point = self.points[-1]
+        self.points = self.points[:-1]
+        return np.array(point)
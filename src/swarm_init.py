@@ -0,0 +1,182 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/swarm_init.py'
+#   Vectorized initial position sampling for the 'swarm' class.
+#       Provides uniform, Latin hypercube, Sobol, and Halton sampling
+#       of the bounded search space, and optional batched rejection
+#       of points that fail the constraint function.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+
+INIT_STRATEGIES = ['UNIFORM', 'LHS', 'SOBOL', 'HALTON']
+
+# Sobol direction numbers (Joe & Kuo, new-joe-kuo-6.21201) for dimensions
+# 2 through 21. Each entry is (s, a, [m_1, ..., m_s]). Dimension 1 uses
+# m_k = 1 for every k. Higher dimensions fall back to Halton sampling.
+_SOBOL_DIRECTIONS = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+    (6, 1, [1, 3, 3, 9, 7, 49]),
+    (6, 13, [1, 1, 1, 15, 21, 21]),
+    (6, 16, [1, 3, 1, 13, 27, 49]),
+    (6, 19, [1, 1, 1, 15, 7, 5]),
+    (6, 22, [1, 3, 1, 15, 13, 25]),
+    (6, 25, [1, 1, 5, 5, 19, 61]),
+    (7, 1, [1, 3, 7, 11, 23, 15, 103]),
+    (7, 4, [1, 3, 7, 13, 13, 15, 69]),
+]
+SOBOL_MAX_DIM = len(_SOBOL_DIRECTIONS) + 1
+_SOBOL_BITS = 32
+
+
+def _sobol_direction_table(dims):
+    # V[d, k] is the k-th direction number of dimension d, scaled to 32 bits
+    V = np.zeros((dims, _SOBOL_BITS), dtype=np.uint64)
+    for k in range(0, _SOBOL_BITS):
+        V[0, k] = 1 << (_SOBOL_BITS - 1 - k)
+    for d in range(1, dims):
+        s, a, m = _SOBOL_DIRECTIONS[d-1]
+        for k in range(0, _SOBOL_BITS):
+            if k < s:
+                V[d, k] = m[k] << (_SOBOL_BITS - 1 - k)
+            else:
+                v = V[d, k-s] ^ (V[d, k-s] >> s)
+                for j in range(1, s):
+                    if (a >> (s - 1 - j)) & 1:
+                        v = v ^ V[d, k-j]
+                V[d, k] = v
+    return V
+
+
+def sobol_samples(rng, n, dims, scramble=True):
+    # points 0..n-1 of the Sobol sequence, computed directly from the
+    # gray code of each index. A random digital shift keeps the net
+    # structure while giving a different point set every run.
+    if dims > SOBOL_MAX_DIM:
+        return halton_samples(rng, n, dims, scramble=scramble)
+    V = _sobol_direction_table(dims)
+    idx = np.arange(n, dtype=np.uint64)
+    gray = idx ^ (idx >> np.uint64(1))
+    X = np.zeros((n, dims), dtype=np.uint64)
+    for k in range(0, _SOBOL_BITS):
+        bit = ((gray >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        X[bit] ^= V[:, k]
+    if scramble:
+        shift = rng.integers(0, 2**_SOBOL_BITS, size=dims, dtype=np.uint64)
+        X ^= shift
+    return X.astype(float) / float(2**_SOBOL_BITS)
+
+
+def _first_primes(count):
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p*p <= candidate):
+            primes.append(candidate)
+        candidate = candidate + 1
+    return primes
+
+
+def halton_samples(rng, n, dims, scramble=True):
+    # radical inverse of the point index in the first 'dims' prime bases.
+    # Scrambling is a random shift modulo 1 per dimension.
+    idx = np.arange(1, n+1)
+    X = np.zeros((n, dims))
+    for d, base in enumerate(_first_primes(dims)):
+        i = idx.copy()
+        f = 1.0
+        while np.any(i > 0):
+            f = f / base
+            X[:, d] = X[:, d] + f*(i % base)
+            i = i // base
+    if scramble:
+        X = np.mod(X + rng.random(dims), 1.0)
+    return X
+
+
+def latin_hypercube_samples(rng, n, dims):
+    # one point per stratum in every dimension, strata paired at random
+    strata = np.argsort(rng.random((n, dims)), axis=0)
+    return (strata + rng.random((n, dims))) / n
+
+
+def uniform_samples(rng, n, dims):
+    return rng.random((n, dims))
+
+
+def unit_samples(strategy, rng, n, dims):
+    # samples in the [0, 1) unit hypercube
+    strategy = str(strategy).upper()
+    if strategy == 'LHS':
+        return latin_hypercube_samples(rng, n, dims)
+    elif strategy == 'SOBOL':
+        return sobol_samples(rng, n, dims)
+    elif strategy == 'HALTON':
+        return halton_samples(rng, n, dims)
+    return uniform_samples(rng, n, dims)
+
+
+def initial_positions(strategy, rng, n, lbound, ubound, decimals,
+                      constr_func=None, batch_size=None, max_batches=100):
+    # returns an (n, dims) array of starting positions and the number of
+    # positions that could not be made feasible.
+    # If constr_func is None every sample is accepted. Otherwise samples
+    # are drawn in batches and infeasible ones are rejected until n
+    # feasible positions are found or max_batches is used up, in which
+    # case the remaining rows are filled with rejected samples and left to
+    # the boundary handler.
+    lbound = np.asarray(lbound, dtype=float)
+    ubound = np.asarray(ubound, dtype=float)
+    dims = len(lbound)
+    variation = ubound - lbound
+
+    if constr_func is None:
+        return np.round(unit_samples(strategy, rng, n, dims)*variation + lbound, decimals), 0
+
+    if batch_size is None:
+        batch_size = max(n, 64)
+
+    accepted = []
+    rejected = []
+    found = 0
+    kept = 0   # rejected points kept, at most n
+    for b in range(0, max_batches):
+        batch = np.round(unit_samples(strategy, rng, batch_size, dims)*variation + lbound, decimals)
+        feasible = feasibility_mask(constr_func, batch)
+        accepted.append(batch[feasible])
+        found = found + int(np.sum(feasible))
+        if found >= n:
+            break
+        if kept < n:
+            rejected.append(batch[~feasible][:n - kept])
+            kept = kept + len(rejected[-1])
+
+    M = np.concatenate(accepted)[:n]
+    missing = n - len(M)
+    if missing > 0:
+        M = np.vstack([M, np.concatenate(rejected)[:missing]])
+    return M, missing
+
+
+def feasibility_mask(constr_func, points):
+    # boolean array, one entry per row of points. Constraint specs
+    # (constraint_spec.py) check all points at once
+    if hasattr(constr_func, 'mask'):
+        return constr_func.mask(points)
+    return np.array([bool(constr_func(x)) for x in points], dtype=bool)
@@ -0,0 +1,116 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/swarm_kernels.py'
+#   Per-particle update kernels for the 'swarm' class. The asynchronous
+#       update (every particle sees the latest Gb) cannot be vectorized
+#       across the swarm, so these kernels work on one particle at a
+#       time. The 'numpy' backend vectorizes over the input dimensions.
+#       The 'jit' backend compiles the same kernels with Numba when it
+#       is installed. Both produce the same values as the original
+#       per-dimension loops for the same random numbers.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import importlib.util
+import numpy as np
+
+# numba is only imported when the JIT backend is selected, so importing
+# the swarm stays light when it is not used
+JIT_AVAILABLE = importlib.util.find_spec('numba') is not None
+_jit_kernels = None
+
+KERNEL_BACKENDS = ['NUMPY', 'JIT', 'AUTO']
+
+
+# NumPy kernels
+# r holds 3 random numbers per dimension, in the order the original
+# loop drew them: (inertia, cognitive, social) for dimension 0, then 1, ...
+def velocity_update(V, M, Pb, Gb, weights, r, particle, decimals):
+    V[particle] = np.round(weights[0]*r[0::3]*V[particle]
+                           + weights[1]*r[1::3]*(Pb[particle]-M[particle])
+                           + weights[2]*r[2::3]*(Gb-M[particle]), decimals)
+
+
+def point_update(M, V, delta_t, particle, decimals):
+    M[particle] = np.round(M[particle] + delta_t*V[particle], decimals)
+
+
+def out_of_bounds(M, lbound, ubound, particle):
+    # index+1 of the last out of bounds dimension, 0 if in bounds
+    idx = np.flatnonzero((lbound > M[particle]) | (ubound < M[particle]))
+    if len(idx) > 0:
+        return int(idx[-1]) + 1
+    return 0
+
+
+def l2_norm(F):
+    return np.linalg.norm(F)
+
+
+def _build_jit_kernels():
+    # Numba kernels. Same arithmetic, written as loops.
+    # Compiled once per process, on first use
+    global _jit_kernels
+    if _jit_kernels is not None:
+        return _jit_kernels
+    import numba
+
+    @numba.njit
+    def velocity_update_jit(V, M, Pb, Gb, weights, r, particle, decimals):
+        for i in range(V.shape[1]):
+            v = weights[0]*r[3*i]*V[particle, i] \
+                + weights[1]*r[3*i+1]*(Pb[particle, i]-M[particle, i]) \
+                + weights[2]*r[3*i+2]*(Gb[i]-M[particle, i])
+            V[particle, i] = np.round(v, decimals)
+
+    @numba.njit
+    def point_update_jit(M, V, delta_t, particle, decimals):
+        for i in range(M.shape[1]):
+            M[particle, i] = np.round(M[particle, i] + delta_t*V[particle, i], decimals)
+
+    @numba.njit
+    def out_of_bounds_jit(M, lbound, ubound, particle):
+        update = 0
+        for i in range(M.shape[1]):
+            if (lbound[i] > M[particle, i]) or (ubound[i] < M[particle, i]):
+                update = i + 1
+        return update
+
+    @numba.njit
+    def l2_norm_jit(F):
+        total = 0.0
+        for i in range(F.shape[0]):
+            total = total + F[i]*F[i]
+        return np.sqrt(total)
+
+    _jit_kernels = KernelSet('JIT', velocity_update_jit, point_update_jit,
+                             out_of_bounds_jit, l2_norm_jit)
+    return _jit_kernels
+
+
+class KernelSet:
+    # the kernels used by one swarm instance
+    def __init__(self, backend, velocity_update, point_update, out_of_bounds, l2_norm):
+        self.backend = backend
+        self.velocity_update = velocity_update
+        self.point_update = point_update
+        self.out_of_bounds = out_of_bounds
+        self.l2_norm = l2_norm
+
+
+def select_kernels(backend='NUMPY'):
+    # returns (KernelSet, message). message is None unless the requested
+    # backend could not be used
+    backend = str(backend).upper()
+    if backend not in KERNEL_BACKENDS:
+        return select_kernels('NUMPY')[0], "WARNING: unrecognized kernel backend. Defaulting to NUMPY."
+    if backend in ['JIT', 'AUTO'] and JIT_AVAILABLE:
+        return _build_jit_kernels(), None
+    kernels = KernelSet('NUMPY', velocity_update, point_update, out_of_bounds, l2_norm)
+    if backend == 'JIT':
+        return kernels, "WARNING: JIT backend requested but numba is not installed. Using NUMPY kernels."
+    return kernels, None
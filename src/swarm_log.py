@@ -0,0 +1,206 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/swarm_log.py'
+#   Structured event logging for the 'swarm' class. Events have a name,
+#       a level, and a dict of fields. Fields may be given as callables,
+#       which are only evaluated if a sink actually needs the value, and
+#       the level and sampling checks happen before anything is built.
+#       Events go to one or more sinks:
+#           ConsoleSink     text to stdout (or another stream)
+#           ParentSink      text to parent.debug_message_printout(), as
+#                           before (AntennaCAT GUI)
+#           JSONLinesSink   one JSON object per event, to a file
+#       Sampling passes every n-th event of a given name, e.g.
+#       {'step': 100} keeps one step trace in 100.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import sys
+import json
+import time
+import numpy as np
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR}
+LEVEL_NAMES = {value: key for key, value in LEVELS.items()}
+
+
+def level_value(level):
+    # 'DEBUG', 'info', 20, ... -> int
+    if isinstance(level, str):
+        if level.upper() not in LEVELS:
+            raise ValueError("unrecognized log level '" + level + "'. Use one of " + str(list(LEVELS)))
+        return LEVELS[level.upper()]
+    return int(level)
+
+
+def message_level(msg):
+    # level of a plain debug_message_printout() string, from its prefix
+    text = str(msg).lstrip().upper()
+    if text.startswith('ERROR'):
+        return ERROR
+    if text.startswith('WARNING'):
+        return WARNING
+    return INFO
+
+
+def _plain(value):
+    # JSON-safe version of a field value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    return value
+
+
+class Event:
+    # one log event. Callable fields are resolved the first time they
+    # are read and cached, so several sinks share one evaluation.
+    # text: optional callable(event) -> str, the human readable form
+    __slots__ = ('name', 'level', 'time', '_fields', '_text')
+
+    def __init__(self, name, level, fields=None, text=None):
+        self.name = name
+        self.level = level
+        self.time = time.time()
+        self._fields = {} if fields is None else dict(fields)
+        self._text = text
+
+    def __getitem__(self, key):
+        value = self._fields[key]
+        if callable(value):
+            value = value()
+            self._fields[key] = value
+        return value
+
+    def keys(self):
+        return self._fields.keys()
+
+    def fields(self, include=None):
+        # resolved fields. include: optional list of field names
+        keys = self._fields.keys() if include is None else [k for k in include if k in self._fields]
+        return {key: self[key] for key in keys}
+
+    def text(self):
+        if self._text is not None:
+            return self._text(self)
+        if 'message' in self._fields:
+            return str(self['message'])
+        return self.name + ": " + ", ".join(k + "=" + str(v) for k, v in self.fields().items())
+
+
+class ConsoleSink:
+    def __init__(self, stream=None, level=DEBUG):
+        self.stream = sys.stdout if stream is None else stream
+        self.level = level_value(level)
+
+    def write(self, event):
+        print(event.text(), file=self.stream)
+
+    def close(self):
+        pass
+
+
+class ParentSink:
+    # forwards the text form to parent.debug_message_printout()
+    def __init__(self, parent, level=DEBUG):
+        self.parent = parent
+        self.level = level_value(level)
+
+    def write(self, event):
+        self.parent.debug_message_printout(event.text())
+
+    def close(self):
+        pass
+
+
+class JSONLinesSink:
+    # {"time": ..., "level": "INFO", "event": name, <fields>} per line.
+    # fields: optional {event name: [field, ...]} to write only some
+    # fields of an event. Fields that are not written are not computed
+    def __init__(self, filename, level=DEBUG, fields=None, flush=False):
+        self.filename = filename
+        self.level = level_value(level)
+        self.include = {} if fields is None else dict(fields)
+        self.flush = bool(flush)
+        self.file = open(filename, 'a')
+
+    def write(self, event):
+        record = {'time': event.time, 'level': LEVEL_NAMES.get(event.level, event.level),
+                  'event': event.name}
+        record.update(_plain(event.fields(self.include.get(event.name))))
+        self.file.write(json.dumps(record) + "\n")
+        if self.flush:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class SwarmLogger:
+    # level:   events below this level are dropped before they are built
+    # sinks:   list of sinks. Each sink also has its own level
+    # sample:  {event name: n}. Only every n-th event of that name passes
+    def __init__(self, level=DEBUG, sinks=None, sample=None):
+        self.level = level_value(level)
+        self.sinks = [] if sinks is None else list(sinks)
+        self.sample = {} if sample is None else {k: max(1, int(v)) for k, v in dict(sample).items()}
+        self.counts = {}
+        self._update_floor()
+
+    def _update_floor(self):
+        # lowest level any sink accepts. enabled() compares against this
+        sink_level = min([s.level for s in self.sinks], default=ERROR + 1)
+        self.floor = max(self.level, sink_level)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self._update_floor()
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
+        self._update_floor()
+
+    def set_level(self, level):
+        self.level = level_value(level)
+        self._update_floor()
+
+    def enabled(self, level, name):
+        # True if an event of this level and name would be written. Counts
+        # towards sampling, so call it once per event and then emit()
+        if level < self.floor:
+            return False
+        every = self.sample.get(name)
+        if every is None:
+            return True
+        count = self.counts.get(name, 0)
+        self.counts[name] = count + 1
+        return count % every == 0
+
+    def emit(self, level, name, fields=None, text=None):
+        event = Event(name, level, fields, text)
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.write(event)
+
+    def log(self, level, name, **fields):
+        # enabled() and emit() in one call, for events that are cheap to build
+        if self.enabled(level, name):
+            self.emit(level, name, fields)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,69 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/swarm_random.py'
+#   Seedable random number streams for the 'swarm' class. A single
+#       SeedSequence seeds a main stream (initialization) and one
+#       independent spawned stream per particle, so a particle's
+#       draws do not depend on the order particles are processed in
+#       (parallel generations, late arrivals). Each particle stream
+#       is read from a pre-generated block that is refilled in bulk.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+from numpy.random import Generator, MT19937, SeedSequence
+
+DEFAULT_BLOCK_SIZE = 1024
+
+
+class RandomBlock:
+    # uniform [0, 1) numbers from one generator, drawn block_size at a time.
+    # The numbers come out in the same order as individual draws from the
+    # generator would.
+    def __init__(self, generator, block_size=DEFAULT_BLOCK_SIZE):
+        self.generator = generator
+        self.block_size = int(block_size)
+        self.buffer = np.empty(0)
+        self.pos = 0
+
+    def take(self, n):
+        if self.pos + n > len(self.buffer):
+            self._refill(n)
+        out = self.buffer[self.pos:self.pos+n]
+        self.pos = self.pos + n
+        return out
+
+    def _refill(self, n):
+        remaining = self.buffer[self.pos:]
+        size = max(self.block_size, n - len(remaining))
+        self.buffer = np.concatenate([remaining, self.generator.random(size)])
+        self.pos = 0
+
+    def get_state(self):
+        return {'bit_generator': self.generator.bit_generator.state,
+                'buffer': np.array(self.buffer[self.pos:]),
+                'block_size': self.block_size}
+
+    def set_state(self, state):
+        self.generator.bit_generator.state = state['bit_generator']
+        self.buffer = np.array(state['buffer'], dtype=float)
+        self.pos = 0
+        self.block_size = int(state['block_size'])
+
+
+def make_streams(seed, count, block_size=DEFAULT_BLOCK_SIZE):
+    # returns (seed_sequence, main Generator, [RandomBlock, ...] x count).
+    # seed may be an int, a SeedSequence, or None for fresh OS entropy.
+    # seed_sequence.entropy is enough to reproduce the run.
+    if isinstance(seed, SeedSequence):
+        seed_seq = seed
+    else:
+        seed_seq = SeedSequence(seed)
+    children = seed_seq.spawn(count + 1)
+    main = Generator(MT19937(children[0]))
+    streams = [RandomBlock(Generator(MT19937(child)), block_size) for child in children[1:]]
+    return seed_seq, main, streams
@@ -0,0 +1,254 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/swarm_render.py'
+#   Offline rendering of 'swarm' runs. SwarmHistory records M and F_Gb
+#       each iteration while the optimizer runs at full speed. The
+#       history is rendered afterwards, headless, with the Agg canvas.
+#       Frames can be rendered across a process pool, and written as a
+#       GIF, an MP4 (needs ffmpeg on the PATH), or a directory of PNGs.
+#       Long runs are downsampled to a target number of frames.
+#       plot_swarm() is the plot layout also used by main_test_graph.py.
+#
+#       usage: swarm_render.py HISTORY.npz OUTPUT [--frames N] [--fps N] [--workers N]
+#              OUTPUT ending in .gif or .mp4 is an animation, otherwise
+#              a directory of frames
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import os
+import shutil
+import subprocess
+import multiprocessing as mp
+import numpy as np
+
+
+class SwarmHistory:
+    # per-iteration record of the particle locations and global best.
+    # Call record(myOptimizer) after each step()/call_objective() pair
+    # (or generation). every: record only every k-th call
+    def __init__(self, every=1):
+        self.every = int(every)
+        self.calls = 0
+        self.M = []
+        self.F_Gb = []
+        self.iters = []
+        self.weights = []
+        self.T_MOD = []
+        self.targets = None
+        self.lbound = None
+        self.ubound = None
+
+    def record(self, optimizer):
+        if self.targets is None:
+            self.targets = np.ravel(optimizer.targets)
+            self.lbound = np.ravel(optimizer.lbound)
+            self.ubound = np.ravel(optimizer.ubound)
+        if self.calls % self.every == 0:
+            self.M.append(np.array(optimizer.M))
+            self.F_Gb.append(np.ravel(optimizer.F_Gb))
+            self.iters.append(optimizer.iter)
+            # changes during the run with ADAPT/ADAPT_T_MOD
+            self.weights.append(np.ravel(optimizer.weights))
+            self.T_MOD.append(optimizer.T_MOD)
+        self.calls = self.calls + 1
+
+    def __len__(self):
+        return len(self.M)
+
+    def save(self, filename):
+        np.savez(filename, M=np.array(self.M), F_Gb=np.array(self.F_Gb),
+                 iters=np.array(self.iters), weights=np.array(self.weights),
+                 T_MOD=np.array(self.T_MOD), targets=self.targets,
+                 lbound=self.lbound, ubound=self.ubound)
+
+
+def load_history(filename):
+    # returns a dict with M (K x N x D), F_Gb (K x O), iters (K),
+    # weights (K x 3), T_MOD (K), targets, lbound, ubound. Older files
+    # have no weights or T_MOD
+    data = np.load(filename)
+    return {key: data[key] for key in data.files}
+
+
+def plot_swarm(ax1, ax2, x_coords, y_coords, targets, ctr, showTarget=True, limits=None):
+    # particle locations on ax1, global best fitness and target on ax2.
+    # Both axes are 3d. limits: optional (lbound, ubound) for ax1
+    x_coords = np.array(x_coords)
+    y_coords = np.reshape(y_coords, (1, -1))
+    targets = np.ravel(targets)
+
+    # MOVEMENT PLOT
+    ax1.set_title("Search Locations, Iteration: " + str(ctr))
+    if np.shape(x_coords)[1] == 1: # 1 dim function
+        x_plot_coords = np.array(x_coords[:,0])*0.0
+        ax1.set_xlabel("$x_1$")
+        ax1.set_ylabel("filler coords")
+        ax1.set_zlabel("filler coords")
+        ax1.scatter(x_coords, x_plot_coords, edgecolors='b')
+
+    elif np.shape(x_coords)[1] == 2: #2-dim func
+        ax1.set_xlabel("$x_1$")
+        ax1.set_ylabel("$x_2$")
+        ax1.set_zlabel("filler coords")
+        ax1.scatter(x_coords[:,0], x_coords[:,1], edgecolors='b')
+
+    elif np.shape(x_coords)[1] == 3: #3-dim func
+        ax1.set_xlabel("$x_1$")
+        ax1.set_ylabel("$x_2$")
+        ax1.set_zlabel("$x_3$")
+        ax1.scatter(x_coords[:,0], x_coords[:,1], x_coords[:,2], edgecolors='b')
+
+    if limits is not None:
+        lbound, ubound = np.ravel(limits[0]), np.ravel(limits[1])
+        setters = [ax1.set_xlim, ax1.set_ylim, ax1.set_zlim]
+        for i in range(0, min(len(lbound), 3)):
+            setters[i](lbound[i], ubound[i])
+
+    # FITNESS PLOT
+    ax2.set_title("Global Best Fitness Relation to Target")
+    if np.shape(y_coords)[1] == 1: #1-dim obj func
+        y_plot_filler = np.array(y_coords[:,0])*0.0
+        ax2.set_xlabel("$F_{1}(x_1,x_2)$")
+        ax2.set_ylabel("filler coords")
+        ax2.set_zlabel("filler coords")
+        ax2.scatter(y_coords, y_plot_filler, marker='o', s=40, facecolor="none", edgecolors="k")
+
+    elif np.shape(y_coords)[1] == 2: #2-dim obj func
+        ax2.set_xlabel("$F_{1}(x_1,x_2)$")
+        ax2.set_ylabel("$F_{2}(x_1,x_2)$")
+        ax2.set_zlabel("filler coords")
+        ax2.scatter(y_coords[:,0], y_coords[:,1], marker='o', s=40, facecolor="none", edgecolors="k")
+
+    elif np.shape(y_coords)[1] == 3: #3-dim obj fun
+        ax2.set_xlabel("$F_{1}(x_1,x_2)$")
+        ax2.set_ylabel("$F_{2}(x_1,x_2)$")
+        ax2.set_zlabel("$F_{3}(x_1,x_2)$")
+        ax2.scatter(y_coords[:,0], y_coords[:,1], y_coords[:,2], marker='o', s=40, facecolor="none", edgecolors="k")
+
+    if showTarget == True: # plot the target point
+        if len(targets) == 1:
+            ax2.scatter(targets[0], 0, marker='*', edgecolors='r')
+        if len(targets) == 2:
+            ax2.scatter(targets[0], targets[1], marker='*', edgecolors='r')
+        elif len(targets) == 3:
+            ax2.scatter(targets[0], targets[1], targets[2], marker='*', edgecolors='r')
+
+
+def frame_indices(count, max_frames=None):
+    # evenly spaced history indices, always including the first and last
+    if (max_frames is None) or (count <= max_frames):
+        return np.arange(count)
+    return np.unique(np.round(np.linspace(0, count-1, int(max_frames))).astype(int))
+
+
+def _render_chunk(args):
+    # renders frames with one Agg figure, reused between frames.
+    # No pyplot, so no GUI backend is ever loaded
+    from matplotlib.figure import Figure
+    import mpl_toolkits.mplot3d # registers the 3d projection
+    frame_numbers, M, F_Gb, iters, targets, limits, out_dir, dpi = args
+    fig = Figure(figsize=(10, 5))
+    ax1 = fig.add_subplot(121, projection='3d')
+    ax2 = fig.add_subplot(122, projection='3d')
+    files = []
+    for i in range(0, len(frame_numbers)):
+        ax1.clear()
+        ax2.clear()
+        plot_swarm(ax1, ax2, M[i], F_Gb[i], targets, iters[i], showTarget=True, limits=limits)
+        filename = os.path.join(out_dir, "frame_%06d.png" % frame_numbers[i])
+        fig.savefig(filename, dpi=dpi)
+        files.append(filename)
+    return files
+
+
+def render_frames(history, out_dir, max_frames=300, workers=None, dpi=100, start_method=None):
+    # history: dict from load_history() or a SwarmHistory.
+    # Writes frame_000000.png, ... to out_dir and returns the file names.
+    # workers: number of rendering processes. None uses os.cpu_count()
+    if isinstance(history, SwarmHistory):
+        history = {'M': np.array(history.M), 'F_Gb': np.array(history.F_Gb),
+                   'iters': np.array(history.iters), 'targets': history.targets,
+                   'lbound': history.lbound, 'ubound': history.ubound}
+    os.makedirs(out_dir, exist_ok=True)
+    idx = frame_indices(len(history['M']), max_frames)
+    limits = None
+    if 'lbound' in history:
+        limits = (history['lbound'], history['ubound'])
+
+    workers = os.cpu_count() if workers is None else int(workers)
+    workers = max(1, min(workers, len(idx)))
+    chunks = []
+    for part in np.array_split(np.arange(len(idx)), workers):
+        if len(part) == 0:
+            continue
+        sel = idx[part]
+        chunks.append((part, history['M'][sel], history['F_Gb'][sel],
+                       history['iters'][sel], history['targets'], limits, out_dir, dpi))
+
+    if workers == 1:
+        results = [_render_chunk(chunk) for chunk in chunks]
+    else:
+        ctx = mp.get_context(start_method)
+        with ctx.Pool(workers) as pool:
+            results = pool.map(_render_chunk, chunks)
+    return [f for files in results for f in files]
+
+
+def write_gif(frame_files, filename, fps=10):
+    from PIL import Image
+    frames = [Image.open(f) for f in frame_files]
+    frames[0].save(filename, save_all=True, append_images=frames[1:],
+                   duration=int(1000/fps), loop=0)
+
+
+def _find_ffmpeg():
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg was not found on the PATH. MP4 output needs ffmpeg. Use a .gif or a frame directory instead.")
+    return ffmpeg
+
+
+def write_mp4(out_dir, filename, fps=10):
+    subprocess.run([_find_ffmpeg(), '-y', '-loglevel', 'error', '-framerate', str(fps),
+                    '-i', os.path.join(out_dir, 'frame_%06d.png'),
+                    '-pix_fmt', 'yuv420p', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                    filename], check=True)
+
+
+def render(history, output, max_frames=300, fps=10, workers=None, dpi=100, keep_frames=False):
+    # history: file name, load_history() dict, or SwarmHistory.
+    # output: .gif or .mp4 file, or a directory for the frames
+    if isinstance(history, (str, os.PathLike)):
+        history = load_history(history)
+    ext = os.path.splitext(str(output))[1].lower()
+    if ext not in ['.gif', '.mp4']:
+        return render_frames(history, output, max_frames, workers, dpi)
+
+    if ext == '.mp4':
+        _find_ffmpeg() # fail before rendering
+    out_dir = os.path.splitext(str(output))[0] + "_frames"
+    files = render_frames(history, out_dir, max_frames, workers, dpi)
+    if ext == '.gif':
+        write_gif(files, output, fps)
+    else:
+        write_mp4(out_dir, output, fps)
+    if not keep_frames:
+        shutil.rmtree(out_dir)
+    return output
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="render a recorded swarm history")
+    parser.add_argument('history', help="history .npz written by SwarmHistory.save()")
+    parser.add_argument('output', help=".gif, .mp4, or a directory for the frames")
+    parser.add_argument('--frames', type=int, default=300, help="maximum number of frames")
+    parser.add_argument('--fps', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None, help="rendering processes")
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args()
+    render(args.history, args.output, args.frames, args.fps, args.workers, args.dpi)
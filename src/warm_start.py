@@ -0,0 +1,76 @@
+#! /usr/bin/python3
+
+##--------------------------------------------------------------------\
+#   pso_python
+#   './pso_python/src/warm_start.py'
+#   Loaders for previously evaluated points, used to warm start the
+#       'swarm' class with swarm.warm_start(positions, Fvals, noError).
+#       Points can come from an evaluation history file, an exported
+#       swarm, or any iterable of (position, Fvals) pairs.
+#
+#   Author(s): Jonathan Lundquist, Lauren Linkous
+#   Last update: October 19, 2026
+##--------------------------------------------------------------------\
+
+import numpy as np
+
+
+def save_evaluation_history(filename, positions, Fvals, noError=None):
+    # history files are .npz archives with 'positions' (K x IN_VARS),
+    # 'Fvals' (K x OUT_VARS), and optionally 'noError' (K) arrays
+    positions = np.array(positions, dtype=float)
+    Fvals = np.array(Fvals, dtype=float).reshape(len(positions), -1)
+    if noError is None:
+        noError = np.ones(len(positions), dtype=bool)
+    np.savez(filename, positions=positions, Fvals=Fvals,
+             noError=np.array(noError, dtype=bool))
+
+
+def load_evaluation_history(filename, in_vars=None):
+    # returns (positions, Fvals, noError).
+    # .npz files are read as written by save_evaluation_history.
+    # Text files (.csv, .txt) have one evaluation per row, with the
+    # in_vars input values first and the output values after.
+    if str(filename).endswith('.npz'):
+        data = np.load(filename)
+        positions = data['positions']
+        Fvals = data['Fvals']
+        if 'noError' in data:
+            noError = data['noError']
+        else:
+            noError = np.ones(len(positions), dtype=bool)
+        return positions, Fvals, noError
+
+    if in_vars is None:
+        raise ValueError("in_vars is required to split a text history file into positions and Fvals")
+    data = np.atleast_2d(np.loadtxt(filename, delimiter=',', ndmin=2))
+    positions = data[:, :in_vars]
+    Fvals = data[:, in_vars:]
+    return positions, Fvals, np.ones(len(positions), dtype=bool)
+
+
+def evaluations_from_pairs(pairs):
+    # pairs: iterable of (position, Fvals) or (position, Fvals, noError),
+    # such as the contents of an evaluation store
+    positions = []
+    Fvals = []
+    noError = []
+    for pair in pairs:
+        positions.append(np.ravel(pair[0]))
+        Fvals.append(np.ravel(pair[1]))
+        noError.append(bool(pair[2]) if len(pair) > 2 else True)
+    return np.array(positions, dtype=float), np.array(Fvals, dtype=float), np.array(noError, dtype=bool)
+
+
+def evaluations_from_export(swarm_export):
+    # personal and global bests from export_swarm(), or a dataframe of it.
+    # Only bests with recorded raw outputs (Fvals_Pb/Fvals_Gb) can be
+    # re-scored, so entries that were never evaluated are dropped.
+    if 'Fvals_Pb' not in swarm_export:
+        raise ValueError("swarm export does not contain raw best outputs (Fvals_Pb). It was created before warm start support.")
+    positions = np.vstack([np.array(swarm_export['Pb'][0], dtype=float),
+                           np.array(swarm_export['Gb'][0], dtype=float).reshape(1, -1)])
+    Fvals = np.vstack([np.array(swarm_export['Fvals_Pb'][0], dtype=float),
+                       np.array(swarm_export['Fvals_Gb'][0], dtype=float).reshape(1, -1)])
+    noError = np.all(np.isfinite(Fvals), axis=1)
+    return positions, Fvals, noError
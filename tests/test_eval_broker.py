@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from eval_broker import EvalBroker, spawn_local_workers
+
+
+def hang_negative(X, NO_OF_OUTS=1):
+    # sleeps forever for X[0] < 0
+    if X[0] < 0:
+        while True:
+            time.sleep(1)
+    return [float(X[0])**2], True
+
+
+def test_hung_objective_is_requeued_then_failed():
+    with EvalBroker(1, heartbeat_timeout=5.0, max_retries=1, task_timeout=0.5) as broker:
+        procs = spawn_local_workers(3, '127.0.0.1', broker.port, hang_negative)
+        try:
+            broker.submit('hang', [-1.0])
+            broker.submit('ok', [2.0])
+            results = {}
+            deadline = time.monotonic() + 20
+            while (broker.pending() > 0) and (time.monotonic() < deadline):
+                for key, Fvals, noError, duration in broker.poll(wait=1.0):
+                    results[key] = (Fvals, noError)
+            assert results['ok'][1] is True
+            assert np.allclose(results['ok'][0], [4.0])
+            # first attempt and one retry both time out
+            assert results['hang'][1] is False
+            assert broker.timeouts == 2
+            assert broker.failures == 1
+        finally:
+            for p in procs:
+                p.terminate()
+
+
+def slow_negative(X, NO_OF_OUTS=1):
+    # takes 1 s for X[0] < 0
+    if X[0] < 0:
+        time.sleep(1.0)
+    return [float(X[0])**2], True
+
+
+def test_timed_out_workers_fail_the_queue_and_reconnect():
+    with EvalBroker(1, heartbeat_timeout=5.0, max_retries=2, task_timeout=0.5) as broker:
+        procs = spawn_local_workers(2, '127.0.0.1', broker.port, slow_negative)
+        try:
+            deadline = time.monotonic() + 20
+            while (broker.worker_count() < 2) and (time.monotonic() < deadline):
+                time.sleep(0.05)
+            broker.submit('slow_a', [-1.0])
+            broker.submit('slow_b', [-2.0])
+            results = {}
+            while (broker.pending() > 0) and (time.monotonic() < deadline):
+                for key, Fvals, noError, duration in broker.poll(wait=1.0):
+                    results[key] = noError
+            # both workers timed out, so nothing was left to run the queue
+            assert results == {'slow_a': False, 'slow_b': False}
+            assert broker.timeouts == 2
+            # the workers register again once the slow evaluations return
+            while (broker.worker_count() < 2) and (time.monotonic() < deadline):
+                time.sleep(0.05)
+            assert all(p.is_alive() for p in procs)
+            broker.submit('ok', [3.0])
+            results = broker.poll(wait=10.0)
+            assert [r[0] for r in results] == ['ok']
+            assert results[0][2] is True
+            assert np.allclose(results[0][1], [9.0])
+        finally:
+            for p in procs:
+                p.terminate()
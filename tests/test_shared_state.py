@@ -0,0 +1,56 @@
+import gc
+import io
+import os
+import sys
+import contextlib
+import subprocess
+import numpy as np
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+from shared_state import SharedSwarmState
+from particle_swarm import swarm, SwarmConfig
+import himmelblau.configs_F as hc
+
+
+def failing_objective(X, NO_OF_OUTS=1):
+    raise RuntimeError("simulation crashed")
+
+
+def test_owner_close_unlinks_and_attach_does_not():
+    with SharedSwarmState.create(4, 2, 1) as state:
+        state.M[:] = 2.0
+        with SharedSwarmState.attach(state.name) as view:
+            assert np.all(view.M == 2.0)
+        # a monitor closing its view leaves the block in place
+        assert os.path.exists('/dev/shm/' + state.name)
+    assert not os.path.exists('/dev/shm/' + state.name)
+
+
+def test_failed_run_does_not_leak_the_block():
+    with contextlib.redirect_stdout(io.StringIO()):
+        s = swarm(hc.LB, hc.UB, hc.TARGETS, 1e-18, 100, failing_objective, hc.CONSTR_FUNC,
+                  SwarmConfig(NO_OF_PARTICLES=5, SEED=1, SHARED_MEMORY=True),
+                  parent=None, decimal_limit=6)
+    name = s.shared_state.name
+    assert os.path.exists('/dev/shm/' + name)
+    try:
+        s.run()
+    except RuntimeError:
+        pass
+    del s
+    gc.collect()
+    assert not os.path.exists('/dev/shm/' + name)
+
+
+def test_exit_without_release_unlinks_the_block():
+    code = ("import sys; sys.path.insert(0, %r)\n"
+            "from shared_state import SharedSwarmState\n"
+            "state = SharedSwarmState.create(4, 2, 1)\n"
+            "print(state.name)\n"
+            "raise SystemExit(1)\n") % SRC
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=60)
+    name = proc.stdout.strip()
+    assert name != ''
+    assert not os.path.exists('/dev/shm/' + name)
+    assert 'leaked' not in proc.stderr
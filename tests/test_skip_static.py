@@ -0,0 +1,74 @@
+import io
+import os
+import sys
+import contextlib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from particle_swarm import swarm, SwarmConfig
+import himmelblau.configs_F as hc
+
+
+class CountingObjective:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, X, NO_OF_OUTS=1):
+        self.calls = self.calls + 1
+        return hc.OBJECTIVE_FUNC(X, NO_OF_OUTS)
+
+
+def make_swarm(obj_func, maxit=500):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return swarm(hc.LB, hc.UB, hc.TARGETS, 1e-18, maxit, obj_func, hc.CONSTR_FUNC,
+                     SwarmConfig(NO_OF_PARTICLES=5, SEED=4, SKIP_STATIC=True),
+                     parent=None, decimal_limit=6)
+
+
+def sweep(s):
+    for i in range(s.number_of_particles):
+        s.call_objective(True)
+        s.step(True)
+
+
+def test_unmoved_particle_reuses_its_outputs():
+    obj = CountingObjective()
+    s = make_swarm(obj)
+    sweep(s)
+    assert obj.calls == s.iter == 5
+    # put every particle back where it was last evaluated
+    s.M[:] = s.M_evaluated
+    particle = s.current_particle
+    s.call_objective(True)
+    assert obj.calls == 5
+    assert s.iter == 5
+    assert np.array_equal(np.ravel(s.Fvals), s.Fvals_evaluated[particle])
+    data = s.get_reuse_data()
+    assert data['reused'] == 1
+    assert data['per_particle'][particle] == 1
+    assert sum(data['per_particle']) == 1
+    # a particle that moved is evaluated again
+    s.step(True)
+    s.M[s.current_particle] = s.M_evaluated[s.current_particle] + 0.5
+    s.call_objective(True)
+    assert obj.calls == 6
+    assert s.iter == 6
+
+
+def test_frozen_swarm_still_reaches_maxit():
+    obj = CountingObjective()
+    s = make_swarm(obj, maxit=40)
+    # no particle ever moves
+    s.update_velocity = lambda particle: None
+    s.update_point = lambda particle: None
+    s.handle_bounds = lambda particle: None
+    calls = 0
+    while (not s.complete()) and (calls < 10000):
+        s.call_objective(True)
+        s.step(True)
+        calls = calls + 1
+    assert s.result().stop_reason == 'maxit'
+    assert s.iter == obj.calls == 40
+    # after each sweep of skips one particle is evaluated anyway
+    assert s.get_reuse_data()['reused'] >= 5*(40 - 5)
+    assert calls < 10000
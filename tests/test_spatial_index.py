@@ -0,0 +1,113 @@
+import io
+import os
+import sys
+import contextlib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from spatial_index import EvaluationIndex
+from particle_swarm import swarm, SwarmConfig
+import himmelblau.configs_F as hc
+
+LB = [-5.0, 0.0, 10.0]
+UB = [5.0, 2.0, 30.0]
+
+
+def brute_d(points, X):
+    # normalized distances from X to every point
+    scale = np.array(UB) - np.array(LB)
+    return np.sqrt(np.sum(((points - np.array(X))/scale)**2, axis=1))
+
+
+def test_queries_match_brute_force_across_merges():
+    rng = np.random.default_rng(7)
+    index = EvaluationIndex(LB, UB, leaf_size=4, buffer_size=16)
+    points = np.zeros((0, 3))
+    sizes = set()
+    for batch in range(100):
+        # single inserts and batches, so the merges hit every tree size
+        n = 1 if batch % 3 else int(rng.integers(2, 150))
+        new = rng.random((n, 3))*(np.array(UB) - LB) + LB
+        if n == 1:
+            index.insert(new[0], float(len(points)))
+        else:
+            index.insert_many(new, [float(len(points) + i) for i in range(n)])
+        points = np.vstack([points, new])
+        sizes.add(tuple(len(t) for t in index.trees))
+        for q in rng.random((3, 3))*(np.array(UB) - LB) + LB:
+            d = brute_d(points, q)
+            ids, dist = index.nearest(q, 5)
+            assert np.allclose(dist, np.sort(d)[:5])
+            assert np.allclose(d[ids], dist)
+            ids, dist = index.within(q, 0.2)
+            assert set(ids.tolist()) == set(np.flatnonzero(d <= 0.2).tolist())
+            assert np.all(np.diff(dist) >= 0)
+            assert index.count_within(q, 0.2) == int(np.sum(d <= 0.2))
+    assert len(points) > 2000
+    assert len(index) == len(points)
+    # several levels were built and merged along the way
+    assert max(len(s) for s in sizes) >= 3
+    # values stay attached to their points
+    i = int(ids[0]) if len(ids) > 0 else 0
+    assert index.value(i) == float(i)
+    assert np.allclose(index.position(i), points[i])
+
+
+def test_find_duplicate_within_tolerance():
+    rng = np.random.default_rng(8)
+    index = EvaluationIndex(LB, UB, leaf_size=4, buffer_size=32)
+    points = rng.random((3000, 3))*(np.array(UB) - LB) + LB
+    index.insert_many(points)
+    scale = np.array(UB) - LB
+    for i in rng.integers(0, len(points), 50):
+        near = points[i] + 1e-4*scale
+        match = index.find_duplicate(near, 1e-3)
+        assert match is not None
+        assert brute_d(points, near)[match] <= 1e-3
+        assert match == int(np.argmin(brute_d(points, near)))
+    # nothing within a tolerance smaller than the nearest point
+    q = points[0] + 1e-2*scale
+    eps = 0.5*np.min(brute_d(points, q))
+    assert index.find_duplicate(q, eps) is None
+
+
+def test_state_round_trip():
+    rng = np.random.default_rng(9)
+    index = EvaluationIndex(LB, UB, leaf_size=4, buffer_size=16)
+    points = rng.random((500, 3))*(np.array(UB) - LB) + LB
+    index.insert_many(points, list(range(500)))
+    copy = EvaluationIndex(LB, UB, leaf_size=4, buffer_size=16)
+    copy.set_state(index.get_state())
+    q = points[10] + 0.01
+    assert np.array_equal(index.nearest(q, 7)[0], copy.nearest(q, 7)[0])
+    assert copy.value(123) == 123
+
+
+def test_swarm_reuses_near_duplicates():
+    calls = []
+    def obj_func(X, NO_OF_OUTS=1):
+        calls.append(np.array(X))
+        return hc.OBJECTIVE_FUNC(X, NO_OF_OUTS)
+    with contextlib.redirect_stdout(io.StringIO()):
+        s = swarm(hc.LB, hc.UB, hc.TARGETS, 1e-18, 300, obj_func, hc.CONSTR_FUNC,
+                  SwarmConfig(NO_OF_PARTICLES=5, SEED=4, DUPLICATE_TOL=1e-3),
+                  parent=None, decimal_limit=6)
+        for i in range(5):
+            s.call_objective(True)
+            s.step(True)
+    assert len(calls) == s.iter == 5
+    # move the next particle to within the tolerance of an evaluated point
+    particle = s.current_particle
+    other = (particle + 1) % 5
+    s.M[particle] = s.M_evaluated[other] + 1e-5
+    s.call_objective(True)
+    assert len(calls) == 5
+    assert s.iter == 5
+    assert s.duplicates_reused == 1
+    assert np.array_equal(np.ravel(s.Fvals), s.Fvals_evaluated[other])
+    # outside the tolerance the objective is called
+    s.step(True)
+    particle = s.current_particle
+    s.M[particle] = s.M_evaluated[other] + 0.5
+    s.call_objective(True)
+    assert len(calls) == 6
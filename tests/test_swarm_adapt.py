@@ -0,0 +1,76 @@
+import io
+import os
+import sys
+import contextlib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from swarm_adapt import ParameterAdapter
+from particle_swarm import swarm, SwarmConfig
+import lundquist_3_var.configs_F as lc
+
+
+def sweep(adapter, T_MOD, rate, particles=10):
+    for p in range(particles):
+        adapter.record(p, p < rate*particles)
+    weights, T_MOD = adapter.update(0.5, T_MOD, 0)
+    return T_MOD
+
+
+def test_t_mod_moves_both_ways_and_settles():
+    adapter = ParameterAdapter('NONE', [0.5, 0.7, 0.78], 0.65, 10, adapt_t_mod=True)
+    T_MOD = 0.65
+    # successful sweeps: larger time step, smaller T_MOD
+    for i in range(20):
+        T_MOD = sweep(adapter, T_MOD, 0.6)
+    low = T_MOD
+    assert 0.065 < low < 0.4
+    # failing sweeps: T_MOD rises back above the start
+    for i in range(40):
+        T_MOD = sweep(adapter, T_MOD, 0.0)
+    high = T_MOD
+    assert 0.65 < high < 6.5
+    # a steady rate settles between the limits instead of running to one
+    for i in range(200):
+        T_MOD = sweep(adapter, T_MOD, 0.0)
+    assert abs(T_MOD - sweep(adapter, T_MOD, 0.0)) < 1e-3*T_MOD
+    assert T_MOD < 6.5
+
+
+def make_swarm():
+    return swarm(lc.LB, lc.UB, lc.TARGETS, 1e-9, 600, lc.OBJECTIVE_FUNC, lc.CONSTR_FUNC,
+                 SwarmConfig(NO_OF_PARTICLES=11, SEED=3, ADAPT='SELF', ADAPT_T_MOD=True),
+                 parent=None, decimal_limit=6)
+
+
+def test_checkpoint_restores_adapter_and_pool_streams():
+    with contextlib.redirect_stdout(io.StringIO()):
+        a = make_swarm()
+        for i in range(300):
+            a.step(True)
+            a.call_objective(True)
+        # the feasible pool is in use and part drawn
+        a.get_feasible_pool().draw()
+        saved = a.export_swarm()
+        b = make_swarm()
+        b.import_swarm(saved)
+        for s in (a, b):
+            while not s.complete():
+                s.step(True)
+                s.call_objective(True)
+            s.get_feasible_pool().draw()
+    assert np.array_equal(a.M, b.M)
+    assert a.F_Gb_scalar == b.F_Gb_scalar
+    assert a.adapter.history == b.adapter.history
+    assert np.array_equal(a.feasible_pool.points, b.feasible_pool.points)
+
+
+def test_adaptation_does_not_change_pool_samples():
+    draws = []
+    for adapt_t_mod in (False, True):
+        with contextlib.redirect_stdout(io.StringIO()):
+            s = swarm(lc.LB, lc.UB, lc.TARGETS, 1e-9, 600, lc.OBJECTIVE_FUNC, lc.CONSTR_FUNC,
+                      SwarmConfig(NO_OF_PARTICLES=11, SEED=3, ADAPT_T_MOD=adapt_t_mod),
+                      parent=None, decimal_limit=6)
+        draws.append(s.get_feasible_pool().draw())
+    assert np.array_equal(draws[0], draws[1])